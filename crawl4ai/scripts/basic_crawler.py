@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 """
 Basic Crawl4AI crawler template
-Usage: python basic_crawler.py <url>
+Usage: python basic_crawler.py <url> [--http-first] [--min-store-links N] [--text-only]
 """
 
 import asyncio
 import sys
+from typing import Optional
 
 # Version check
 MIN_CRAWL4AI_VERSION = "0.7.4"
@@ -17,10 +18,37 @@ try:
 except ImportError:
     print(f"ℹ️  Crawl4AI {MIN_CRAWL4AI_VERSION}+ required")
 
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai import (AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode, CrawlResult,
+                      DefaultMarkdownGenerator, LXMLWebScrapingStrategy)
 
-async def crawl_basic(url: str):
-    """Basic crawling with markdown output"""
+from crawl_profiles import PROFILES, ResourceBlocker
+from http_fetch import HttpFetcher
+
+async def convert_static(html: str, url: str) -> CrawlResult:
+    """
+    Clean, link-classify and convert fetched HTML to markdown the way
+    crawler.arun() would, but without starting a browser. The scraper sees
+    the page's own URL, so relative links and internal/external resolve
+    against it.
+    """
+    scraped = await LXMLWebScrapingStrategy().ascrap(url, html)
+    markdown = DefaultMarkdownGenerator().generate_markdown(input_html=scraped.cleaned_html, base_url=url)
+    media = scraped.media.model_dump()
+    media.pop("tables", None)
+    return CrawlResult(url=url, html=html, success=scraped.success, cleaned_html=scraped.cleaned_html,
+                       media=media, links=scraped.links.model_dump(), metadata=scraped.metadata,
+                       markdown=markdown)
+
+async def crawl_basic(url: str, http_first: bool = False, profile: str = "full",
+                      min_store_links: Optional[int] = None):
+    """
+    Basic crawling with markdown output
+    With http_first=True a server-rendered page is fetched over plain HTTP and
+    converted without starting a browser at all (no screenshot in that case);
+    a directory page must also carry min_store_links store-like links (None:
+    http_fetch's default for directory-looking URLs).
+    profile="text-only" blocks images, fonts, media and trackers.
+    """
 
     # Configure browser
     browser_config = BrowserConfig(
@@ -37,44 +65,74 @@ async def crawl_basic(url: str):
         screenshot=True
     )
 
-    async with AsyncWebCrawler(config=browser_config) as crawler:
-        result = await crawler.arun(
-            url=url,
-            config=crawler_config
-        )
-
-        if result.success:
-            print(f"✅ Crawled: {result.url}")
-            print(f"   Title: {result.metadata.get('title', 'N/A')}")
-            print(f"   Links found: {len(result.links.get('internal', []))} internal, {len(result.links.get('external', []))} external")
-            print(f"   Media found: {len(result.media.get('images', []))} images, {len(result.media.get('videos', []))} videos")
-            print(f"   Content length: {len(result.markdown)} chars")
-
-            # Save markdown
-            with open("output.md", "w") as f:
-                f.write(result.markdown)
-            print("📄 Saved to output.md")
-
-            # Save screenshot if available
-            if result.screenshot:
-                # Check if screenshot is base64 string or bytes
-                if isinstance(result.screenshot, str):
-                    import base64
-                    screenshot_data = base64.b64decode(result.screenshot)
-                else:
-                    screenshot_data = result.screenshot
-                with open("screenshot.png", "wb") as f:
-                    f.write(screenshot_data)
-                print("📸 Saved screenshot.png")
+    blocker = ResourceBlocker.from_profile(profile)
+    if blocker is not None:
+        browser_config = browser_config.clone(**PROFILES[profile].browser_options)
+        crawler_config = crawler_config.clone(**PROFILES[profile].run_options)
+
+    static_html = None
+    if http_first:
+        async with HttpFetcher() as fetcher:
+            page, complete = await fetcher.fetch_static(url, min_store_links=min_store_links)
+        if complete:
+            static_html = page.html
+            print(f"⚡ Static HTML is complete ({page.text_length} chars of text), skipping browser render")
         else:
-            print(f"❌ Failed: {result.error_message}")
+            print("🌐 Static HTML incomplete, rendering in browser")
+
+    if static_html is not None:
+        result = await convert_static(static_html, url)
+    else:
+        # The browser only starts for pages that need rendering
+        crawler = AsyncWebCrawler(config=browser_config)
+        if blocker is not None:
+            blocker.attach(crawler)
+        async with crawler:
+            result = await crawler.arun(
+                url=url,
+                config=crawler_config
+            )
+
+    if result.success:
+        print(f"✅ Crawled: {result.url}")
+        print(f"   Title: {result.metadata.get('title', 'N/A')}")
+        print(f"   Links found: {len(result.links.get('internal', []))} internal, {len(result.links.get('external', []))} external")
+        print(f"   Media found: {len(result.media.get('images', []))} images, {len(result.media.get('videos', []))} videos")
+        print(f"   Content length: {len(result.markdown)} chars")
+        if blocker is not None and static_html is None:
+            print(f"   Blocked ({profile}): {blocker.summary()}")
+
+        # Save markdown
+        with open("output.md", "w") as f:
+            f.write(result.markdown)
+        print("📄 Saved to output.md")
+
+        # Save screenshot if available
+        if result.screenshot:
+            # Check if screenshot is base64 string or bytes
+            if isinstance(result.screenshot, str):
+                import base64
+                screenshot_data = base64.b64decode(result.screenshot)
+            else:
+                screenshot_data = result.screenshot
+            with open("screenshot.png", "wb") as f:
+                f.write(screenshot_data)
+            print("📸 Saved screenshot.png")
+    else:
+        print(f"❌ Failed: {result.error_message}")
 
-        return result
+    return result
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python basic_crawler.py <url>")
+        print("Usage: python basic_crawler.py <url> [--http-first] [--min-store-links N] [--text-only]")
         sys.exit(1)
 
     url = sys.argv[1]
-    asyncio.run(crawl_basic(url))
\ No newline at end of file
+    asyncio.run(crawl_basic(
+        url,
+        http_first="--http-first" in sys.argv[2:],
+        profile="text-only" if "--text-only" in sys.argv[2:] else "full",
+        min_store_links=int(sys.argv[sys.argv.index("--min-store-links") + 1])
+        if "--min-store-links" in sys.argv[2:-1] else None
+    ))
\ No newline at end of file
@@ -1,14 +1,21 @@
 #!/usr/bin/env python3
 """
 Crawl4AI batch/multi-URL crawler with concurrent processing
-Usage: python batch_crawler.py urls.txt [--max-concurrent 5]
+Usage: python batch_crawler.py urls.txt [--max-concurrent 5] [--resume] [--stream]
 """
 
 import asyncio
+import multiprocessing
+import os
+import queue
 import sys
 import json
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
 
 # Version check
 MIN_CRAWL4AI_VERSION = "0.7.4"
@@ -20,13 +27,148 @@ try:
 except ImportError:
     print(f"ℹ️  Crawl4AI {MIN_CRAWL4AI_VERSION}+ required")
 
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai import BrowserConfig, CrawlerRunConfig, CacheMode, MemoryAdaptiveDispatcher
+
+from browser_pool import close_pool, get_pool, lease_crawler
+from crawl_cache import CrawlCache, DEFAULT_CACHE_DIR
+from crawl_profiles import merge_resource_stats
+from crawl_frontier import CrawlFrontier, DEFAULT_FRONTIER_PATH, DONE, FAILED
+from host_scheduler import HostScheduler, host_of, parse_retry_after
+from http_fetch import HttpFetcher, rebase_links, with_base_href
+from retry_policy import TIMEOUT, backoff_delay, classify_failure, is_transient
+from sitemaps import DEFAULT_SITEMAP_STATE_PATH, SitemapState, sync_sitemaps
+
+RATE_LIMIT_CODES = (429, 503)
+DEFINITIVE_HTTP_CODES = (404, 410)  # No point escalating these to the browser
+DEFAULT_RATE_LIMIT_BACKOFF = 30.0  # seconds, when no Retry-After header is sent
+
+def safe_filename(url: str) -> str:
+    """Create safe filename from URL"""
+    safe_name = url.replace("https://", "").replace("http://", "")
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in safe_name)[:100]
+
+def summarize_result(result) -> Dict[str, Any]:
+    """Small JSON summary of a successful CrawlResult"""
+    return {
+        "url": result.url,
+        "title": result.metadata.get("title", ""),
+        "description": result.metadata.get("description", ""),
+        "content_length": len(result.markdown),
+        "links_count": len(result.links.get("internal", [])) + len(result.links.get("external", [])),
+        "images_count": len(result.media.get("images", [])),
+    }
+
+def dispatch_elapsed_ms(result) -> Optional[float]:
+    """Time arun_many's dispatcher spent on result, when this crawl4ai version reports it"""
+    dispatch = getattr(result, "dispatch_result", None)
+    if dispatch is None:
+        return None
+    start, end = dispatch.start_time, dispatch.end_time
+    if hasattr(start, "timestamp"):
+        start, end = start.timestamp(), end.timestamp()
+    try:
+        return round((end - start) * 1000, 1)
+    except TypeError:
+        return None
+
+class ResultSink:
+    """
+    Writes each CrawlResult to disk as soon as it completes: the markdown file
+    plus one NDJSON summary line. Only counters are kept in memory, so the
+    caller can drop the result straight away.
+    """
 
-async def crawl_batch(urls: List[str], max_concurrent: int = 5):
+    def __init__(self, markdown_dir: str = "batch_markdown", ndjson_path: str = None,
+                 append: bool = False):
+        self.markdown_dir = Path(markdown_dir)
+        self.markdown_dir.mkdir(exist_ok=True)
+        self.ndjson_path = ndjson_path
+        self.ndjson = open(ndjson_path, "a" if append else "w") if ndjson_path else None
+        self.success_count = 0
+        self.failed_count = 0
+
+    def write(self, result, position: int, elapsed_ms: float = None) -> Dict[str, Any]:
+        """Persist one successful result and return its summary record"""
+        return self.write_record(summarize_result(result), str(result.markdown), position, elapsed_ms)
+
+    def write_record(self, record: Dict[str, Any], markdown: str, position: int,
+                     elapsed_ms: float = None) -> Dict[str, Any]:
+        """
+        Persist a summary record and its markdown (fresh or from the crawl cache);
+        elapsed_ms is the time this run spent on the page
+        """
+        if elapsed_ms is not None:
+            record = {**record, "elapsed_ms": round(elapsed_ms, 1)}
+        # Markdown files are numbered by the URL's position in the input
+        file_path = self.markdown_dir / f"{position:03d}_{safe_filename(record['url'])}.md"
+        with open(file_path, "w") as f:
+            f.write(f"# {record.get('title') or record['url']}\n\n")
+            f.write(f"URL: {record['url']}\n\n")
+            f.write(markdown)
+        self.success_count += 1
+
+        if self.ndjson:
+            self.ndjson.write(json.dumps({"status": "success", **record}) + "\n")
+            self.ndjson.flush()
+        return record
+
+    def write_failure(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist a final failure record"""
+        self.failed_count += 1
+        if self.ndjson:
+            self.ndjson.write(json.dumps({"status": "failed", **record}) + "\n")
+            self.ndjson.flush()
+        return record
+
+    def close(self):
+        if self.ndjson:
+            self.ndjson.close()
+
+async def crawl_batch(urls: List[str], max_concurrent: int = 5, resume: bool = False,
+                      frontier_path: str = DEFAULT_FRONTIER_PATH, stream: bool = False,
+                      ndjson_path: str = "batch_results.ndjson", per_host: int = 2,
+                      host_delay: float = 1.0, respect_robots: bool = True,
+                      max_retries: int = 2, http_first: bool = True,
+                      cache_dir: Optional[str] = DEFAULT_CACHE_DIR, profile: str = "text-only",
+                      positions: Optional[Dict[str, int]] = None,
+                      min_store_links: Optional[int] = None):
     """
     Crawl multiple URLs efficiently with concurrent processing
+    Progress is journalled to a disk-backed frontier; with resume=True URLs
+    already crawled by a previous run are skipped.
+    With stream=True only the NDJSON summary and markdown files are written and
+    no result list is built, so memory stays flat however long the URL list is.
+    Requests are scheduled per host: at most per_host in flight and host_delay
+    seconds (or the robots.txt Crawl-delay) between starts on the same origin.
+    Failures are classified; transient ones (timeout, 5xx, navigation) are
+    retried up to max_retries times in later passes with jittered backoff.
+    With http_first=True each page is first fetched over plain HTTP and only
+    escalated to the browser when the static HTML lacks the content; a
+    directory page also needs min_store_links store-like links in it (None:
+    http_fetch's default for directory-looking URLs).
+    Renders are kept in an on-disk cache (cache_dir, None to disable) and reused
+    when a conditional request comes back 304 Not Modified.
+    `profile` names the crawl_profiles resource-blocking profile; the default
+    "text-only" aborts images, fonts, media and trackers.
+    positions maps URLs to their index in the full input (used by sharded runs
+    so markdown file numbering stays global).
     """
-    print(f"🚀 Starting batch crawl of {len(urls)} URLs (max {max_concurrent} concurrent)")
+    frontier = CrawlFrontier(frontier_path)
+    if resume:
+        recovered = frontier.recover()
+        if recovered:
+            print(f"♻️  Requeued {recovered} URLs left in flight by the previous run")
+    else:
+        frontier.reset()
+    frontier.add(urls, positions)
+
+    # Failed URLs from the previous run get another attempt
+    todo = frontier.pending(include_failed=resume)
+    skipped = len(set(urls)) - len(todo)
+    if skipped > 0:
+        print(f"⏭️  Resuming: skipping {skipped} already crawled URLs")
+
+    print(f"🚀 Starting batch crawl of {len(todo)} URLs (max {max_concurrent} concurrent, {per_host} per host)")
 
     # Configure browser for efficiency
     browser_config = BrowserConfig(
@@ -44,77 +186,222 @@ async def crawl_batch(urls: List[str], max_concurrent: int = 5):
         page_timeout=30000,  # 30 seconds timeout per page
         screenshot=False  # Disable screenshots for batch processing
     )
-
-    results = []
-    failed = []
-
-    async with AsyncWebCrawler(config=browser_config) as crawler:
-        # Use arun_many for efficient batch processing
-        batch_results = await crawler.arun_many(
-            urls=urls,
-            config=crawler_config,
-            max_concurrent=max_concurrent
+    # Config for pages the HTTP tier already fetched: nothing to wait for
+    static_config = crawler_config.clone(wait_for=None, remove_overlay_elements=False)
+
+    sink = ResultSink("batch_markdown", ndjson_path if stream else None, append=resume)
+    cache = CrawlCache(cache_dir) if cache_dir else None
+
+    def new_scheduler() -> HostScheduler:
+        return HostScheduler(
+            max_concurrent=max_concurrent,
+            per_host=per_host,
+            min_delay=host_delay,
+            respect_robots=respect_robots
         )
 
-        for result in batch_results:
-            if result.success:
-                results.append({
-                    "url": result.url,
-                    "title": result.metadata.get("title", ""),
-                    "description": result.metadata.get("description", ""),
-                    "content_length": len(result.markdown),
-                    "links_count": len(result.links.get("internal", [])) + len(result.links.get("external", [])),
-                    "images_count": len(result.media.get("images", [])),
-                })
-                print(f"✅ {result.url}")
-            else:
-                failed.append({
-                    "url": result.url,
-                    "error": result.error_message
-                })
-                print(f"❌ {result.url}: {result.error_message}")
-
-    # Save results
+    attempt = 0
+    throttled = set()
+    retry_urls: List[str] = []
+
+    async def render(url: str):
+        """
+        Crawl url: reuse the cached render on 304 Not Modified, else use the
+        static HTML when the HTTP tier has it, else render in the browser.
+        Returns (result, cached_render, error, status_code, headers)
+        """
+        entry = cache.get(url) if cache is not None else None
+        validators = CrawlCache.conditional_headers(entry)
+        if fetcher is not None and (http_first or validators):
+            page, complete = await fetcher.fetch_static(url, min_store_links=min_store_links, headers=validators)
+            if page.status_code == 304 and entry is not None:
+                cached = cache.load_render(entry)
+                if cached is not None:
+                    return None, cached, None, 304, page.headers
+                # Blobs were pruned: fetch again without validators
+                page, complete = await fetcher.fetch_static(url, min_store_links=min_store_links)
+            if complete and http_first:
+                # Process the fetched HTML without opening a browser page
+                async with lease_crawler() as crawler:
+                    result = await crawler.arun(url="raw://" + with_base_href(page.html, url), config=static_config)
+                result.url = url
+                result.links = rebase_links(result.links, url)
+                return result, None, result.error_message, result.status_code, page.headers
+            if page.status_code in RATE_LIMIT_CODES + DEFINITIVE_HTTP_CODES:
+                return None, None, f"HTTP {page.status_code}", page.status_code, page.headers
+
+        # Lease per page so the pool can health-check and recycle browsers mid-run
+        async with lease_crawler() as crawler:
+            result = await crawler.arun(url=url, config=crawler_config)
+        return result, None, result.error_message, result.status_code, result.response_headers
+
+    async def crawl_one(scheduler: HostScheduler, url: str):
+        started = time.perf_counter()
+        try:
+            result, cached, error, status_code, headers = await render(url)
+        except Exception as e:
+            result, cached, error, status_code, headers = None, None, str(e), None, None
+
+        if cached is not None:
+            record = sink.write_record(cached["summary"], cached["markdown"], frontier.position(url) or 0,
+                                       (time.perf_counter() - started) * 1000)
+            frontier.mark_done(url, record)
+            print(f"♻️  {url} (not modified, cached render)")
+            return
+
+        if result is not None and result.success:
+            record = sink.write(result, frontier.position(url) or 0, (time.perf_counter() - started) * 1000)
+            frontier.mark_done(url, record)
+            if cache is not None:
+                cache.put(url, result.html, str(result.markdown), record, headers)
+            print(f"✅ {url}")
+            return
+
+        # Rate limited: back off the whole host and requeue the URL once
+        if status_code in RATE_LIMIT_CODES:
+            headers = {k.lower(): v for k, v in (headers or {}).items()}
+            retry_after = parse_retry_after(headers.get("retry-after"))
+            scheduler.delay_host(url, retry_after if retry_after is not None else DEFAULT_RATE_LIMIT_BACKOFF)
+            if url not in throttled:
+                throttled.add(url)
+                scheduler.add([url])
+                print(f"⏳ {url}: HTTP {status_code}, backing off host")
+                return
+
+        failure_class = classify_failure(error, status_code)
+        record = {"url": url, "error": error, "failure_class": failure_class, "status_code": status_code,
+                  "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+        frontier.mark_failed(url, record)
+
+        if is_transient(failure_class) and attempt < max_retries:
+            retry_urls.append(url)
+            if failure_class == TIMEOUT:
+                # Don't let a slow origin hold slots for the full page_timeout again
+                # in this pass: push its remaining URLs to the retry pass too
+                deferred = scheduler.drain_host(url)
+                retry_urls.extend(deferred)
+                if deferred:
+                    print(f"🐢 {url}: timed out, deferring {len(deferred)} more URLs on this host")
+            print(f"🔁 {url}: {failure_class}, will retry")
+            return
+
+        sink.write_failure(record)
+        print(f"❌ {url}: [{failure_class}] {error}")
+
+    def record_crashes(errors):
+        """URLs whose crawl_one raised (sink, frontier or cache errors) are recorded as failed, not lost"""
+        for url, exc in errors:
+            error = f"{type(exc).__name__}: {exc}"
+            record = {"url": url, "error": error, "failure_class": classify_failure(error), "status_code": None,
+                      "elapsed_ms": None}
+            try:
+                frontier.mark_failed(url, record)
+                sink.write_failure(record)
+            except Exception as e:
+                print(f"⚠️  Could not record failure for {url}: {e}")
+            print(f"❌ {url}: [{record['failure_class']}] {error}")
+
+    fetcher = None
+    resource_stats = None
+    if todo:
+        frontier.mark_in_flight(todo)
+        pool = get_pool(browser_config=browser_config, max_leases=max_concurrent, profile=profile)
+        async with HttpFetcher(max_connections=max_concurrent * 2) as http_fetcher:
+            # The HTTP client serves both the static tier and cache revalidation
+            if (http_first or cache is not None) and http_fetcher.available:
+                fetcher = http_fetcher
+            # Per-host caps and delays, hosts interleaved round-robin
+            scheduler = new_scheduler()
+            scheduler.add(todo)
+            record_crashes(await scheduler.run(lambda url: crawl_one(scheduler, url)))
+
+            # Transient failures are retried after the healthy URLs have finished
+            while retry_urls and attempt < max_retries:
+                attempt += 1
+                pending, retry_urls = retry_urls, []
+                print(f"\n🔁 Retry pass {attempt}/{max_retries}: {len(pending)} URLs")
+
+                scheduler = new_scheduler()
+                scheduler.add(pending)
+                # Jittered exponential backoff per host before its retries start
+                for host_url in {host_of(url): url for url in pending}.values():
+                    scheduler.delay_host(host_url, backoff_delay(attempt))
+                frontier.mark_in_flight(pending)
+                record_crashes(await scheduler.run(lambda url: crawl_one(scheduler, url)))
+
+            if fetcher is not None and http_first:
+                print(f"\n⚡ HTTP tier: {fetcher.stats['http_complete']} pages served without a browser, "
+                      f"{fetcher.stats['escalated']} escalated")
+            if pool.blocker is not None:
+                print(f"🚫 Resource blocking ({pool.blocker.profile.name}): {pool.blocker.summary()}")
+                resource_stats = pool.blocker.stats()
+
+    sink.close()
+    if cache is not None:
+        print(f"💽 Crawl cache: {cache.stats['hits']} not-modified reuses, {cache.stats['stored']} renders stored")
+        cache.close()
+
+    # Counts include URLs completed by earlier resumed runs
+    counts = frontier.counts()
     output = {
-        "success_count": len(results),
-        "failed_count": len(failed),
-        "results": results,
-        "failed": failed
+        "success_count": counts[DONE],
+        "failed_count": counts[FAILED],
     }
+    if resource_stats is not None:
+        output["resource_stats"] = resource_stats
 
-    with open("batch_results.json", "w") as f:
-        json.dump(output, f, indent=2)
-
-    # Save individual markdown files
-    markdown_dir = Path("batch_markdown")
-    markdown_dir.mkdir(exist_ok=True)
-
-    for i, result in enumerate(batch_results):
-        if result.success:
-            # Create safe filename from URL
-            safe_name = result.url.replace("https://", "").replace("http://", "")
-            safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in safe_name)[:100]
-
-            file_path = markdown_dir / f"{i:03d}_{safe_name}.md"
-            with open(file_path, "w") as f:
-                f.write(f"# {result.metadata.get('title', result.url)}\n\n")
-                f.write(f"URL: {result.url}\n\n")
-                f.write(result.markdown)
+    if stream:
+        frontier.close()
+        results_file = ndjson_path
+    else:
+        output["results"] = frontier.results()
+        output["failed"] = frontier.failures()
+        frontier.close()
+        results_file = "batch_results.json"
+        with open(results_file, "w") as f:
+            json.dump(output, f, indent=2)
 
     print(f"\n📊 Batch Crawl Complete:")
-    print(f"   ✅ Success: {len(results)}")
-    print(f"   ❌ Failed: {len(failed)}")
-    print(f"   💾 Results saved to: batch_results.json")
-    print(f"   📁 Markdown files saved to: {markdown_dir}/")
+    print(f"   ✅ Success: {output['success_count']}")
+    print(f"   ❌ Failed: {output['failed_count']}")
+    print(f"   💾 Results saved to: {results_file}")
+    print(f"   📁 Markdown files saved to: {sink.markdown_dir}/")
+    print(f"   🗂️  Frontier journal: {frontier_path}")
 
     return output
 
-async def crawl_with_extraction(urls: List[str], schema_file: str = None):
+def build_css_strategy(schema: Dict[str, Any]):
+    """
+    Schema-based extraction strategy with its selectors compiled once: the lxml
+    variant caches each CSS selector as a compiled XPath after first use.
+    Falls back to the BeautifulSoup strategy on crawl4ai versions without it.
+    """
+    try:
+        from crawl4ai.extraction_strategy import JsonLxmlExtractionStrategy
+        return JsonLxmlExtractionStrategy(schema=schema)
+    except ImportError:
+        from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
+        return JsonCssExtractionStrategy(schema=schema)
+
+# Per-process strategy, built once by the extraction pool's initializer
+_worker_strategy = None
+
+def _init_extraction_worker(schema: Dict[str, Any]):
+    global _worker_strategy
+    _worker_strategy = build_css_strategy(schema)
+
+def _extract_html(url: str, html: str) -> List[Dict[str, Any]]:
+    """Extraction pool task: run the worker's compiled schema over one page's HTML"""
+    return _worker_strategy.extract(url, html)
+
+async def crawl_with_extraction(urls: List[str], schema_file: str = None, max_concurrent: int = 5,
+                                extract_workers: Optional[int] = None):
     """
     Batch crawl with structured data extraction
+    Pages are streamed out of the crawl as they finish and their raw HTML is
+    parsed in a process pool (extract_workers processes, default one per core),
+    so DOM parsing never blocks in-flight navigations and scales with cores.
     """
-    from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
-
     schema = None
     if schema_file and Path(schema_file).exists():
         with open(schema_file) as f:
@@ -124,7 +411,7 @@ async def crawl_with_extraction(urls: List[str], schema_file: str = None):
         # Default schema for general content
         schema = {
             "name": "content",
-            "selector": "body",
+            "baseSelector": "body",
             "fields": [
                 {"name": "headings", "selector": "h1, h2, h3", "type": "text", "all": True},
                 {"name": "paragraphs", "selector": "p", "type": "text", "all": True},
@@ -132,33 +419,66 @@ async def crawl_with_extraction(urls: List[str], schema_file: str = None):
             ]
         }
 
-    extraction_strategy = JsonCssExtractionStrategy(schema=schema)
-
+    # No extraction strategy here: the crawl only renders, the pool extracts
     crawler_config = CrawlerRunConfig(
-        extraction_strategy=extraction_strategy,
-        cache_mode=CacheMode.BYPASS
+        cache_mode=CacheMode.BYPASS,
+        stream=True
     )
+    dispatcher = MemoryAdaptiveDispatcher(max_session_permit=max_concurrent)
 
+    workers = max(1, min(extract_workers or os.cpu_count() or 1, len(urls)))
+    positions = {url: i for i, url in enumerate(urls)}
     extracted_data = []
-
-    async with AsyncWebCrawler() as crawler:
-        results = await crawler.arun_many(
-            urls=urls,
-            config=crawler_config,
-            max_concurrent=5
-        )
-
-        for result in results:
-            if result.success and result.extracted_content:
+    loop = asyncio.get_running_loop()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_extraction_worker,
+        initargs=(schema,),
+    ) as pool:
+        # Extraction future -> (url, crawl time) of the page it parses
+        pending: Dict[asyncio.Future, tuple] = {}
+
+        def collect(done):
+            for task in done:
+                url, elapsed_ms = pending.pop(task)
                 try:
-                    data = json.loads(result.extracted_content)
-                    extracted_data.append({
-                        "url": result.url,
-                        "data": data
-                    })
-                    print(f"✅ Extracted from: {result.url}")
-                except json.JSONDecodeError:
-                    print(f"⚠️ Failed to parse JSON from: {result.url}")
+                    data = task.result()
+                except Exception as e:
+                    print(f"⚠️ Failed to extract from: {url} ({e})")
+                    continue
+                entry = {
+                    "url": url,
+                    "data": data
+                }
+                if elapsed_ms is not None:
+                    entry["elapsed_ms"] = elapsed_ms
+                extracted_data.append(entry)
+                print(f"✅ Extracted from: {url}")
+
+        async with lease_crawler() as crawler:
+            async for result in await crawler.arun_many(
+                urls=urls,
+                config=crawler_config,
+                dispatcher=dispatcher
+            ):
+                if not result.success or not result.html:
+                    print(f"❌ {result.url}: {result.error_message}")
+                    continue
+                task = loop.run_in_executor(pool, _extract_html, result.url, result.html)
+                pending[task] = (result.url, dispatch_elapsed_ms(result))
+                # Backpressure: don't let rendered HTML pile up faster than it is parsed
+                if len(pending) >= workers * 2:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    collect(done)
+
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            collect(done)
+
+    # Results arrive in completion order; save them in input order
+    extracted_data.sort(key=lambda entry: positions.get(entry["url"], len(urls)))
 
     # Save extracted data
     with open("batch_extracted.json", "w") as f:
@@ -167,6 +487,128 @@ async def crawl_with_extraction(urls: List[str], schema_file: str = None):
     print(f"\n💾 Extracted data saved to: batch_extracted.json")
     return extracted_data
 
+def host_shard(url: str, workers: int) -> int:
+    """Stable shard index for url's host (same host -> same worker, across runs)"""
+    return zlib.crc32(host_of(url).encode("utf-8")) % workers
+
+def _crawl_shard(worker: int, urls: List[str], positions: Dict[str, int], options: Dict[str, Any],
+                 stats_queue=None):
+    """
+    Worker process entry point: crawl one shard with its own browser and event
+    loop, then report its resource stats to the parent on stats_queue
+    """
+    async def run():
+        try:
+            return await crawl_batch(urls, positions=positions, **options)
+        finally:
+            await close_pool()
+
+    print(f"🧵 Worker {worker}: {len(urls)} URLs, {options.get('max_concurrent')} concurrent")
+    output = asyncio.run(run())
+    if stats_queue is not None:
+        stats_queue.put((worker, output.get("resource_stats")))
+
+def crawl_sharded(urls: List[str], workers: int, output_prefix: str = "batch_results",
+                  **options) -> Dict[str, Any]:
+    """
+    Split the URL list by host hash across `workers` processes, each owning its
+    own browser pool, frontier and NDJSON output, then merge the per-worker
+    NDJSON into batch_results.json. Hashing by host keeps every origin on one
+    worker, so per-host politeness limits still hold. max_concurrent is the
+    budget for the whole run and is divided between the workers.
+    """
+    shards: List[List[str]] = [[] for _ in range(workers)]
+    positions: Dict[str, int] = {}
+    for index, url in enumerate(urls):
+        if url not in positions:
+            positions[url] = index
+            shards[host_shard(url, workers)].append(url)
+
+    frontier_path = Path(options.pop("frontier_path", DEFAULT_FRONTIER_PATH))
+    options.pop("stream", None)
+    options.pop("ndjson_path", None)
+    max_concurrent = options.pop("max_concurrent", 5)
+    per_worker = max(1, -(-max_concurrent // workers))
+
+    print(f"🚀 Sharding {len(positions)} URLs across {workers} worker processes "
+          f"({per_worker} concurrent each, {per_worker * workers} in total)")
+
+    # Spawn (not fork) so each worker starts with a clean event loop and browser
+    context = multiprocessing.get_context("spawn")
+    stats_queue = context.Queue()
+    processes = []
+    worker_outputs = []
+    for worker, shard in enumerate(shards):
+        if not shard:
+            continue
+        ndjson_path = f"{output_prefix}.worker{worker}.ndjson"
+        worker_outputs.append(ndjson_path)
+        worker_options = {
+            **options,
+            "max_concurrent": per_worker,
+            "stream": True,
+            "ndjson_path": ndjson_path,
+            "frontier_path": str(frontier_path.with_name(f"{frontier_path.stem}.worker{worker}{frontier_path.suffix}")),
+        }
+        process = context.Process(
+            target=_crawl_shard,
+            args=(worker, shard, {url: positions[url] for url in shard}, worker_options, stats_queue)
+        )
+        process.start()
+        processes.append(process)
+
+    # Drain reports while waiting: a worker can't exit with its report still buffered
+    reports: Dict[int, Optional[Dict[str, Any]]] = {}
+    while any(p.is_alive() for p in processes) or not stats_queue.empty():
+        try:
+            worker, stats = stats_queue.get(timeout=1)
+            reports[worker] = stats
+        except queue.Empty:
+            pass
+    for process in processes:
+        process.join()
+    crashed = [p.pid for p in processes if p.exitcode != 0]
+    if crashed:
+        print(f"⚠️  {len(crashed)} worker(s) exited abnormally; rerun with --resume to finish their shards")
+    resource_stats = merge_resource_stats(list(reports.values()))
+
+    # Merge worker outputs; the last line per URL wins (resumed runs append)
+    latest: Dict[str, Dict[str, Any]] = {}
+    for ndjson_path in worker_outputs:
+        if not Path(ndjson_path).exists():
+            continue
+        with open(ndjson_path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    latest[record["url"]] = record
+
+    ordered = sorted(latest.values(), key=lambda record: positions.get(record["url"], len(positions)))
+    results = [{k: v for k, v in r.items() if k != "status"} for r in ordered if r["status"] == "success"]
+    failed = [{k: v for k, v in r.items() if k != "status"} for r in ordered if r["status"] == "failed"]
+
+    output = {
+        "success_count": len(results),
+        "failed_count": len(failed),
+        "workers": workers,
+    }
+    if resource_stats is not None:
+        output["resource_stats"] = resource_stats
+    output["results"] = results
+    output["failed"] = failed
+    with open(f"{output_prefix}.json", "w") as f:
+        json.dump(output, f, indent=2)
+
+    print(f"\n📊 Sharded Batch Crawl Complete:")
+    print(f"   ✅ Success: {len(results)}")
+    print(f"   ❌ Failed: {len(failed)}")
+    if resource_stats is not None:
+        print(f"   🚫 Resource blocking: {resource_stats['requests_blocked']} requests blocked, "
+              f"~{resource_stats['estimated_bytes_saved'] / 1_000_000:.1f} MB saved")
+    print(f"   💾 Merged results saved to: {output_prefix}.json")
+
+    return output
+
 def load_urls(source: str) -> List[str]:
     """Load URLs from file or string"""
     if Path(source).exists():
@@ -178,6 +620,40 @@ def load_urls(source: str) -> List[str]:
 
     return urls
 
+def is_sitemap_source(source: str) -> bool:
+    """A sitemap (or sitemap index) URL rather than a URL file / list"""
+    if not source.startswith(("http://", "https://")) or "," in source:
+        return False
+    path = urlparse(source).path.lower()
+    return "sitemap" in path or path.endswith((".xml", ".xml.gz"))
+
+async def load_sitemap_urls(source: str, state: SitemapState, changed_only: bool) -> List[str]:
+    """
+    Page URLs from a sitemap, following index files. With changed_only, only
+    URLs new or modified (lastmod) since they were last crawled.
+    """
+    sync = await sync_sitemaps([source], state)
+    for error in sync.errors:
+        print(f"⚠️  Sitemap: {error}")
+    print(f"🗺️  Sitemap: {len(sync.fetched)} files read, {len(sync.skipped)} unchanged and skipped")
+    if changed_only:
+        print(f"   {len(sync.changed)} URLs new or modified since the last crawl")
+        return sync.changed
+    # URLs of skipped child sitemaps are only in the stored state
+    return state.urls() if sync.skipped else sync.urls
+
+def crawled_urls(output: Any, ndjson_path: str) -> List[str]:
+    """URLs a run completed, from its result list or its NDJSON stream"""
+    if isinstance(output, list):
+        return [entry["url"] for entry in output]
+    if "results" in output:
+        return [record["url"] for record in output["results"]]
+    if not Path(ndjson_path).exists():
+        return []
+    with open(ndjson_path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [record["url"] for record in records if record.get("status") == "success"]
+
 async def main():
     if len(sys.argv) < 2:
         print("""
@@ -187,15 +663,49 @@ Usage:
     # Crawl URLs from file
     python batch_crawler.py urls.txt [--max-concurrent 5]
 
+    # Resume an interrupted crawl (skips URLs already crawled)
+    python batch_crawler.py urls.txt --resume
+
+    # Stream summaries to NDJSON for very large URL lists
+    python batch_crawler.py urls.txt --stream
+
+    # Use 8 worker processes (URLs sharded by host)
+    python batch_crawler.py urls.txt --workers 8
+
     # Crawl with extraction
     python batch_crawler.py urls.txt --extract [schema.json]
 
+    # Re-crawl only the sitemap URLs modified since the last run
+    python batch_crawler.py https://centre.example/sitemap.xml --changed-only
+
     # Crawl comma-separated URLs
     python batch_crawler.py "https://example.com,https://example.org"
 
 Options:
-    --max-concurrent N    Max concurrent crawls (default: 5)
+    --max-concurrent N    Max concurrent crawls (default: 5); with --workers, the
+                          total across all workers
     --extract [schema]    Extract structured data using schema
+    --extract-workers N   Extraction processes for --extract (default: one per core)
+    --resume              Skip URLs completed by a previous run
+    --frontier FILE       Frontier journal path (default: batch_frontier.sqlite)
+    --stream [FILE]       Write one NDJSON summary line per URL as it completes
+                          instead of batch_results.json (default: batch_results.ndjson)
+    --per-host N          Max concurrent crawls per host (default: 2)
+    --host-delay S        Min seconds between requests to one host (default: 1.0)
+    --ignore-robots       Don't read robots.txt Crawl-delay
+    --max-retries N       Retry passes for transient failures (default: 2)
+    --browser-only        Skip the HTTP-first tier and render every page in the browser
+    --min-store-links N   Store-like links static HTML needs before the browser is
+                          skipped (default: 5 on directory URLs like /stores, else 0)
+    --cache-dir DIR       Crawl cache directory (default: .crawl_cache)
+    --no-cache            Don't read or write the crawl cache
+    --profile NAME        Resource profile: text-only (default) or full
+    --workers N           Shard URLs by host across N processes, each with its own
+                          browser and max-concurrent/N of the crawl budget; outputs
+                          are merged into batch_results.json
+    --changed-only        With a sitemap URL as source: only crawl URLs new or
+                          modified (<lastmod>) since their last crawl
+    --sitemap-state FILE  Sitemap lastmod/crawl state (default: .sitemap_state.sqlite)
 
 Example urls.txt:
     https://example.com
@@ -206,7 +716,22 @@ Example urls.txt:
         sys.exit(1)
 
     source = sys.argv[1]
-    urls = load_urls(source)
+    changed_only = "--changed-only" in sys.argv
+    sitemap_state = None
+    if is_sitemap_source(source):
+        state_path = DEFAULT_SITEMAP_STATE_PATH
+        if "--sitemap-state" in sys.argv[:-1]:
+            state_path = sys.argv[sys.argv.index("--sitemap-state") + 1]
+        sitemap_state = SitemapState(state_path, source)
+        urls = await load_sitemap_urls(source, sitemap_state, changed_only)
+        if changed_only and not urls:
+            print("✅ Nothing modified since the last crawl")
+            sitemap_state.close()
+            return
+    else:
+        if changed_only:
+            print("⚠️  --changed-only needs a sitemap URL as source; crawling every URL")
+        urls = load_urls(source)
 
     if not urls:
         print("❌ No URLs found")
@@ -218,6 +743,20 @@ Example urls.txt:
     max_concurrent = 5
     extract_mode = False
     schema_file = None
+    resume = False
+    frontier_path = DEFAULT_FRONTIER_PATH
+    stream = False
+    ndjson_path = "batch_results.ndjson"
+    per_host = 2
+    host_delay = 1.0
+    respect_robots = True
+    max_retries = 2
+    http_first = True
+    min_store_links = None
+    cache_dir = DEFAULT_CACHE_DIR
+    profile = "text-only"
+    workers = 1
+    extract_workers = None
 
     for i, arg in enumerate(sys.argv[2:], 2):
         if arg == "--max-concurrent" and i + 1 < len(sys.argv):
@@ -226,11 +765,60 @@ Example urls.txt:
             extract_mode = True
             if i + 1 < len(sys.argv) and not sys.argv[i + 1].startswith("--"):
                 schema_file = sys.argv[i + 1]
-
-    if extract_mode:
-        await crawl_with_extraction(urls, schema_file)
-    else:
-        await crawl_batch(urls, max_concurrent)
+        elif arg == "--resume":
+            resume = True
+        elif arg == "--frontier" and i + 1 < len(sys.argv):
+            frontier_path = sys.argv[i + 1]
+        elif arg == "--stream":
+            stream = True
+            if i + 1 < len(sys.argv) and not sys.argv[i + 1].startswith("--"):
+                ndjson_path = sys.argv[i + 1]
+        elif arg == "--per-host" and i + 1 < len(sys.argv):
+            per_host = int(sys.argv[i + 1])
+        elif arg == "--host-delay" and i + 1 < len(sys.argv):
+            host_delay = float(sys.argv[i + 1])
+        elif arg == "--ignore-robots":
+            respect_robots = False
+        elif arg == "--max-retries" and i + 1 < len(sys.argv):
+            max_retries = int(sys.argv[i + 1])
+        elif arg == "--browser-only":
+            http_first = False
+        elif arg == "--min-store-links" and i + 1 < len(sys.argv):
+            min_store_links = int(sys.argv[i + 1])
+        elif arg == "--cache-dir" and i + 1 < len(sys.argv):
+            cache_dir = sys.argv[i + 1]
+        elif arg == "--no-cache":
+            cache_dir = None
+        elif arg == "--profile" and i + 1 < len(sys.argv):
+            profile = sys.argv[i + 1]
+        elif arg == "--workers" and i + 1 < len(sys.argv):
+            workers = int(sys.argv[i + 1])
+        elif arg == "--extract-workers" and i + 1 < len(sys.argv):
+            extract_workers = int(sys.argv[i + 1])
+
+    crawl_started = time.time()
+    try:
+        if extract_mode:
+            output = await crawl_with_extraction(urls, schema_file, max_concurrent, extract_workers)
+        elif workers > 1:
+            output = crawl_sharded(urls, workers, max_concurrent=max_concurrent, resume=resume,
+                                   frontier_path=frontier_path, per_host=per_host,
+                                   host_delay=host_delay, respect_robots=respect_robots,
+                                   max_retries=max_retries, http_first=http_first,
+                                   cache_dir=cache_dir, profile=profile, min_store_links=min_store_links)
+        else:
+            output = await crawl_batch(urls, max_concurrent, resume=resume, frontier_path=frontier_path,
+                                       stream=stream, ndjson_path=ndjson_path, per_host=per_host,
+                                       host_delay=host_delay, respect_robots=respect_robots,
+                                       max_retries=max_retries, http_first=http_first,
+                                       cache_dir=cache_dir, profile=profile, min_store_links=min_store_links)
+        if sitemap_state is not None:
+            # Later --changed-only runs compare lastmod against this crawl's start
+            sitemap_state.mark_crawled(crawled_urls(output, ndjson_path), at=crawl_started)
+    finally:
+        await close_pool()
+        if sitemap_state is not None:
+            sitemap_state.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
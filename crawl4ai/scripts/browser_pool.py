@@ -0,0 +1,177 @@
+"""
+Shared long-lived browser pool for crawl scripts
+Keeps a few warm AsyncWebCrawler instances per process and leases them out,
+so callers stop paying browser startup per call. Browsers are health-checked
+before each lease and recycled after serving max_pages pages.
+
+Usage:
+    from browser_pool import lease_crawler, close_pool
+
+    async with lease_crawler() as crawler:
+        result = await crawler.arun(url, config=config)
+    ...
+    await close_pool()  # once, before the process exits
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+from crawl_profiles import PROFILES, ResourceBlocker
+
+
+class PooledCrawler:
+    """Thin proxy around AsyncWebCrawler that counts the pages it serves"""
+
+    def __init__(self, slot: "_Slot"):
+        self._slot = slot
+
+    async def arun(self, url: str, *args, **kwargs):
+        if not url.startswith("raw:"):
+            self._slot.pages += 1
+        return await self._slot.crawler.arun(url, *args, **kwargs)
+
+    async def arun_many(self, urls, *args, **kwargs):
+        self._slot.pages += len(urls)
+        return await self._slot.crawler.arun_many(urls, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._slot.crawler, name)
+
+
+class _Slot:
+    def __init__(self):
+        self.crawler: Optional[AsyncWebCrawler] = None
+        self.pages = 0
+        self.active = 0
+        self.unhealthy = False
+        self.lock = asyncio.Lock()
+
+
+class BrowserPool:
+    """
+    Pool of `size` warm browsers; each serves up to `max_leases` concurrent
+    leases and is restarted after `max_pages` pages or when it stops responding.
+    `profile` names a crawl_profiles resource-blocking profile for every page.
+    """
+
+    def __init__(self, size: int = 1, browser_config: BrowserConfig = None,
+                 max_pages: int = 200, max_leases: int = 8, profile: str = "full"):
+        self.size = size
+        self.browser_config = browser_config or BrowserConfig(headless=True, verbose=False)
+        self.blocker = ResourceBlocker.from_profile(profile)
+        if PROFILES[profile].browser_options:
+            self.browser_config = self.browser_config.clone(**PROFILES[profile].browser_options)
+        self.max_pages = max_pages
+        self.max_leases = max_leases
+        self.slots: List[_Slot] = [_Slot() for _ in range(size)]
+        self.recycled = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def start(self):
+        """Launch every browser up-front so the first leases are warm"""
+        await asyncio.gather(*(self._launch(slot) for slot in self.slots if slot.crawler is None))
+
+    async def close(self):
+        await asyncio.gather(*(self._shutdown(slot) for slot in self.slots))
+
+    async def _launch(self, slot: _Slot):
+        crawler = AsyncWebCrawler(config=self.browser_config)
+        if self.blocker is not None:
+            self.blocker.attach(crawler)
+        await crawler.start()
+        slot.crawler = crawler
+        slot.pages = 0
+        slot.unhealthy = False
+
+    async def _shutdown(self, slot: _Slot):
+        crawler, slot.crawler = slot.crawler, None
+        if crawler is not None:
+            try:
+                await crawler.close()
+            except Exception:
+                pass
+
+    def _is_healthy(self, slot: _Slot) -> bool:
+        if slot.crawler is None or slot.unhealthy:
+            return False
+        # Playwright exposes connection state on the underlying browser; if this
+        # crawl4ai version hides it, assume healthy and rely on lease errors instead
+        try:
+            browser = slot.crawler.crawler_strategy.browser_manager.browser
+            return browser is None or browser.is_connected()
+        except AttributeError:
+            return True
+
+    def _needs_recycle(self, slot: _Slot) -> bool:
+        return slot.crawler is not None and (
+            slot.pages >= self.max_pages or not self._is_healthy(slot)
+        )
+
+    def _pick(self) -> Optional[_Slot]:
+        """Least-loaded usable slot, or None if every browser is at max_leases"""
+        candidates = [
+            slot for slot in self.slots
+            if slot.active < self.max_leases and not (slot.active and self._needs_recycle(slot))
+        ]
+        if not candidates:
+            return None
+        # Prefer browsers within their page budget, then the least busy
+        return min(candidates, key=lambda slot: (slot.pages >= self.max_pages, slot.active))
+
+    @asynccontextmanager
+    async def lease(self):
+        """Borrow a crawler; errors inside the lease trigger a health check"""
+        async with self._condition:
+            while (slot := self._pick()) is None:
+                await self._condition.wait()
+            slot.active += 1
+
+        try:
+            async with slot.lock:
+                if self._needs_recycle(slot) and slot.active == 1:
+                    await self._shutdown(slot)
+                    self.recycled += 1
+                if slot.crawler is None:
+                    await self._launch(slot)
+            yield PooledCrawler(slot)
+        except Exception:
+            slot.unhealthy = not self._is_healthy(slot)
+            raise
+        finally:
+            async with self._condition:
+                slot.active -= 1
+                self._condition.notify_all()
+
+
+_default_pool: Optional[BrowserPool] = None
+
+
+def get_pool(**kwargs) -> BrowserPool:
+    """Process-wide pool; kwargs only apply when the pool is first created"""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = BrowserPool(**kwargs)
+    return _default_pool
+
+
+def lease_crawler():
+    """Lease a crawler from the process-wide pool"""
+    return get_pool().lease()
+
+
+async def close_pool():
+    """Shut down the process-wide pool's browsers"""
+    global _default_pool
+    if _default_pool is not None:
+        await _default_pool.close()
+        _default_pool = None
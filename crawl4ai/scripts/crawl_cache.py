@@ -0,0 +1,166 @@
+"""
+Content-addressed on-disk crawl cache with conditional revalidation
+Stores the rendered HTML and markdown of each page under the SHA-256 of their
+content, indexed by normalised URL together with the ETag / Last-Modified
+validators. Later runs send a conditional request and reuse the stored render
+when the server answers 304 Not Modified.
+"""
+
+import gzip
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+DEFAULT_CACHE_DIR = ".crawl_cache"
+
+# Query parameters that never change page content
+TRACKING_PARAMS = ("utm_", "gclid", "fbclid", "mc_cid", "mc_eid")
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key: lowercase host, no default port/fragment/tracking params, sorted query"""
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower() or "http"
+    host = (parsed.hostname or "").lower()
+    port = parsed.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    path = parsed.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    ))
+    return urlunparse((scheme, host, path, "", query, ""))
+
+
+class CrawlCache:
+    """
+    index.sqlite maps normalised URL -> validators + blob hashes + summary;
+    blobs/ holds gzip'd HTML/markdown named by the SHA-256 of their content,
+    so identical renders (mirrors, unchanged pages) are stored once.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.root = Path(cache_dir)
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        # Sharded batch crawls share one cache across processes
+        self.conn = sqlite3.connect(str(self.root / "index.sqlite"), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                html_hash TEXT,
+                markdown_hash TEXT,
+                summary TEXT,
+                fetched_at REAL NOT NULL,
+                validated_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+
+    def close(self):
+        self.conn.close()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}.gz"
+
+    def _put_blob(self, content: str) -> str:
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(gzip.compress(data))
+            tmp.replace(path)
+        return digest
+
+    def _get_blob(self, digest: Optional[str]) -> Optional[str]:
+        if not digest:
+            return None
+        path = self._blob_path(digest)
+        if not path.exists():
+            return None
+        return gzip.decompress(path.read_bytes()).decode("utf-8")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached entry metadata for url (validators, summary), or None"""
+        row = self.conn.execute(
+            "SELECT url, etag, last_modified, html_hash, markdown_hash, summary, fetched_at "
+            "FROM pages WHERE url_key = ?",
+            (normalize_url(url),),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "url": row[0],
+            "etag": row[1],
+            "last_modified": row[2],
+            "html_hash": row[3],
+            "markdown_hash": row[4],
+            "summary": json.loads(row[5]) if row[5] else {},
+            "fetched_at": row[6],
+        }
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating entry"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load_render(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Stored html/markdown for entry, refreshing its validated_at; None if blobs are gone"""
+        markdown = self._get_blob(entry.get("markdown_hash"))
+        if markdown is None:
+            self.stats["misses"] += 1
+            return None
+        self.conn.execute(
+            "UPDATE pages SET validated_at = ? WHERE url_key = ?",
+            (time.time(), normalize_url(entry["url"])),
+        )
+        self.conn.commit()
+        self.stats["hits"] += 1
+        return {
+            "html": self._get_blob(entry.get("html_hash")),
+            "markdown": markdown,
+            "summary": entry["summary"],
+        }
+
+    def put(self, url: str, html: str, markdown: str, summary: Dict[str, Any],
+            headers: Optional[Dict[str, str]] = None):
+        """Store a fresh render; entries without validators are kept but always refetched"""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        now = time.time()
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO pages
+                (url_key, url, etag, last_modified, html_hash, markdown_hash, summary, fetched_at, validated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                normalize_url(url), url,
+                headers.get("etag"), headers.get("last-modified"),
+                self._put_blob(html or ""), self._put_blob(markdown or ""),
+                json.dumps(summary), now, now,
+            ),
+        )
+        self.conn.commit()
+        self.stats["stored"] += 1
@@ -0,0 +1,153 @@
+"""
+Disk-backed crawl frontier for batch crawling
+Records every URL as pending, in_flight, done or failed in a SQLite journal
+so an interrupted batch can be resumed without re-crawling finished URLs.
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_FRONTIER_PATH = "batch_frontier.sqlite"
+
+
+class CrawlFrontier:
+    """
+    SQLite journal of URL states keyed by URL.
+    Every state change is committed immediately, so a crash loses at most
+    the pages that were in flight at the time.
+    """
+
+    def __init__(self, path: str = DEFAULT_FRONTIER_PATH):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        # WAL keeps per-URL commits cheap and lets readers inspect a running crawl
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                summary TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def reset(self):
+        """Forget every URL (used for a fresh, non-resumed run)"""
+        self.conn.execute("DELETE FROM frontier")
+        self.conn.commit()
+
+    def add(self, urls: Iterable[str], positions: Optional[Dict[str, int]] = None):
+        """
+        Register URLs as pending; URLs already known keep their state.
+        positions overrides the default append order (e.g. a shard's
+        positions in the full URL list)
+        """
+        now = time.time()
+        next_position = self.conn.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM frontier"
+        ).fetchone()[0]
+        rows = []
+        for url in urls:
+            if positions is not None and url in positions:
+                rows.append((url, positions[url], PENDING, now))
+            else:
+                rows.append((url, next_position, PENDING, now))
+                next_position += 1
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO frontier (url, position, state, updated_at) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.commit()
+
+    def recover(self) -> int:
+        """Return URLs left in flight by a crashed run to pending"""
+        cursor = self.conn.execute(
+            "UPDATE frontier SET state = ?, updated_at = ? WHERE state = ?",
+            (PENDING, time.time(), IN_FLIGHT),
+        )
+        self.conn.commit()
+        return cursor.rowcount
+
+    def pending(self, include_failed: bool = False) -> List[str]:
+        """URLs still to crawl, in their original order"""
+        states = (PENDING, FAILED) if include_failed else (PENDING,)
+        placeholders = ",".join("?" for _ in states)
+        rows = self.conn.execute(
+            f"SELECT url FROM frontier WHERE state IN ({placeholders}) ORDER BY position",
+            states,
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def position(self, url: str) -> Optional[int]:
+        row = self.conn.execute(
+            "SELECT position FROM frontier WHERE url = ?", (url,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def mark_in_flight(self, urls: Iterable[str]):
+        now = time.time()
+        self.conn.executemany(
+            "UPDATE frontier SET state = ?, attempts = attempts + 1, updated_at = ? WHERE url = ?",
+            [(IN_FLIGHT, now, url) for url in urls],
+        )
+        self.conn.commit()
+
+    def mark_done(self, url: str, summary: Dict[str, Any]):
+        self.conn.execute(
+            "UPDATE frontier SET state = ?, summary = ?, error = NULL, updated_at = ? WHERE url = ?",
+            (DONE, json.dumps(summary), time.time(), url),
+        )
+        self.conn.commit()
+
+    def mark_failed(self, url: str, error: Dict[str, Any]):
+        self.conn.execute(
+            "UPDATE frontier SET state = ?, error = ?, updated_at = ? WHERE url = ?",
+            (FAILED, json.dumps(error), time.time(), url),
+        )
+        self.conn.commit()
+
+    def counts(self) -> Dict[str, int]:
+        counts = {PENDING: 0, IN_FLIGHT: 0, DONE: 0, FAILED: 0}
+        for state, count in self.conn.execute(
+            "SELECT state, COUNT(*) FROM frontier GROUP BY state"
+        ):
+            counts[state] = count
+        return counts
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Summaries of every completed URL, in original order"""
+        rows = self.conn.execute(
+            "SELECT summary FROM frontier WHERE state = ? ORDER BY position", (DONE,)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def failures(self) -> List[Dict[str, Any]]:
+        """Error records of every failed URL, in original order"""
+        rows = self.conn.execute(
+            "SELECT error FROM frontier WHERE state = ? ORDER BY position", (FAILED,)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
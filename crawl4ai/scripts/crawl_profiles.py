@@ -0,0 +1,159 @@
+"""
+Named resource-blocking profiles for crawls
+The "text-only" profile aborts image, font and media requests plus known
+analytics / tag-manager scripts at the network layer, since our crawls only
+use text, links and metadata. Each blocker keeps per-run stats of the
+requests (and estimated bytes) it saved.
+
+Usage:
+    blocker = ResourceBlocker.from_profile("text-only")
+    blocker.attach(crawler)          # before crawler.start()
+    ...
+    print(blocker.summary())
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# Typical transfer sizes, used to estimate bytes saved by aborted requests
+# (an aborted request never reports its real size)
+AVERAGE_BYTES = {
+    "image": 60_000,
+    "font": 35_000,
+    "media": 500_000,
+    "tracker": 40_000,
+}
+
+TRACKER_HOSTS = (
+    "googletagmanager.com",
+    "google-analytics.com",
+    "analytics.google.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "connect.facebook.net",
+    "facebook.com/tr",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.com",
+    "segment.io",
+    "cdn.mxpnl.com",
+    "hs-analytics.net",
+    "hs-scripts.com",
+    "static.ads-twitter.com",
+    "snap.licdn.com",
+    "tiktok.com/i18n/pixel",
+    "bat.bing.com",
+    "cookiebot.com",
+    "onetrust.com",
+    "cookielaw.org",
+)
+
+
+@dataclass(frozen=True)
+class CrawlProfile:
+    name: str
+    blocked_types: FrozenSet[str] = frozenset()
+    blocked_hosts: Tuple[str, ...] = ()
+    browser_options: Dict[str, object] = field(default_factory=dict)
+    run_options: Dict[str, object] = field(default_factory=dict)
+
+
+PROFILES: Dict[str, CrawlProfile] = {
+    "full": CrawlProfile(name="full"),
+    "text-only": CrawlProfile(
+        name="text-only",
+        blocked_types=frozenset({"image", "font", "media"}),
+        blocked_hosts=TRACKER_HOSTS,
+        browser_options={"text_mode": True},
+        run_options={"wait_for_images": False},
+    ),
+}
+
+
+class ResourceBlocker:
+    """Aborts requests matching a profile and counts what was saved"""
+
+    def __init__(self, profile: CrawlProfile):
+        self.profile = profile
+        self.blocked = Counter()
+        self.allowed_requests = 0
+
+    @classmethod
+    def from_profile(cls, name: str) -> Optional["ResourceBlocker"]:
+        """Blocker for a named profile, or None for profiles that block nothing"""
+        if name not in PROFILES:
+            raise ValueError(f"Unknown crawl profile: {name} (choose from {', '.join(PROFILES)})")
+        profile = PROFILES[name]
+        if not profile.blocked_types and not profile.blocked_hosts:
+            return None
+        return cls(profile)
+
+    def classify(self, url: str, resource_type: str) -> Optional[str]:
+        """Block category for a request, or None to let it through"""
+        if any(host in url for host in self.profile.blocked_hosts):
+            return "tracker"
+        if resource_type in self.profile.blocked_types:
+            return resource_type
+        return None
+
+    async def _route(self, route):
+        request = route.request
+        category = self.classify(request.url, request.resource_type)
+        if category is None:
+            self.allowed_requests += 1
+            await route.continue_()
+        else:
+            self.blocked[category] += 1
+            await route.abort()
+
+    async def on_page_context_created(self, page, context, **kwargs):
+        await page.route("**/*", self._route)
+        return page
+
+    def attach(self, crawler):
+        """Install the blocking hook on an AsyncWebCrawler (before it starts)"""
+        crawler.crawler_strategy.set_hook("on_page_context_created", self.on_page_context_created)
+
+    @property
+    def requests_saved(self) -> int:
+        return sum(self.blocked.values())
+
+    @property
+    def bytes_saved_estimate(self) -> int:
+        return sum(AVERAGE_BYTES.get(category, 0) * count for category, count in self.blocked.items())
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "profile": self.profile.name,
+            "requests_allowed": self.allowed_requests,
+            "requests_blocked": self.requests_saved,
+            "blocked_by_type": dict(self.blocked),
+            "estimated_bytes_saved": self.bytes_saved_estimate,
+        }
+
+    def summary(self) -> str:
+        total = self.allowed_requests + self.requests_saved
+        share = (self.requests_saved / total * 100) if total else 0.0
+        by_type = ", ".join(f"{count} {category}" for category, count in self.blocked.most_common())
+        return (f"{self.requests_saved}/{total} requests blocked ({share:.0f}%: {by_type or 'none'}), "
+                f"~{self.bytes_saved_estimate / 1_000_000:.1f} MB saved")
+
+
+def merge_resource_stats(stats: List[Dict[str, object]]) -> Optional[Dict[str, object]]:
+    """Sum ResourceBlocker.stats() from several runs (one per sharded worker); None if there are none"""
+    stats = [s for s in stats if s]
+    if not stats:
+        return None
+    blocked_by_type: Counter = Counter()
+    for s in stats:
+        blocked_by_type.update(s.get("blocked_by_type") or {})
+    profiles = sorted({str(s.get("profile")) for s in stats})
+    return {
+        "profile": profiles[0] if len(profiles) == 1 else ",".join(profiles),
+        "requests_allowed": sum(int(s.get("requests_allowed") or 0) for s in stats),
+        "requests_blocked": sum(int(s.get("requests_blocked") or 0) for s in stats),
+        "blocked_by_type": dict(blocked_by_type),
+        "estimated_bytes_saved": sum(int(s.get("estimated_bytes_saved") or 0) for s in stats),
+    }
@@ -0,0 +1,274 @@
+"""
+DOM-aligned chunking of large tenant directory pages for LLM extraction
+A single LLM call over a 200+ unit directory truncates its input or runs out
+of output tokens and silently drops tenants. This splits the rendered page
+along its own structure - sibling card groups, list items, A-Z sections -
+into chunks of bounded text size, so each chunk can be extracted on its own
+and concurrently, then merges the results with brand-normalised deduplication (tenant_names.py).
+
+Usage:
+    chunks = split_directory(html, base_url=url)
+    results = await extract_chunks(chunks, extract_one, concurrency=4)
+    tenants = merge_tenants(r for r in results if not isinstance(r, Exception))
+"""
+
+import asyncio
+from html.parser import HTMLParser
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Union
+from urllib.parse import urljoin
+
+from tenant_names import BrandIndex, name_key
+
+DEFAULT_CHUNK_CHARS = 8000  # Rendered text per chunk: ~2k input tokens, room for ~100 tenants of output
+DEFAULT_CONCURRENCY = 4  # Concurrent LLM calls per directory page
+
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "head", "iframe", "select"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "source", "track", "wbr"}
+BLOCK_TAGS = {"address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "figcaption",
+              "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+              "main", "nav", "ol", "p", "section", "table", "tbody", "td", "th", "thead", "tr", "ul", "br"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+# Opening one of these closes an unclosed sibling of the same kind
+SELF_CLOSING_SIBLINGS = {"li", "p", "dt", "dd", "tr", "td", "th", "option"}
+
+
+class Node:
+    __slots__ = ("tag", "attrs", "children", "size")
+
+    def __init__(self, tag: str, attrs: Dict[str, str] = None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children: List[Union["Node", str]] = []
+        self.size = 0  # Length of the rendered text, filled in by _measure
+
+    def find(self, tag: str) -> Optional["Node"]:
+        for child in self.children:
+            if isinstance(child, Node):
+                if child.tag == tag:
+                    return child
+                found = child.find(tag)
+                if found is not None:
+                    return found
+        return None
+
+
+class _TreeBuilder(HTMLParser):
+    """Lenient HTML -> Node tree; drops script/style/etc. and tolerates unclosed tags"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#root")
+        self.stack = [self.root]
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_depth:
+            if tag in SKIP_TAGS:
+                self._skip_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            self._skip_depth = 1
+            return
+        if tag in SELF_CLOSING_SIBLINGS and self.stack[-1].tag == tag:
+            self.stack.pop()
+        node = Node(tag, {k: v for k, v in attrs if v is not None})
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        if not self._skip_depth and tag not in SKIP_TAGS:
+            self.stack[-1].children.append(Node(tag, {k: v for k, v in attrs if v is not None}))
+
+    def handle_endtag(self, tag):
+        if self._skip_depth:
+            if tag in SKIP_TAGS:
+                self._skip_depth -= 1
+            return
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        if not self._skip_depth and data.strip():
+            self.stack[-1].children.append(data)
+
+
+def parse_html(html: str) -> Node:
+    builder = _TreeBuilder()
+    try:
+        builder.feed(html)
+        builder.close()
+    except Exception:
+        pass  # Keep whatever parsed before the error
+    _measure(builder.root)
+    return builder.root
+
+
+def link_href(node: Node, base_url: str) -> Optional[str]:
+    """Absolute target of a link element, or None for in-page, script, mailto and tel links"""
+    href = (node.attrs.get("href") or "").strip()
+    if not href or href.startswith(("#", "javascript:", "mailto:", "tel:")):
+        return None
+    return urljoin(base_url, href) if base_url else href
+
+
+def _measure(node: Node) -> int:
+    size = 0
+    for child in node.children:
+        size += len(" ".join(child.split())) + 1 if isinstance(child, str) else _measure(child)
+    if node.tag == "a":
+        size += len(node.attrs.get("href") or "") + 3
+    node.size = size
+    return size
+
+
+def _render(node: Union[Node, str], base_url: str, parts: List[str]):
+    if isinstance(node, str):
+        parts.append(" " + node)  # Adjacent inline elements ("<span>Fashion</span><span>Unit 4</span>") stay apart
+        return
+    block = node.tag in BLOCK_TAGS
+    if block:
+        parts.append("\n")
+    for child in node.children:
+        _render(child, base_url, parts)
+    if node.tag == "a":
+        href = link_href(node, base_url)
+        if href:
+            parts.append(f" ({href})")
+    if block:
+        parts.append("\n")
+
+
+def render_text(nodes: Iterable[Union[Node, str]], base_url: str = "") -> str:
+    """Visible text, one line per block element, with link targets in brackets after the link text"""
+    parts: List[str] = []
+    for node in nodes:
+        _render(node, base_url, parts)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _size(node: Union[Node, str]) -> int:
+    return len(" ".join(node.split())) + 1 if isinstance(node, str) else node.size
+
+
+def _pack(node: Node, max_chars: int) -> List[List[Union[Node, str]]]:
+    """Group node's children into runs of siblings up to max_chars, descending into oversized children"""
+    groups: List[List[Union[Node, str]]] = []
+    current: List[Union[Node, str]] = []
+    size = 0
+    for child in node.children:
+        child_size = _size(child)
+        if not child_size:
+            continue
+        if child_size > max_chars and isinstance(child, Node) and any(isinstance(c, Node) for c in child.children):
+            if current:
+                groups.append(current)
+                current, size = [], 0
+            groups.extend(_pack(child, max_chars))
+            continue
+        # Start a new chunk when full, or at a heading (an A-Z letter, a category)
+        # once the current chunk is reasonably filled
+        starts_section = isinstance(child, Node) and child.tag in HEADING_TAGS
+        if current and (size + child_size > max_chars or (starts_section and size >= max_chars // 2)):
+            groups.append(current)
+            current, size = [], 0
+        current.append(child)
+        size += child_size
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _coalesce(groups: List[List[Union[Node, str]]], max_chars: int) -> List[List[Union[Node, str]]]:
+    """Fold small leftover groups (a nav bar, a lone heading) into their neighbour when they fit"""
+    merged: List[List[Union[Node, str]]] = []
+    sizes: List[int] = []
+    for group in groups:
+        size = sum(_size(node) for node in group)
+        starts_section = isinstance(group[0], Node) and group[0].tag in HEADING_TAGS
+        if merged and sizes[-1] + size <= max_chars and (sizes[-1] < max_chars // 4 or not starts_section):
+            merged[-1].extend(group)
+            sizes[-1] += size
+        else:
+            merged.append(list(group))
+            sizes.append(size)
+    return merged
+
+
+def split_directory(html: str, base_url: str = "", max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """
+    Split a rendered directory page into text chunks that each end on an
+    element boundary. A page under max_chars comes back as a single chunk.
+    """
+    root = parse_html(html)
+    body = root.find("body") or root
+    chunks = [render_text(group, base_url) for group in _coalesce(_pack(body, max_chars), max_chars)]
+    return [chunk for chunk in chunks if chunk]
+
+
+class TenantMerge:
+    """
+    Incremental merge, one entry per brand, for results that arrive over
+    time. Names are matched through a BrandIndex ("M&S" == "Marks and Spencer
+    Foodhall", near-identical spellings). A repeated tenant keeps its first
+    occurrence, with empty fields filled in from later ones.
+    """
+
+    def __init__(self):
+        self._index = BrandIndex()
+        self._merged: Dict[int, Dict] = {}
+
+    def add(self, batch: Iterable[Dict]) -> int:
+        """Merge a batch; returns how many tenants were new"""
+        added = 0
+        for tenant in batch:
+            if not isinstance(tenant, dict):
+                continue
+            name = str(tenant.get("name") or "")
+            match = self._index.lookup(name)
+            if match is None and not name_key(name):
+                continue
+            key = self._index.add(match[0] if match else name)
+            existing = self._merged.get(key)
+            if existing is None:
+                self._merged[key] = dict(tenant)
+                added += 1
+                continue
+            for field, value in tenant.items():
+                if value and not existing.get(field):
+                    existing[field] = value
+        return added
+
+    @property
+    def tenants(self) -> List[Dict]:
+        return list(self._merged.values())
+
+    def __len__(self) -> int:
+        return len(self._merged)
+
+
+def merge_tenants(batches: Iterable[Iterable[Dict]]) -> List[Dict]:
+    """Merge per-chunk tenant lists in order (see TenantMerge)"""
+    merge = TenantMerge()
+    for batch in batches:
+        merge.add(batch)
+    return merge.tenants
+
+
+async def extract_chunks(chunks: List[str], extract: Callable[[str], Awaitable[List[Dict]]],
+                         concurrency: int = DEFAULT_CONCURRENCY) -> List[Union[List[Dict], Exception]]:
+    """
+    Run extract(chunk) for every chunk, at most `concurrency` at a time.
+    Results come back in chunk order; a failed chunk yields its exception.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(chunk: str):
+        async with semaphore:
+            return await extract(chunk)
+
+    return await asyncio.gather(*(run(chunk) for chunk in chunks), return_exceptions=True)
@@ -0,0 +1,238 @@
+"""
+Local scored classifier for store/dining directory URLs
+Scores each candidate URL's path and anchor text against directory keywords,
+plus weights learned from directory URLs confirmed on earlier runs. Most
+centre sites use /stores, /shops or /dining and resolve here without an LLM
+call; callers fall back to the LLM only when the classification is not
+`confident`.
+
+Usage:
+    classifier = DirectoryClassifier()
+    result = classifier.classify(urls, anchors={url: "Store Directory"})
+    if result.confident:
+        ...use result.store_url / result.dining_url...
+    classifier.learn(confirmed_url, STORE)
+"""
+
+import json
+import math
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are still atomic, but concurrent learners may race
+    fcntl = None
+
+STORE = "store"
+DINING = "dining"
+
+# Beside this script, so every caller shares one file whatever its working directory
+DEFAULT_WEIGHTS_PATH = str(Path(__file__).resolve().parent / ".directory_weights.json")
+
+# Path segments that are a directory page by themselves
+EXACT_SEGMENTS = {
+    STORE: {"stores", "shops", "shopping", "store-directory", "shop-directory", "directory",
+            "retailers", "brands", "our-stores", "all-stores", "store-finder", "shop", "store"},
+    DINING: {"dining", "eat", "food", "restaurants", "food-drink", "food-and-drink", "eat-drink",
+             "eat-and-drink", "cafes", "food-court", "restaurants-cafes", "eat-and-play"},
+}
+
+# Token prefixes (so "shop" matches "shops" and "shopping")
+KEYWORDS = {
+    STORE: ("store", "shop", "retail", "brand", "directory", "tenant"),
+    DINING: ("dining", "restaurant", "food", "eat", "cafe", "drink"),
+}
+
+ANCHOR_PHRASES = {
+    STORE: ("store directory", "shop directory", "all stores", "all shops", "our stores",
+            "our shops", "stores", "shops", "shopping", "retailers", "brands"),
+    DINING: ("food & drink", "food and drink", "eat & drink", "eat and drink", "dining",
+             "restaurants", "food", "cafes", "eat"),
+}
+
+# Pages that mention stores/food but are not directories
+NEGATIVE_TOKENS = ("news", "blog", "event", "job", "career", "offer", "deal", "parking",
+                   "contact", "hour", "gift", "competition", "privacy", "cookie", "terms",
+                   "login", "account", "search", "tag", "category", "press", "leasing", "opening")
+
+SKIP_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".xml", ".zip", ".doc", ".docx")
+
+EXACT_SCORE = 5.0
+KEYWORD_SCORE = 2.0
+PARENT_KEYWORD_SCORE = 0.5
+ANCHOR_EXACT_SCORE = 3.0
+ANCHOR_KEYWORD_SCORE = 1.0
+NEGATIVE_SCORE = -2.0
+DEPTH_PENALTY = 1.0  # per path segment beyond the second
+QUERY_PENALTY = 1.0
+LEARNED_SCORE = 2.5  # times log(1 + confirmations) of a segment: ~5 confirmations make it confident
+
+# Top store score needed to skip the LLM; an exact /stores-style segment plus
+# its keyword token clears it, a lone keyword token does not
+CONFIDENT_SCORE = 6.0
+MIN_SCORE = 2.0  # Below this a URL is not a candidate at all
+
+TOKEN_SPLIT = re.compile(r"[-_.+]+")
+
+
+def _tokens(segment: str) -> List[str]:
+    return [token for token in TOKEN_SPLIT.split(segment) if token]
+
+
+def _has_keyword(tokens: List[str], kind: str) -> int:
+    return sum(1 for keyword in KEYWORDS[kind] if any(token.startswith(keyword) for token in tokens))
+
+
+@dataclass
+class Classification:
+    store_url: Optional[str] = None
+    store_score: float = 0.0
+    dining_url: Optional[str] = None
+    dining_score: float = 0.0
+    alternatives: List[str] = field(default_factory=list)
+
+    @property
+    def confident(self) -> bool:
+        return self.store_score >= CONFIDENT_SCORE
+
+    @property
+    def confidence(self) -> str:
+        if self.store_score >= CONFIDENT_SCORE + EXACT_SCORE / 2:
+            return "high"
+        if self.confident:
+            return "medium"
+        return "low" if self.store_url else "none"
+
+
+class DirectoryClassifier:
+    """
+    Keyword + learned-weight scorer. Learned weights count, per kind, how often
+    a path segment was the last segment of a confirmed directory URL; they are
+    kept in a small JSON file shared across runs and processes. save() merges
+    this instance's new confirmations into the file under a lock, so
+    concurrent learners never overwrite each other's counts.
+    """
+
+    def __init__(self, weights_path: str = None):
+        self.weights_path = Path(weights_path or os.environ.get("DIRECTORY_WEIGHTS_PATH", DEFAULT_WEIGHTS_PATH))
+        self.weights: Dict[str, Dict[str, int]] = {STORE: {}, DINING: {}}
+        self._unsaved: Dict[str, Dict[str, int]] = {STORE: {}, DINING: {}}
+        self._merge(self._read())
+
+    def _read(self) -> Dict[str, Dict[str, int]]:
+        try:
+            with open(self.weights_path) as f:
+                loaded = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return loaded if isinstance(loaded, dict) else {}
+
+    def _merge(self, loaded: Dict[str, Dict[str, int]]):
+        for kind in self.weights:
+            self.weights[kind] = {**(loaded.get(kind) or {})}
+            for segment, count in self._unsaved[kind].items():
+                self.weights[kind][segment] = self.weights[kind].get(segment, 0) + count
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock on a sidecar file for the read-merge-write in save()"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.weights_path.with_name(self.weights_path.name + ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def score(self, url: str, kind: str, anchor_text: str = "") -> float:
+        parsed = urlparse(url)
+        path = parsed.path.lower().rstrip("/")
+        if path.endswith(SKIP_EXTENSIONS):
+            return 0.0
+        segments = [segment for segment in path.split("/") if segment]
+        if not segments:
+            return 0.0  # Homepage
+
+        last = segments[-1]
+        last_tokens = _tokens(last)
+        score = 0.0
+        if last in EXACT_SEGMENTS[kind]:
+            score += EXACT_SCORE
+        score += KEYWORD_SCORE * _has_keyword(last_tokens, kind)
+        parent_tokens = [token for segment in segments[:-1] for token in _tokens(segment)]
+        score += PARENT_KEYWORD_SCORE * _has_keyword(parent_tokens, kind)
+        score += NEGATIVE_SCORE * sum(
+            1 for negative in NEGATIVE_TOKENS if any(token.startswith(negative) for token in last_tokens)
+        )
+        score -= DEPTH_PENALTY * max(0, len(segments) - 2)
+        if parsed.query:
+            score -= QUERY_PENALTY
+
+        learned = self.weights[kind].get(last, 0)
+        if learned:
+            score += LEARNED_SCORE * math.log1p(learned)
+
+        text = " ".join(anchor_text.lower().split())
+        if text:
+            if text in ANCHOR_PHRASES[kind]:
+                score += ANCHOR_EXACT_SCORE
+            elif _has_keyword(_tokens(text.replace(" ", "-")), kind):
+                score += ANCHOR_KEYWORD_SCORE
+        return score
+
+    def rank(self, urls: List[str], kind: str,
+             anchors: Dict[str, str] = None) -> List[Tuple[float, str]]:
+        """Candidates scoring at least MIN_SCORE, best first (shorter URL wins ties)"""
+        anchors = anchors or {}
+        scored = [(self.score(url, kind, anchors.get(url, "")), url) for url in dict.fromkeys(urls)]
+        scored = [(score, url) for score, url in scored if score >= MIN_SCORE]
+        return sorted(scored, key=lambda item: (-item[0], len(item[1])))
+
+    def classify(self, urls: List[str], anchors: Dict[str, str] = None) -> Classification:
+        result = Classification()
+        stores = self.rank(urls, STORE, anchors)
+        dining = self.rank(urls, DINING, anchors)
+        if stores:
+            result.store_score, result.store_url = stores[0]
+        if dining:
+            result.dining_score, result.dining_url = dining[0]
+            if result.dining_url == result.store_url:
+                # A combined "shops & dining" page: keep it as the store directory
+                result.dining_url, result.dining_score = None, 0.0
+        result.alternatives = [url for _, url in (stores[1:4] + dining[1:4])]
+        return result
+
+    def learn(self, url: str, kind: str, save: bool = True):
+        """Record url as a confirmed directory of `kind` (STORE or DINING)"""
+        segments = [segment for segment in urlparse(url).path.lower().rstrip("/").split("/") if segment]
+        if not segments:
+            return
+        self.weights[kind][segments[-1]] = self.weights[kind].get(segments[-1], 0) + 1
+        self._unsaved[kind][segments[-1]] = self._unsaved[kind].get(segments[-1], 0) + 1
+        if save:
+            self.save()
+
+    def save(self):
+        """Add this instance's unsaved confirmations to the file's current counts, atomically"""
+        self.weights_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            self._merge(self._read())
+            fd, tmp = tempfile.mkstemp(prefix=self.weights_path.name + ".", suffix=".tmp",
+                                       dir=str(self.weights_path.parent))
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(self.weights, f, indent=2, sort_keys=True)
+                os.replace(tmp, self.weights_path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            self._unsaved = {STORE: {}, DINING: {}}
@@ -0,0 +1,448 @@
+"""
+Directory region detection and compact tenant lines for LLM prompts
+A rendered directory page is mostly chrome: navigation mega-menus, footers,
+cookie banners, newsletter forms. This finds the directory itself - the
+largest family of repeated, link-bearing sibling cards outside that chrome -
+and renders one short line per card, so a prompt carries the tenants and
+little else (typically several times fewer tokens than the page text).
+Where the cards are regular enough, extract_cards reads the tenants off them
+directly - name, category and link fields inferred from the structure the
+cards share - so most directories need no LLM call at all.
+
+Usage:
+    local = extract_cards(html, base_url=url)
+    if local.confident:
+        tenants = local.tenants   # [{"name", "category", "url"}, ...]
+    lines = compact_directory(html, base_url=url)
+    # ["Primark | Fashion | https://centre.example/stores/primark", ...], or [] if no region was found
+    chunks, compact = prompt_chunks(html, base_url=url)   # Falls back to split_directory
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from directory_chunks import (BLOCK_TAGS, DEFAULT_CHUNK_CHARS, HEADING_TAGS, Node, TenantMerge, link_href, parse_html,
+                              split_directory)
+
+MIN_CARDS = 5  # Fewer repeated cards than this is a carousel or a menu, not a directory
+MIN_SCORE = 2.5  # Five short linked cards, or 25 unlinked ones (see _score)
+MIN_FAMILY = 3  # Siblings sharing a tag and classes, per container
+MIN_REGION_SHARE = 0.25  # The region must hold this share of the page's non-chrome text
+REGION_SCORE_SHARE = 0.5  # Further card families scoring this close to the best are kept (a dining list beside the shops)
+CARD_TEXT_CHARS = 160  # Cards longer than this on average read as articles, not directory entries
+COMPACT_CHUNK_LINES = 80  # Tenants per prompt chunk, within the output token budget
+MAX_HINT_CHARS = 60
+
+CHROME_TAGS = {"nav", "header", "footer", "aside", "form", "dialog"}
+# class / id / role words marking page chrome ("site-header", "cookie-banner", "mega-menu")
+CHROME_WORDS = {"nav", "navbar", "navigation", "menu", "megamenu", "header", "footer", "cookie", "cookies",
+                "consent", "gdpr", "breadcrumb", "breadcrumbs", "modal", "popup", "newsletter", "social",
+                "share", "pagination", "skip", "banner"}
+NAME_WORDS = {"name", "title", "heading", "brand"}
+CATEGORY_WORDS = {"category", "categories", "cat", "type", "sector", "tag", "tags"}
+
+_WORD = re.compile(r"[a-z]+")
+
+
+def _words(node: Node) -> set:
+    text = " ".join((node.attrs.get("class", ""), node.attrs.get("id", ""), node.attrs.get("role", "")))
+    return set(_WORD.findall(text.lower()))
+
+
+def is_chrome(node: Node) -> bool:
+    """True for navigation, header/footer, cookie banners and similar page furniture"""
+    return node.tag in CHROME_TAGS or bool(_words(node) & CHROME_WORDS)
+
+
+def signature(node: Node) -> str:
+    """Tag plus its sorted classes, ignoring per-item classes with digits ("store-1234")"""
+    classes = sorted(c for c in node.attrs.get("class", "").split() if not any(ch.isdigit() for ch in c))
+    return ".".join([node.tag] + classes)
+
+
+def node_texts(node: Union[Node, str]) -> Iterator[str]:
+    """Whitespace-collapsed text runs of a subtree, with image alt text (logo grids) in place of the image"""
+    if isinstance(node, str):
+        text = " ".join(node.split())
+        if text:
+            yield text
+        return
+    if node.tag == "img":
+        alt = " ".join((node.attrs.get("alt") or "").split())
+        if alt:
+            yield alt
+        return
+    for child in node.children:
+        yield from node_texts(child)
+
+
+def _text_length(node: Union[Node, str]) -> int:
+    return sum(len(text) + 1 for text in node_texts(node))
+
+
+def first_link(node: Node, base_url: str) -> Optional[str]:
+    if node.tag == "a":
+        href = link_href(node, base_url)
+        if href:
+            return href
+    for child in node.children:
+        if isinstance(child, Node):
+            href = first_link(child, base_url)
+            if href:
+                return href
+    return None
+
+
+@dataclass
+class CardFamily:
+    """Repeated sibling cards sharing a signature, gathered across containers of the same kind"""
+    key: Tuple[str, str]  # (container signature, card signature)
+    cards: List[Node] = field(default_factory=list)
+    score: float = 0.0
+
+
+def _collect(node: Node, families: Dict[Tuple[str, str], CardFamily]):
+    if is_chrome(node):
+        return
+    groups: Dict[str, List[Node]] = {}
+    for child in node.children:
+        if isinstance(child, Node) and next(node_texts(child), None) is not None:
+            groups.setdefault(signature(child), []).append(child)
+    parent = signature(node)
+    for card_signature, cards in groups.items():
+        if len(cards) >= MIN_FAMILY:
+            key = (parent, card_signature)
+            families.setdefault(key, CardFamily(key)).cards.extend(cards)
+    for child in node.children:
+        if isinstance(child, Node):
+            _collect(child, families)
+
+
+def _score(family: CardFamily, base_url: str) -> float:
+    """
+    More cards, more of them linked, and short card text all score higher.
+    Links weigh heavily so a card's own unlinked parts (tag pills, unit
+    numbers), which outnumber the cards, don't outscore them.
+    """
+    cards = [card for card in family.cards if not is_chrome(card)]
+    if not cards:
+        return 0.0
+    linked = sum(1 for card in cards if first_link(card, base_url)) / len(cards)
+    average = sum(_text_length(card) for card in cards) / len(cards)
+    if average < 3:
+        return 0.0  # Pagination digits, bullets, icons
+    return len(cards) * (0.1 + 0.9 * linked) * min(1.0, CARD_TEXT_CHARS / average)
+
+
+def find_cards(root: Node, base_url: str = "", min_cards: int = MIN_CARDS) -> List[Node]:
+    """
+    The directory's cards in page order: the best-scoring card family plus
+    any scoring nearly as well, or [] when there is no convincing region.
+    """
+    families: Dict[Tuple[str, str], CardFamily] = {}
+    body = root.find("body") or root
+    _collect(body, families)
+    for family in families.values():
+        family.score = _score(family, base_url)
+    ranked = sorted((f for f in families.values() if f.score > 0), key=lambda f: f.score, reverse=True)
+    if not ranked or ranked[0].score < MIN_SCORE or len(ranked[0].cards) < min_cards:
+        return []
+    chosen = [f for f in ranked if f.score >= ranked[0].score * REGION_SCORE_SHARE and len(f.cards) >= min_cards]
+    # Keep the outermost family where one nests inside another (a card and its own list of tags)
+    members = {id(card) for f in chosen for card in f.cards}
+    cards: List[Node] = []
+
+    def walk(node: Node):
+        for child in node.children:
+            if isinstance(child, Node):
+                if id(child) in members:
+                    cards.append(child)
+                else:
+                    walk(child)
+
+    walk(body)
+    page_text = _text_length(body) - sum(_text_length(n) for n in _chrome_nodes(body))
+    if page_text and sum(_text_length(card) for card in cards) < page_text * MIN_REGION_SHARE:
+        return []
+    return cards
+
+
+def _chrome_nodes(node: Node) -> Iterator[Node]:
+    for child in node.children:
+        if isinstance(child, Node):
+            if is_chrome(child):
+                yield child
+            else:
+                yield from _chrome_nodes(child)
+
+
+def _find_words(node: Node, words: set) -> Optional[Node]:
+    for child in node.children:
+        if isinstance(child, Node):
+            if _words(child) & words:
+                return child
+            found = _find_words(child, words)
+            if found is not None:
+                return found
+    return None
+
+
+def _first_heading(node: Node) -> Optional[Node]:
+    for child in node.children:
+        if isinstance(child, Node):
+            if child.tag in HEADING_TAGS or child.tag == "strong":
+                return child
+            found = _first_heading(child)
+            if found is not None:
+                return found
+    return None
+
+
+def card_fields(card: Node, base_url: str = "") -> Dict[str, Optional[str]]:
+    """{"name", "category", "href"} of a card; the category is a hint (a labelled field or the card's other text)"""
+    texts = list(node_texts(card))
+    name_node = _first_heading(card) or _find_words(card, NAME_WORDS)
+    name = " ".join(node_texts(name_node)) if name_node is not None else ""
+    name = name or (texts[0] if texts else "")
+    category_node = _find_words(card, CATEGORY_WORDS)
+    if category_node is not None:
+        category = " ".join(node_texts(category_node))
+    else:
+        category = " / ".join(text for text in texts if text != name and text not in name)
+    if len(category) > MAX_HINT_CHARS:
+        category = category[:MAX_HINT_CHARS].rsplit(" ", 1)[0] + "…"
+    return {"name": name, "category": category or None, "href": first_link(card, base_url)}
+
+
+def compact_line(fields: Dict[str, Optional[str]]) -> str:
+    return " | ".join((fields["name"], fields.get("category") or "-", fields.get("href") or "-"))
+
+
+def compact_directory(html: str, base_url: str = "", min_cards: int = MIN_CARDS) -> List[str]:
+    """One "name | category hint | link" line per directory card, or [] when no directory region is found"""
+    lines: List[str] = []
+    seen = set()
+    for card in find_cards(parse_html(html), base_url, min_cards):
+        fields = card_fields(card, base_url)
+        if not fields["name"]:
+            continue
+        line = compact_line(fields)
+        if line not in seen:  # Carousels and sticky copies repeat cards
+            seen.add(line)
+            lines.append(line)
+    return lines
+
+
+def chunk_lines(lines: List[str], max_chars: int = DEFAULT_CHUNK_CHARS,
+                max_lines: int = COMPACT_CHUNK_LINES) -> List[str]:
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in lines:
+        if current and (size + len(line) + 1 > max_chars or len(current) >= max_lines):
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def prompt_chunks(html: str, base_url: str = "", max_chars: int = DEFAULT_CHUNK_CHARS) -> Tuple[List[str], bool]:
+    """
+    (chunks, compact): compact directory lines when a directory region is
+    found, otherwise the whole page split along its DOM (split_directory).
+    """
+    lines = compact_directory(html, base_url)
+    if lines:
+        return chunk_lines(lines, max_chars), True
+    return split_directory(html, base_url, max_chars), False
+
+
+# Schema-free extraction: the cards' own structure says which element holds
+# the name and which the category, so the common case needs no LLM call
+
+# Link and button labels that are never a tenant's name
+GENERIC_TEXT = re.compile(r"^(view|see|visit|find out|more|read more|learn more|shop now|details|info|"
+                          r"website|book|menu|offers?|directions|map|opening times)\b", re.I)
+# Unit numbers, floors, opening hours and phone numbers: card details, not names or categories
+DETAIL_TEXT = re.compile(r"\b(unit|units|level|floor|upper|lower|ground|open|opens|opening|closed|tel|phone)\b"
+                         r"|\d{1,2}[:.]\d{2}|\b\d{1,2}\s?(am|pm)\b|^[\d\s+()-]{6,}$", re.I)
+LOGO_SUFFIX = re.compile(r"\s+(logo|image|icon)$", re.I)
+# Bylines and dates: news, event and blog listings, not tenants
+DATE_TEXT = re.compile(r"\b(posted|published|updated|ago)\b"
+                       r"|\b\d{1,2}(st|nd|rd|th)?\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b"
+                       r"|\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}(st|nd|rd|th)?\b"
+                       r"|\b\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b", re.I)
+SENTENCE_TEXT = re.compile(r"[.!?…]$|:\s")
+# Lowercase words brand names do contain ("Bank of Scotland", "Pizza by Golden")
+NAME_CONNECTIVES = {"and", "of", "the", "by", "de", "la", "le", "du", "et", "y", "n", "on", "at"}
+NAME_MAX_WORDS = 6
+NAME_MAX_CHARS = 50
+NAME_MEAN_WORDS = 4  # Name columns averaging more words than this read as headlines
+FIELD_BREAK_TAGS = BLOCK_TAGS | HEADING_TAGS | {"a", "img", "button"}
+MIN_CONFIDENCE = float(os.environ.get("LOCAL_EXTRACTION_CONFIDENCE", "0.7"))
+
+
+@dataclass
+class CardExtraction:
+    tenants: List[Dict]
+    confidence: float = 0.0  # 0-1: how cleanly the cards' name field was identified
+    cards: int = 0
+
+    @property
+    def confident(self) -> bool:
+        return bool(self.tenants) and self.confidence >= MIN_CONFIDENCE
+
+
+def _is_field(node: Node) -> bool:
+    """An element whose whole text is one value: no block, link, image or classed element inside"""
+    for child in node.children:
+        if isinstance(child, Node):
+            if child.tag in FIELD_BREAK_TAGS or child.attrs.get("class") or not _is_field(child):
+                return False
+    return True
+
+
+def card_values(card: Node) -> List[Tuple[str, str]]:
+    """(path, text) for each field of a card; the path (signatures from the card down) aligns fields across cards"""
+    values: List[Tuple[str, str]] = []
+
+    def walk(node: Node, path: str):
+        seen: Dict[str, int] = {}
+        for child in node.children:
+            if isinstance(child, str):
+                text = " ".join(child.split())
+                if text:
+                    values.append((path, text))
+                continue
+            # Same-signature siblings (<p>name</p><p>category</p>) are told apart by position
+            child_signature = signature(child)
+            n = seen[child_signature] = seen.get(child_signature, 0) + 1
+            child_path = f"{path}/{child_signature}" + (f"[{n}]" if n > 1 else "")
+            if child.tag == "img":
+                alt = LOGO_SUFFIX.sub("", " ".join((child.attrs.get("alt") or "").split()))
+                if alt:
+                    values.append((child_path, alt))
+            elif _is_field(child):
+                text = " ".join(node_texts(child))
+                if text:
+                    values.append((child_path, text))
+            else:
+                walk(child, child_path)
+
+    if _is_field(card):
+        text = " ".join(node_texts(card))
+        return [("", text)] if text else []
+    walk(card, "")
+    return values
+
+
+def _column_kind(path: str) -> Tuple[str, set]:
+    """(tag, class words) of the element at the end of a field path"""
+    last = path.rsplit("/", 1)[-1].split("[")[0]
+    tag, _, classes = last.partition(".")
+    return tag, set(_WORD.findall(classes.lower()))
+
+
+def brand_like(text: str, cased: bool = True) -> bool:
+    """
+    A short name rather than a headline or byline: few words, no date or
+    "posted", no sentence punctuation and (when the page capitalises names)
+    at most one lowercase word past the first
+    """
+    words = text.split()
+    if not 2 <= len(text) <= NAME_MAX_CHARS or len(words) > NAME_MAX_WORDS:
+        return False
+    if GENERIC_TEXT.match(text) or DETAIL_TEXT.search(text) or DATE_TEXT.search(text) or SENTENCE_TEXT.search(text):
+        return False
+    if cased:
+        lowercase = sum(1 for w in words[1:] if w.isalpha() and w.islower() and w not in NAME_CONNECTIVES)
+        if lowercase >= 2:
+            return False
+    return True
+
+
+def _name_score(path: str, texts: List[str], total: int) -> float:
+    """
+    Coverage x distinctness x share of brand-like names, weighted towards
+    headings and name-classed fields; columns of long, sentence-like text
+    (headlines) score low
+    """
+    coverage = len(texts) / total
+    distinct = len(set(texts)) / len(texts)
+    cased = sum(1 for t in texts if t.islower()) < len(texts) * 0.8  # Some sites lowercase every name
+    plausible = sum(1 for t in texts if brand_like(t, cased)) / len(texts)
+    if sum(len(t.split()) for t in texts) / len(texts) > NAME_MEAN_WORDS:
+        plausible *= 0.5
+    tag, words = _column_kind(path)
+    if tag in HEADING_TAGS or tag == "strong" or words & NAME_WORDS:
+        weight = 1.0
+    elif any(segment.split("[")[0].partition(".")[0] == "a" for segment in path.split("/")):
+        weight = 0.9
+    else:
+        weight = 0.8  # Unlabelled text, or image alt text (often missing or generic)
+    return coverage * distinct * plausible * weight
+
+
+def _category_score(path: str, texts: List[str], total: int) -> float:
+    """Labelled category fields, or short values repeated across cards ("Fashion", "Food & Drink")"""
+    tag, words = _column_kind(path)
+    if tag == "img" or len(texts) / total < 0.3:
+        return 0.0
+    if any(DETAIL_TEXT.search(t) or GENERIC_TEXT.match(t) or len(t) > 40 for t in texts):
+        return 0.0
+    if words & CATEGORY_WORDS:
+        return len(texts) / total * 2
+    distinct = len(set(texts)) / len(texts)
+    return len(texts) / total if distinct <= 0.6 else 0.0
+
+
+def infer_fields(cards: List[Node]) -> Tuple[Optional[str], Optional[str], float]:
+    """(name path, category path, name score) for cards sharing one structure"""
+    columns: Dict[str, Dict[int, str]] = {}
+    for i, card in enumerate(cards):
+        for path, text in card_values(card):
+            columns.setdefault(path, {}).setdefault(i, text)  # First value per card
+    if not columns:
+        return None, None, 0.0
+    scored = sorted(((_name_score(path, list(values.values()), len(cards)), path) for path, values in columns.items()),
+                    reverse=True)
+    name_score, name_path = scored[0]
+    categories = [(_category_score(path, list(values.values()), len(cards)), path)
+                  for path, values in columns.items() if path != name_path]
+    category_score, category_path = max(categories, default=(0.0, None))
+    return name_path, category_path if category_score > 0 else None, name_score
+
+
+def extract_cards(html: str, base_url: str = "", min_cards: int = MIN_CARDS) -> CardExtraction:
+    """
+    Tenants ({"name", "category", "url"}) read straight from the directory's
+    repeated cards, with a confidence for the caller to decide whether an
+    LLM pass is still needed (CardExtraction.confident).
+    """
+    cards = find_cards(parse_html(html), base_url, min_cards)
+    if not cards:
+        return CardExtraction([])
+    families: Dict[str, List[Node]] = {}
+    for card in cards:
+        families.setdefault(signature(card), []).append(card)
+
+    merge = TenantMerge()
+    weighted = 0.0
+    for family in families.values():
+        name_path, category_path, score = infer_fields(family)
+        weighted += score * len(family)
+        for card in family:
+            values = dict(reversed(card_values(card)))  # First value per path wins
+            name = values.get(name_path) or card_fields(card, base_url)["name"]
+            if not name or GENERIC_TEXT.match(name):
+                continue
+            merge.add([{"name": name, "category": values.get(category_path),
+                        "url": first_link(card, base_url)}])
+    linked = sum(1 for card in cards if first_link(card, base_url)) / len(cards)
+    confidence = weighted / len(cards) * (0.6 + 0.4 * linked) * min(1.0, len(cards) / (2 * MIN_CARDS))
+    return CardExtraction(merge.tenants, round(confidence, 3), len(cards))
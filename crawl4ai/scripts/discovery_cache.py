@@ -0,0 +1,168 @@
+"""
+Persistent cache of tenant-discovery results keyed by domain
+Centre sites rarely move their store/dining directories, so a discovered
+result is kept (with its confidence, method and timestamp) and reused until
+it is older than the TTL. Before reuse, the cached directory URLs are
+revalidated with a cheap HEAD request; only domains whose cached URLs no
+longer answer 200 go through full discovery again.
+
+Usage:
+    cache = DiscoveryCache()
+    result = await cache.lookup("https://centre.example", head=fetcher.head)
+    if result is None:
+        result = ...full discovery...
+        cache.put(result)
+"""
+
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+DEFAULT_DISCOVERY_CACHE_PATH = ".discovery_cache.sqlite"
+DEFAULT_TTL = 30 * 86400  # seconds; after this a domain is rediscovered even if its URLs still resolve
+
+DIRECTORY_FIELDS = ("store_directory_url", "dining_directory_url")
+
+# HEAD url -> final status code, or None on a network error
+HeadCheck = Callable[[str], Awaitable[Optional[int]]]
+
+
+def domain_key(website: str) -> str:
+    """Cache key: lowercase host without a leading www., plus any non-default port"""
+    parsed = urlparse(website if "://" in website else f"https://{website}")
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+    return host
+
+
+@dataclass
+class CachedDiscovery:
+    domain: str
+    result: Dict
+    confidence: str
+    method: str
+    discovered_at: float
+    validated_at: float
+
+    @property
+    def directory_urls(self) -> List[str]:
+        return [self.result[field] for field in DIRECTORY_FIELDS if self.result.get(field)]
+
+
+class DiscoveryCache:
+    """
+    One SQLite row per domain holding the discovery result as JSON.
+    Only results that found a store directory are cached; failures are
+    always retried.
+    """
+
+    def __init__(self, path: str = None, ttl: float = DEFAULT_TTL, refresh: bool = False):
+        self.refresh = refresh  # Record new results but never serve cached ones
+        self.path = path or os.environ.get("DISCOVERY_CACHE_PATH", DEFAULT_DISCOVERY_CACHE_PATH)
+        self.ttl = ttl
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS discoveries (
+                domain TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                confidence TEXT,
+                method TEXT,
+                discovered_at REAL NOT NULL,
+                validated_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "invalid": 0, "stored": 0}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load(self, website: str) -> Optional[CachedDiscovery]:
+        row = self.conn.execute(
+            "SELECT domain, result, confidence, method, discovered_at, validated_at "
+            "FROM discoveries WHERE domain = ?",
+            (domain_key(website),),
+        ).fetchone()
+        if row is None:
+            return None
+        return CachedDiscovery(row[0], json.loads(row[1]), *row[2:])
+
+    def get(self, website: str, now: float = None) -> Optional[CachedDiscovery]:
+        """The cached entry for website's domain, or None if missing or past the TTL"""
+        now = time.time() if now is None else now
+        entry = self._load(website)
+        if entry is None or now - entry.discovered_at > self.ttl:
+            return None
+        return entry
+
+    def put(self, result: Dict, now: float = None) -> bool:
+        """Store a discovery result (result_to_dict shape); False if there was nothing worth caching"""
+        if not result.get("website") or not result.get("store_directory_url"):
+            return False
+        now = time.time() if now is None else now
+        self.conn.execute(
+            "INSERT OR REPLACE INTO discoveries "
+            "(domain, result, confidence, method, discovered_at, validated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (domain_key(result["website"]), json.dumps(result), result.get("confidence"),
+             result.get("method"), now, now),
+        )
+        self.conn.commit()
+        self.stats["stored"] += 1
+        return True
+
+    def invalidate(self, website: str):
+        self.conn.execute("DELETE FROM discoveries WHERE domain = ?", (domain_key(website),))
+        self.conn.commit()
+
+    async def validate(self, entry: CachedDiscovery, head: HeadCheck) -> bool:
+        """True when every cached directory URL still answers HEAD with 200"""
+        for url in entry.directory_urls:
+            if await head(url) != 200:
+                return False
+        return True
+
+    async def lookup(self, website: str, head: Optional[HeadCheck] = None,
+                     now: float = None) -> Optional[Dict]:
+        """
+        The cached result for website if it is within the TTL and (when a
+        `head` check is given) its directory URLs still resolve; otherwise
+        None, meaning the caller should run full discovery
+        """
+        now = time.time() if now is None else now
+        entry = None if self.refresh else self._load(website)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        if now - entry.discovered_at > self.ttl:
+            self.stats["expired"] += 1
+            return None
+        if head is not None:
+            if not await self.validate(entry, head):
+                self.stats["invalid"] += 1
+                self.invalidate(website)
+                return None
+            self.conn.execute("UPDATE discoveries SET validated_at = ? WHERE domain = ?", (now, entry.domain))
+            self.conn.commit()
+        self.stats["hits"] += 1
+        return entry.result
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"Discovery cache: {s['hits']} reused, {s['misses']} new, {s['expired']} expired, "
+                f"{s['invalid']} failed validation, {s['stored']} stored")
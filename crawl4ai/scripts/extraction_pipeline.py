@@ -2,10 +2,12 @@
 """
 Crawl4AI extraction pipeline - Three approaches:
 1. Generate schema with LLM (one-time) then use CSS extraction (most efficient)
+   - automatically, per domain and page template, via the schema registry
 2. Manual CSS/JSON schema extraction
 3. Direct LLM extraction (for complex/irregular content)
 
 Usage examples:
+  Automatic schema: python extraction_pipeline.py --auto <url> "<instruction>"
   Generate schema: python extraction_pipeline.py --generate-schema <url> "<instruction>"
   Use generated schema: python extraction_pipeline.py --use-schema <url> schema.json
   Manual CSS: python extraction_pipeline.py --css <url> "<css_selector>"
@@ -27,13 +29,19 @@ try:
 except ImportError:
     print(f"ℹ️  Crawl4AI {MIN_CRAWL4AI_VERSION}+ required")
 
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+from crawl4ai import CrawlerRunConfig, LLMConfig
 from crawl4ai.extraction_strategy import (
     LLMExtractionStrategy,
     JsonCssExtractionStrategy,
     CosineStrategy
 )
 
+from browser_pool import close_pool, lease_crawler
+from schema_registry import SchemaRegistry
+
+SCHEMA_PROVIDER = "openai/gpt-4o-mini"
+SCHEMA_SAMPLE_CHARS = 40000  # Cleaned HTML sent for schema generation; a few repeated items are enough
+
 # =============================================================================
 # APPROACH 1: Generate Schema (Most Efficient for Repetitive Patterns)
 # =============================================================================
@@ -45,8 +53,6 @@ async def generate_schema(url: str, instruction: str, output_file: str = "genera
     """
     print("🔍 Generating extraction schema using LLM...")
 
-    browser_config = BrowserConfig(headless=True)
-
     # Use LLM to analyze the page structure and generate schema
     extraction_strategy = LLMExtractionStrategy(
         provider="openai/gpt-4o-mini",  # Can use any LLM provider
@@ -76,7 +82,7 @@ async def generate_schema(url: str, instruction: str, output_file: str = "genera
         remove_overlay_elements=True
     )
 
-    async with AsyncWebCrawler(config=browser_config) as crawler:
+    async with lease_crawler() as crawler:
         result = await crawler.arun(url=url, config=crawler_config)
 
         if result.success and result.extracted_content:
@@ -144,7 +150,7 @@ async def use_generated_schema(url: str, schema_file: str):
         wait_for="css:body"
     )
 
-    async with AsyncWebCrawler() as crawler:
+    async with lease_crawler() as crawler:
         result = await crawler.arun(url=url, config=crawler_config)
 
         if result.success and result.extracted_content:
@@ -168,6 +174,71 @@ async def use_generated_schema(url: str, schema_file: str):
             print(f"❌ Extraction failed: {result.error_message if result else 'Unknown error'}")
             return None
 
+async def extract_with_registry(url: str, instruction: str, registry: SchemaRegistry = None):
+    """
+    Steps 1 + 2 automatically: reuse the schema learned for this domain and
+    page template (pure CSS, no LLM), or generate, validate and register
+    one on first contact. A schema whose item count drops sharply is
+    regenerated.
+    Best for: running the same extraction across many sites, repeatedly
+    """
+    own_registry = registry is None
+    registry = registry or SchemaRegistry()
+
+    crawler_config = CrawlerRunConfig(
+        wait_for="css:body",
+        remove_overlay_elements=True
+    )
+
+    try:
+        async with lease_crawler() as crawler:
+            result = await crawler.arun(url=url, config=crawler_config)
+
+        if not result.success or not result.html:
+            print(f"❌ Crawl failed: {result.error_message if result else 'Unknown error'}")
+            return None
+
+        async def apply(schema: dict) -> list:
+            try:
+                strategy = JsonCssExtractionStrategy(schema=schema)
+                return await asyncio.to_thread(strategy.run, url, [result.html])
+            except Exception as e:
+                print(f"⚠️ Schema failed to apply: {e}")
+                return []
+
+        async def generate() -> dict:
+            print("🔍 Generating extraction schema using LLM...")
+            sample = (result.cleaned_html or result.html)[:SCHEMA_SAMPLE_CHARS]
+            try:
+                return await asyncio.to_thread(
+                    JsonCssExtractionStrategy.generate_schema,
+                    html=sample,
+                    query=instruction,
+                    llm_config=LLMConfig(provider=SCHEMA_PROVIDER),
+                )
+            except Exception as e:
+                print(f"❌ Failed to generate schema: {e}")
+                return None
+
+        items, method = await registry.extract(url, result.html, instruction, apply, generate)
+        labels = {
+            "css": "registered schema (no LLM calls)",
+            "generated": "newly generated schema",
+            "regenerated": "regenerated schema (item count dropped)",
+            "failed": "no valid schema",
+        }
+        print(f"{'❌' if method == 'failed' else '✅'} Extracted {len(items)} items using {labels[method]}")
+        print(f"📚 {registry.summary()}")
+
+        with open("registry_extracted.json", "w") as f:
+            json.dump(items, f, indent=2)
+        print("💾 Saved to registry_extracted.json")
+
+        return items
+    finally:
+        if own_registry:
+            registry.close()
+
 # =============================================================================
 # APPROACH 2: Manual Schema Definition
 # =============================================================================
@@ -201,7 +272,7 @@ async def extract_with_manual_schema(url: str, schema: dict = None):
         extraction_strategy=extraction_strategy
     )
 
-    async with AsyncWebCrawler() as crawler:
+    async with lease_crawler() as crawler:
         result = await crawler.arun(url=url, config=crawler_config)
 
         if result.success and result.extracted_content:
@@ -235,8 +306,6 @@ async def extract_with_llm(url: str, instruction: str):
     """
     print("🤖 Using direct LLM extraction...")
 
-    browser_config = BrowserConfig(headless=True)
-
     extraction_strategy = LLMExtractionStrategy(
         provider="openai/gpt-4o-mini",  # Can change to ollama/llama3, anthropic/claude, etc.
         instruction=instruction,
@@ -258,7 +327,7 @@ async def extract_with_llm(url: str, instruction: str):
         remove_overlay_elements=True
     )
 
-    async with AsyncWebCrawler(config=browser_config) as crawler:
+    async with lease_crawler() as crawler:
         result = await crawler.arun(url=url, config=crawler_config)
 
         if result.success and result.extracted_content:
@@ -302,6 +371,9 @@ Crawl4AI Extraction Pipeline - Three Approaches
     Step 2: Use schema for fast extraction (no LLM)
     python extraction_pipeline.py --use-schema <url> generated_schema.json
 
+    Or both automatically (schema learned per domain + page template, regenerated if it breaks):
+    python extraction_pipeline.py --auto <url> "<what to extract>"
+
 2️⃣  MANUAL SCHEMA (When You Know the Structure):
     python extraction_pipeline.py --manual <url>
     (Edit the schema in the script for your needs)
@@ -325,6 +397,12 @@ Examples:
     mode = sys.argv[1]
     url = sys.argv[2]
 
+    try:
+        await run_mode(mode, url)
+    finally:
+        await close_pool()
+
+async def run_mode(mode: str, url: str):
     if mode == "--generate-schema":
         if len(sys.argv) < 4:
             print("Error: Missing extraction instruction")
@@ -342,6 +420,13 @@ Examples:
         schema_file = sys.argv[3]
         await use_generated_schema(url, schema_file)
 
+    elif mode == "--auto":
+        if len(sys.argv) < 4:
+            print("Error: Missing extraction instruction")
+            print("Usage: python extraction_pipeline.py --auto <url> \"<instruction>\"")
+            sys.exit(1)
+        await extract_with_registry(url, sys.argv[3])
+
     elif mode == "--manual":
         await extract_with_manual_schema(url)
 
@@ -355,7 +440,7 @@ Examples:
 
     else:
         print(f"Unknown mode: {mode}")
-        print("Use --generate-schema, --use-schema, --manual, or --llm")
+        print("Use --auto, --generate-schema, --use-schema, --manual, or --llm")
         sys.exit(1)
 
 if __name__ == "__main__":
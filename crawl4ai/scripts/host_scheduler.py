@@ -0,0 +1,198 @@
+"""
+Per-host politeness scheduler for batch crawling
+Caps concurrency per origin, spaces out requests to the same host, interleaves
+hosts round-robin and honours robots.txt Crawl-delay and Retry-After.
+"""
+
+import asyncio
+import time
+import urllib.robotparser
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+def host_of(url: str) -> str:
+    """Scheduling key for a URL (scheme + host + port)"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+async def fetch_crawl_delay(host: str, user_agent: str = "*", timeout: float = 10.0) -> Optional[float]:
+    """Read Crawl-delay for user_agent from the host's robots.txt (None if unset/unreachable)"""
+    parser = urllib.robotparser.RobotFileParser(f"{host}/robots.txt")
+    try:
+        await asyncio.wait_for(asyncio.to_thread(parser.read), timeout)
+    except Exception:
+        return None
+    delay = parser.crawl_delay(user_agent)
+    return float(delay) if delay is not None else None
+
+
+class _HostState:
+    def __init__(self):
+        self.queue: Deque[str] = deque()
+        self.active = 0
+        self.next_allowed = 0.0
+        self.crawl_delay: Optional[float] = None
+        self.robots_state = "unknown"  # unknown -> loading -> loaded
+
+
+class HostScheduler:
+    """
+    Dispatch URLs to an async fetch function under global and per-host limits.
+
+    - max_concurrent: total in-flight requests
+    - per_host: in-flight requests per host
+    - min_delay: minimum seconds between request starts on the same host
+      (raised to the robots.txt Crawl-delay when that is larger)
+    Hosts are served round-robin so one large site cannot take every slot.
+    """
+
+    def __init__(self, max_concurrent: int = 5, per_host: int = 2, min_delay: float = 1.0,
+                 respect_robots: bool = True, user_agent: str = "*",
+                 robots_fetcher: Callable[[str, str], Awaitable[Optional[float]]] = fetch_crawl_delay):
+        self.max_concurrent = max_concurrent
+        self.per_host = per_host
+        self.min_delay = min_delay
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self.robots_fetcher = robots_fetcher
+        self.hosts: Dict[str, _HostState] = {}
+        self.rotation: Deque[str] = deque()
+        self.active = 0
+        self._wakeup = asyncio.Event()
+        self._robots_tasks = set()
+
+    def add(self, urls: Iterable[str]):
+        """Queue URLs (may be called while run() is in progress, e.g. to requeue)"""
+        for url in urls:
+            host = host_of(url)
+            state = self.hosts.get(host)
+            if state is None:
+                state = self.hosts[host] = _HostState()
+                if not self.respect_robots:
+                    state.robots_state = "loaded"
+            if not state.queue:
+                self.rotation.append(host)
+            state.queue.append(url)
+        self._wakeup.set()
+
+    def delay_host(self, url: str, seconds: float):
+        """Hold back further requests to url's host (e.g. on Retry-After)"""
+        state = self.hosts.get(host_of(url))
+        if state is not None:
+            state.next_allowed = max(state.next_allowed, time.monotonic() + seconds)
+
+    def drain_host(self, url: str) -> List[str]:
+        """Remove and return every URL still queued for url's host"""
+        host = host_of(url)
+        state = self.hosts.get(host)
+        if state is None or not state.queue:
+            return []
+        drained = list(state.queue)
+        state.queue.clear()
+        self.rotation.remove(host)
+        return drained
+
+    def _host_delay(self, state: _HostState) -> float:
+        return max(self.min_delay, state.crawl_delay or 0.0)
+
+    async def _load_robots(self, host: str, state: _HostState):
+        try:
+            state.crawl_delay = await self.robots_fetcher(host, self.user_agent)
+        finally:
+            state.robots_state = "loaded"
+            self._wakeup.set()
+
+    def _next_ready(self) -> Optional[str]:
+        """Pop the next URL from the first ready host in rotation order"""
+        now = time.monotonic()
+        for _ in range(len(self.rotation)):
+            host = self.rotation[0]
+            self.rotation.rotate(-1)
+            state = self.hosts[host]
+            if state.robots_state == "unknown":
+                state.robots_state = "loading"
+                task = asyncio.create_task(self._load_robots(host, state))
+                self._robots_tasks.add(task)
+                task.add_done_callback(self._robots_tasks.discard)
+                continue
+            if state.robots_state == "loading":
+                continue
+            if state.active >= self.per_host or now < state.next_allowed:
+                continue
+
+            url = state.queue.popleft()
+            if not state.queue:
+                self.rotation.remove(host)
+            state.active += 1
+            state.next_allowed = now + self._host_delay(state)
+            return url
+        return None
+
+    def _earliest_wait(self) -> Optional[float]:
+        now = time.monotonic()
+        waits = [
+            self.hosts[host].next_allowed - now
+            for host in self.rotation
+            if self.hosts[host].robots_state == "loaded" and self.hosts[host].active < self.per_host
+        ]
+        return max(0.0, min(waits)) if waits else None
+
+    async def run(self, fetch: Callable[[str], Awaitable[None]]) -> List[Tuple[str, BaseException]]:
+        """
+        Call `await fetch(url)` for every queued URL until all are done.
+        Returns (url, exception) for each fetch that raised, so the caller
+        can record those URLs instead of losing them.
+        """
+        tasks: Dict[asyncio.Task, str] = {}
+        errors: List[Tuple[str, BaseException]] = []
+
+        def _finished(task: asyncio.Task):
+            url = tasks.pop(task)
+            if not task.cancelled() and task.exception() is not None:
+                errors.append((url, task.exception()))
+
+        async def _run_one(url: str):
+            try:
+                await fetch(url)
+            finally:
+                self.hosts[host_of(url)].active -= 1
+                self.active -= 1
+                self._wakeup.set()
+
+        while self.rotation or self.active:
+            self._wakeup.clear()
+            while self.active < self.max_concurrent:
+                url = self._next_ready()
+                if url is None:
+                    break
+                self.active += 1
+                task = asyncio.create_task(_run_one(url))
+                tasks[task] = url
+                task.add_done_callback(_finished)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._earliest_wait())
+            except asyncio.TimeoutError:
+                pass
+
+        # The last tasks may still be finishing after releasing their slot
+        await asyncio.gather(*list(tasks), return_exceptions=True)
+        return errors
@@ -0,0 +1,286 @@
+"""
+HTTP-first fetch tier for crawling
+Fetches pages with a plain pooled HTTP client and checks whether the
+server-rendered HTML already holds the content; only pages that fail the
+check need a full browser render.
+"""
+
+import re
+from dataclasses import dataclass, field
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+try:
+    import aiohttp  # Installed with crawl4ai
+except ImportError:
+    aiohttp = None
+
+DEFAULT_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-GB,en;q=0.9",
+}
+
+# Links that look like tenant/store entries on a centre directory page
+STORE_LINK_PATTERN = re.compile(
+    r"/(stores?|shops?|retailers?|brands?|dining|restaurants?|food|eat|directory|tenants?)/[^/?#]+",
+    re.IGNORECASE,
+)
+
+# Directory pages (/stores, /shop-directory, /dining) whose static HTML must also
+# carry their store links: a theme page with the list injected by JS has plenty
+# of text but none of the entries
+DIRECTORY_URL_PATTERN = re.compile(
+    r"/(stores?|shops?|retailers?|brands?|dining|restaurants?|food|eat|directory|tenants?|"
+    r"[\w-]*-directory)/?$",
+    re.IGNORECASE,
+)
+DIRECTORY_MIN_STORE_LINKS = 5
+
+# Markers of a client-rendered app shell whose content only exists after JS runs
+APP_SHELL_PATTERN = re.compile(
+    r'<div[^>]+id=["\'](root|app|__next|__nuxt)["\'][^>]*>\s*</div>'
+    r'|enable javascript|requires javascript|javascript is (disabled|required)',
+    re.IGNORECASE,
+)
+
+BASE_TAG_PATTERN = re.compile(r"<base\s[^>]*href", re.IGNORECASE)
+HEAD_TAG_PATTERN = re.compile(r"<head(\s[^>]*)?>", re.IGNORECASE)
+HTML_TAG_PATTERN = re.compile(r"<html(\s[^>]*)?>", re.IGNORECASE)
+
+
+class PageStatsParser(HTMLParser):
+    """Collects visible text length, anchors, title and description from HTML"""
+
+    SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text_length = 0
+        self.links: List[Tuple[str, str]] = []
+        self.title = ""
+        self.description = ""
+        self._skip_depth = 0
+        self._in_title = False
+        self._anchor_href: Optional[str] = None
+        self._anchor_text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "title":
+            self._in_title = True
+        elif tag == "meta" and (attrs.get("name") or "").lower() == "description":
+            self.description = attrs.get("content") or ""
+        elif tag == "a" and attrs.get("href"):
+            self._anchor_href = attrs["href"]
+            self._anchor_text = []
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "a" and self._anchor_href is not None:
+            self.links.append((self._anchor_href, " ".join(self._anchor_text).strip()))
+            self._anchor_href = None
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data.strip()
+            return
+        if self._skip_depth:
+            return
+        text = data.strip()
+        if text:
+            self.text_length += len(text)
+            if self._anchor_href is not None:
+                self._anchor_text.append(text)
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: Optional[int] = None
+    html: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    text_length: int = 0
+    links_count: int = 0
+    store_links_count: int = 0
+    title: str = ""
+    description: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code is not None and 200 <= self.status_code < 300
+
+
+def analyse_html(result: FetchResult):
+    """Fill in the text/link statistics used to decide whether to escalate"""
+    parser = PageStatsParser()
+    try:
+        parser.feed(result.html)
+        parser.close()
+    except Exception:
+        pass
+    result.text_length = parser.text_length
+    result.links_count = len(parser.links)
+    result.store_links_count = sum(1 for href, _ in parser.links if STORE_LINK_PATTERN.search(href))
+    result.title = parser.title
+    result.description = parser.description
+
+
+def with_base_href(html: str, url: str) -> str:
+    """
+    HTML fetched from url, ready to render as raw:// HTML: a <base href> for
+    url is added so relative links and images resolve against the page
+    rather than the raw:// pseudo-URL. A page's own <base> is kept.
+    """
+    if BASE_TAG_PATTERN.search(html):
+        return html
+    tag = f'<base href="{escape(url, quote=True)}">'
+    head = HEAD_TAG_PATTERN.search(html)
+    if head:
+        return html[:head.end()] + tag + html[head.end():]
+    root = HTML_TAG_PATTERN.search(html)
+    if root:
+        return html[:root.end()] + f"<head>{tag}</head>" + html[root.end():]
+    return f"<head>{tag}</head>{html}"
+
+
+def _site(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def rebase_links(links: Dict[str, List[Dict]], url: str) -> Dict[str, List[Dict]]:
+    """
+    Re-split a raw:// render's links into internal and external relative to
+    url (crawl4ai classifies them against the raw:// pseudo-URL), resolving
+    any still-relative hrefs against url
+    """
+    site = _site(url)
+    rebased: Dict[str, List[Dict]] = {"internal": [], "external": []}
+    seen = set()
+    for link in (links or {}).get("internal", []) + (links or {}).get("external", []):
+        href = urljoin(url, link.get("href") or "")
+        if href in seen:
+            continue
+        seen.add(href)
+        host = _site(href)
+        internal = host == site or host.endswith("." + site)
+        rebased["internal" if internal else "external"].append({**link, "href": href})
+    return rebased
+
+
+def default_min_store_links(url: str) -> int:
+    """Store-like links a static fetch of url needs: DIRECTORY_MIN_STORE_LINKS for directory pages, else 0"""
+    return DIRECTORY_MIN_STORE_LINKS if DIRECTORY_URL_PATTERN.search(urlparse(url).path) else 0
+
+
+def is_content_complete(result: FetchResult, min_text_chars: int = 500,
+                        min_store_links: int = 0) -> bool:
+    """
+    True when the static HTML already carries the page content:
+    enough visible text, not an empty JS app shell, and (for directory pages)
+    at least min_store_links store-like links
+    """
+    if not result.ok:
+        return False
+    if result.text_length < min_text_chars:
+        return False
+    if APP_SHELL_PATTERN.search(result.html) and result.text_length < min_text_chars * 4:
+        return False
+    return result.store_links_count >= min_store_links
+
+
+class HttpFetcher:
+    """
+    Pooled async HTTP client shared by all fetches in a run.
+    Use as an async context manager; `available` is False without aiohttp.
+    """
+
+    def __init__(self, max_connections: int = 20, timeout: float = 15.0,
+                 max_bytes: int = 5_000_000, headers: Dict[str, str] = None):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.session = None
+        self.stats = {"http_complete": 0, "escalated": 0, "not_modified": 0}
+
+    @property
+    def available(self) -> bool:
+        return aiohttp is not None
+
+    async def __aenter__(self):
+        if self.available:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def fetch(self, url: str, headers: Dict[str, str] = None) -> FetchResult:
+        """GET url; pass If-None-Match/If-Modified-Since in headers to revalidate"""
+        if self.session is None:
+            return FetchResult(url=url, error="HTTP tier unavailable")
+        try:
+            async with self.session.get(url, allow_redirects=True, headers=headers) as response:
+                result = FetchResult(
+                    url=str(response.url),
+                    status_code=response.status,
+                    headers={k.lower(): v for k, v in response.headers.items()},
+                )
+                if response.status == 304:
+                    return result
+                content_type = result.headers.get("content-type", "")
+                if "html" not in content_type:
+                    result.error = f"Non-HTML content: {content_type or 'unknown'}"
+                    return result
+                body = await response.content.read(self.max_bytes)
+                result.html = body.decode(response.charset or "utf-8", errors="replace")
+        except Exception as e:
+            return FetchResult(url=url, error=f"{type(e).__name__}: {e}")
+
+        analyse_html(result)
+        return result
+
+    async def head(self, url: str) -> Optional[int]:
+        """Final status code of a HEAD request (following redirects), or None on error"""
+        if self.session is None:
+            return None
+        try:
+            async with self.session.head(url, allow_redirects=True) as response:
+                return response.status
+        except Exception:
+            return None
+
+    async def fetch_static(self, url: str, min_text_chars: int = 500,
+                           min_store_links: Optional[int] = None,
+                           headers: Dict[str, str] = None) -> Tuple[FetchResult, bool]:
+        """
+        Fetch url over HTTP; returns (result, True) when no browser is needed.
+        min_store_links=None applies default_min_store_links(url).
+        """
+        if min_store_links is None:
+            min_store_links = default_min_store_links(url)
+        result = await self.fetch(url, headers=headers)
+        if result.status_code == 304:
+            self.stats["not_modified"] += 1
+            return result, False
+        complete = is_content_complete(result, min_text_chars, min_store_links)
+        self.stats["http_complete" if complete else "escalated"] += 1
+        return result, complete
@@ -0,0 +1,321 @@
+"""
+Event-driven loader for lazy, infinite-scroll and paginated directory pages
+Instead of fixed sleeps, waits until the page is quiet: no DOM mutations
+(counted by an injected MutationObserver) and no XHR/fetch/document requests
+in flight for a short window. Between quiet points it scrolls, clicks
+recognised "Load more" controls and follows "Next" pagination, and stops as
+soon as the count of repeated tenant cards stops growing. "Next" controls
+inside carousels and sliders are ignored, and a clicked "Next" only counts
+as a new page when it changes the set of cards.
+
+Works on a Playwright page (a crawl4ai hook's page or playwright directly):
+    result = await load_directory(page, url)
+    html = result.html   # every loaded card, all pages combined
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+QUIET_MS = 400  # No mutations or requests for this long = settled
+SETTLE_TIMEOUT_MS = 8000  # Give up waiting for quiet (chatty pages) after this
+LONG_REQUEST_MS = 5000  # Requests open longer than this (long-polls, beacons) don't block quiet
+POLL_S = 0.05
+MAX_ROUNDS = 60
+MAX_PAGES = 25
+DEADLINE_S = 90.0
+
+# Requests that never add directory content
+IGNORED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet", "ping", "manifest", "other"}
+
+INIT_SCRIPT = """
+(() => {
+  if (window.__pageLoader) return;
+  const stats = window.__pageLoader = { mutations: 0, last: performance.now() };
+  new MutationObserver((records) => {
+    for (const record of records) stats.mutations += record.addedNodes.length;
+    stats.last = performance.now();
+  }).observe(document, { childList: true, subtree: true });
+})();
+"""
+
+MUTATION_AGE_JS = "() => window.__pageLoader ? performance.now() - window.__pageLoader.last : 1e9"
+
+# Size of the largest family of repeated sibling elements (same tag + classes,
+# in groups of 3+), summed across containers so A-Z sections count together
+CARD_COUNT_JS = """
+() => {
+  const totals = new Map();
+  for (const parent of document.body ? document.body.querySelectorAll("*") : []) {
+    if (parent.children.length < 3) continue;
+    const counts = new Map();
+    for (const el of parent.children) {
+      if (!el.textContent.trim()) continue;
+      const classes = typeof el.className === "string" ? el.className.trim().split(/\\s+/).sort().join(".") : "";
+      const key = el.tagName + "." + classes;
+      counts.set(key, (counts.get(key) || 0) + 1);
+    }
+    for (const [key, n] of counts) if (n >= 3) totals.set(key, (totals.get(key) || 0) + n);
+  }
+  let best = 0;
+  for (const n of totals.values()) best = Math.max(best, n);
+  return best;
+}
+"""
+
+# First and last card text of the largest repeated family, plus its size:
+# a clicked "Next" that leaves these unchanged didn't page the directory
+CARD_EDGES_JS = """
+() => {
+  const families = new Map();
+  for (const parent of document.body ? document.body.querySelectorAll("*") : []) {
+    if (parent.children.length < 3) continue;
+    const groups = new Map();
+    for (const el of parent.children) {
+      if (!el.textContent.trim()) continue;
+      const classes = typeof el.className === "string" ? el.className.trim().split(/\\s+/).sort().join(".") : "";
+      const key = el.tagName + "." + classes;
+      if (!groups.has(key)) groups.set(key, []);
+      groups.get(key).push(el);
+    }
+    for (const [key, els] of groups) {
+      if (els.length >= 3) families.set(key, (families.get(key) || []).concat(els));
+    }
+  }
+  let best = [];
+  for (const els of families.values()) if (els.length > best.length) best = els;
+  const text = (el) => el ? el.textContent.trim().replace(/\\s+/g, " ").slice(0, 200) : "";
+  return [best.length, text(best[0]), text(best[best.length - 1])];
+}
+"""
+
+# Marks the first visible, enabled control of a kind with data-page-loader
+# and returns {href} (href only for real "next" links, which are followed
+# with goto; "more" controls are always clicked), or null. Controls inside
+# carousels/sliders are skipped; "next" controls in pagination containers
+# are tried before any others.
+FIND_CONTROL_JS = """
+(kind) => {
+  const patterns = {
+    more: /^\\s*((load|show|view|see)\\s+more|(show|view|see)\\s+all\\s+(stores|shops|brands|retailers|tenants|restaurants)|more\\s+(stores|shops|results|brands|tenants|restaurants))\\b/i,
+    next: /^\\s*(next(\\s+page)?|[›»>→])\\s*[›»>→]?\\s*$/i,
+  };
+  const CAROUSEL = '[class*="carousel"], [class*="slider"], [class*="swiper"], [class*="slick"], [class*="splide"], '
+    + '[class*="glide"], [class*="owl-"], [class*="flickity"], [aria-roledescription="carousel"], [aria-roledescription="slide"]';
+  const PAGINATION = '[class*="pagination"], [class*="pager"], [class*="paging"], nav[aria-label*="pag" i], [role="navigation"][aria-label*="pag" i]';
+  const visible = (el) => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== "hidden";
+  const enabled = (el) => !el.disabled && el.getAttribute("aria-disabled") !== "true" && !/\\bdisabled\\b/.test(el.className);
+  const candidates = [];
+  if (kind === "next") {
+    candidates.push(...document.querySelectorAll('a[rel~="next"], link[rel~="next"]'));
+    const controls = [...document.querySelectorAll('button, a, [role="button"], input[type="button"], input[type="submit"]')];
+    candidates.push(...controls.filter((el) => el.closest(PAGINATION)), ...controls.filter((el) => !el.closest(PAGINATION)));
+  } else {
+    candidates.push(...document.querySelectorAll('button, a, [role="button"], input[type="button"], input[type="submit"]'));
+  }
+  for (const el of candidates) {
+    const carousel = el.tagName === "LINK" ? null : el.closest(CAROUSEL);
+    if (carousel && carousel !== document.body && carousel !== document.documentElement) continue;
+    const label = (el.innerText || el.value || "").trim();
+    const aria = el.getAttribute("aria-label") || "";
+    const isRelNext = kind === "next" && /\\bnext\\b/.test(el.getAttribute("rel") || "");
+    if (!isRelNext && !patterns[kind].test(label) && !(kind === "next" && /^next\\b/i.test(aria))) continue;
+    if (/\\b(slide|image|photo|banner|testimonial)s?\\b/i.test(aria)) continue;
+    if (el.tagName === "LINK") return { href: el.href };
+    if (!visible(el) || !enabled(el)) continue;
+    document.querySelectorAll("[data-page-loader]").forEach((other) => other.removeAttribute("data-page-loader"));
+    el.setAttribute("data-page-loader", kind);
+    const href = kind === "next" && el.tagName === "A" && el.href && !/^(javascript:|#)/.test(el.getAttribute("href") || "#") ? el.href : null;
+    return { href };
+  }
+  return null;
+}
+"""
+
+
+@dataclass
+class LoadResult:
+    html: str
+    url: str
+    cards: int = 0
+    scrolls: int = 0
+    clicks: int = 0
+    pages: int = 1
+    elapsed_ms: float = 0.0
+    stop_reason: str = ""
+
+
+class NetworkTracker:
+    """Counts XHR/fetch/document/script requests in flight on a page"""
+
+    def __init__(self, page):
+        self.inflight: Dict[object, float] = {}
+        self.last_activity = time.monotonic()
+        page.on("request", self._started)
+        page.on("requestfinished", self._ended)
+        page.on("requestfailed", self._ended)
+
+    def _started(self, request):
+        if request.resource_type in IGNORED_RESOURCE_TYPES:
+            return
+        self.inflight[request] = self.last_activity = time.monotonic()
+
+    def _ended(self, request):
+        if self.inflight.pop(request, None) is not None:
+            self.last_activity = time.monotonic()
+
+    def busy(self) -> bool:
+        now = time.monotonic()
+        return any((now - started) * 1000 < LONG_REQUEST_MS for started in self.inflight.values())
+
+    def idle_ms(self) -> float:
+        return (time.monotonic() - self.last_activity) * 1000
+
+
+async def wait_for_quiet(page, network: NetworkTracker, quiet_ms: int = None,
+                         timeout_ms: int = SETTLE_TIMEOUT_MS) -> bool:
+    """Wait until neither the DOM nor the network has changed for quiet_ms (QUIET_MS); False on timeout"""
+    quiet_ms = QUIET_MS if quiet_ms is None else quiet_ms
+    deadline = time.monotonic() + timeout_ms / 1000
+    while time.monotonic() < deadline:
+        try:
+            mutation_age = await page.evaluate(MUTATION_AGE_JS)
+        except Exception:
+            mutation_age = 0  # Mid-navigation: not settled yet
+        if not network.busy() and network.idle_ms() >= quiet_ms and mutation_age >= quiet_ms:
+            return True
+        await asyncio.sleep(POLL_S)
+    return False
+
+
+async def _count_cards(page) -> int:
+    try:
+        return await page.evaluate(CARD_COUNT_JS)
+    except Exception:
+        return 0
+
+
+async def _click(page, network: NetworkTracker, kind: str) -> Optional[str]:
+    """Click (or follow) the page's `kind` control; returns "clicked", "navigated" or None"""
+    try:
+        control = await page.evaluate(FIND_CONTROL_JS, kind)
+    except Exception:
+        return None
+    if control is None:
+        return None
+    try:
+        if control.get("href"):
+            await page.goto(control["href"], wait_until="domcontentloaded", timeout=30000)
+            await wait_for_quiet(page, network)
+            return "navigated"
+        await page.click(f'[data-page-loader="{kind}"]', timeout=5000)
+    except Exception:
+        return None
+    await wait_for_quiet(page, network)
+    return "clicked"
+
+
+async def _card_edges(page) -> list:
+    try:
+        return await page.evaluate(CARD_EDGES_JS)
+    except Exception:
+        return []
+
+
+async def _body_html(page) -> str:
+    try:
+        return await page.evaluate("() => document.body ? document.body.innerHTML : ''")
+    except Exception:
+        return ""
+
+
+async def load_directory(page, url: str, max_rounds: int = MAX_ROUNDS, max_pages: int = MAX_PAGES,
+                         deadline_s: float = DEADLINE_S) -> LoadResult:
+    """
+    Navigate to url and load the whole directory: scroll while cards keep
+    appearing, then click "Load more", then follow "Next" pages (collecting
+    each page), until nothing adds cards.
+    """
+    started = time.monotonic()
+    await page.add_init_script(INIT_SCRIPT)
+    network = NetworkTracker(page)
+    await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+    await wait_for_quiet(page, network)
+
+    result = LoadResult(html="", url=page.url)
+    pages: List[str] = []
+    page_cards: List[int] = []
+    seen_pages = {page.url}
+    kept = set()  # Page bodies collected so far
+    cards = await _count_cards(page)
+    try_more = True  # Until a "more" control fails to add cards on this page
+
+    for _ in range(max_rounds):
+        if time.monotonic() - started > deadline_s:
+            result.stop_reason = "deadline"
+            break
+
+        # 1. Scroll: infinite scroll and lazy sections load on reaching the bottom
+        await page.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
+        result.scrolls += 1
+        await wait_for_quiet(page, network)
+        count = await _count_cards(page)
+        if count > cards:
+            cards = count
+            continue
+
+        # 2. "Load more" buttons append to the same list
+        if try_more and await _click(page, network, "more"):
+            result.clicks += 1
+            count = await _count_cards(page)
+            if count > cards:
+                cards = count
+                continue
+            try_more = False  # Not a directory control (e.g. expands some text)
+
+        # 3. Pagination replaces the list: keep this page, move to the next
+        if len(pages) + 1 >= max_pages:
+            result.stop_reason = "max_pages"
+            break
+        current = await _body_html(page)
+        edges = await _card_edges(page)
+        action = await _click(page, network, "next")
+        if action is None:
+            result.stop_reason = "complete"
+            break
+        body = await _body_html(page)
+        if (action == "navigated" and page.url in seen_pages) or body == current or body in kept:
+            result.stop_reason = "complete"  # Next led back to a page we have
+            break
+        if action == "clicked" and await _card_edges(page) == edges:
+            # Something else moved (a carousel, a tab): the directory is still on this page
+            result.stop_reason = "complete"
+            break
+        result.clicks += 1
+        seen_pages.add(page.url)
+        kept.add(current)
+        pages.append(current)
+        page_cards.append(cards)
+        cards = await _count_cards(page)
+        try_more = True
+    else:
+        result.stop_reason = "max_rounds"
+
+    if pages:
+        # Pages share the first page's URL as their base (links are site-relative)
+        last = await _body_html(page)
+        if last not in kept:
+            pages.append(last)
+            page_cards.append(cards)
+        result.html = "<html><body>" + "".join(
+            f'<section data-page="{i + 1}">{body}</section>' for i, body in enumerate(pages)
+        ) + "</body></html>"
+    else:
+        result.html = await page.content()
+        result.url = page.url
+        page_cards.append(cards)
+    result.cards = sum(page_cards)
+    result.pages = len(page_cards)
+    result.elapsed_ms = (time.monotonic() - started) * 1000
+    return result
@@ -0,0 +1,55 @@
+"""
+Failure classification and retry backoff for batch crawling
+Sorts failed crawls into timeout, DNS, HTTP 4xx, HTTP 5xx and navigation
+errors so only transient failures are retried, with jittered exponential backoff.
+"""
+
+import random
+from typing import Optional
+
+TIMEOUT = "timeout"
+DNS = "dns"
+HTTP_4XX = "http_4xx"
+HTTP_5XX = "http_5xx"
+NAVIGATION = "navigation"
+
+# Worth another attempt later; DNS and 4xx failures won't fix themselves within a run
+TRANSIENT_CLASSES = {TIMEOUT, HTTP_5XX, NAVIGATION}
+
+_TIMEOUT_MARKERS = ("timeout", "timed out", "err_timed_out", "err_connection_timed_out")
+# Resolver errors only: a bare "dns" would also match hosts in the message (xdns.co.uk)
+_DNS_MARKERS = ("err_name_not_resolved", "err_name_resolution_failed", "getaddrinfo",
+                "name or service not known", "nodename nor servname", "dns lookup failed",
+                "temporary failure in name resolution")
+
+
+def classify_failure(error_message: Optional[str], status_code: Optional[int] = None) -> str:
+    """Classify a failed crawl from its error message and HTTP status"""
+    if status_code:
+        if status_code == 408:
+            return TIMEOUT
+        if 400 <= status_code < 500:
+            return HTTP_4XX
+        if status_code >= 500:
+            return HTTP_5XX
+
+    message = (error_message or "").lower()
+    if any(marker in message for marker in _DNS_MARKERS):
+        return DNS
+    if any(marker in message for marker in _TIMEOUT_MARKERS):
+        return TIMEOUT
+    return NAVIGATION
+
+
+def is_transient(failure_class: str) -> bool:
+    return failure_class in TRANSIENT_CLASSES
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 60.0,
+                  rng: random.Random = random) -> float:
+    """
+    Seconds to wait before retry number `attempt` (1-based): exponential in the
+    attempt, capped, with half of it jittered so retries to many hosts spread out
+    """
+    delay = min(cap, base * (2 ** (attempt - 1)))
+    return delay / 2 + rng.uniform(0, delay / 2)
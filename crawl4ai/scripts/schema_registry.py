@@ -0,0 +1,231 @@
+"""
+Per-domain registry of learned CSS extraction schemas
+Generating a JsonCssExtractionStrategy schema costs one LLM call; applying
+it costs none. The registry keeps every schema that validated, keyed by
+domain, page template fingerprint and extraction query, along with the
+item count it produced, so later runs on the same site go straight to CSS.
+A schema whose item count drops sharply (the site changed its markup) is
+regenerated.
+
+Usage:
+    registry = SchemaRegistry()
+    items, method = await registry.extract(url, html, query, apply, generate)
+    # apply(schema) -> items on this page; generate() -> a new schema (one LLM call)
+    # method: "css" (no LLM), "generated", "regenerated" or "failed"
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from directory_chunks import Node, parse_html
+from directory_region import signature
+from discovery_cache import domain_key
+
+DEFAULT_SCHEMA_REGISTRY_PATH = ".schema_registry.sqlite"
+DROP_RATIO = 0.5  # Fewer items than this share of the schema's baseline means the template changed
+MIN_ITEMS = 3  # A schema must extract at least this many items to be kept
+MIN_FILLED = 0.8  # Share of items that must have a non-empty first field
+FINGERPRINT_DEPTH = 6  # Layout elements this deep under <body> define the template
+FINGERPRINT_REPEATS = 3  # Deeper elements count when repeated (list items, cards), never one-offs
+
+# schema -> the items it extracts from the current page
+ApplySchema = Callable[[Dict], Awaitable[List[Dict]]]
+# -> a newly generated schema for the current page, or None
+GenerateSchema = Callable[[], Awaitable[Optional[Dict]]]
+
+
+def query_key(query: str) -> str:
+    """Registry key for an extraction query: schemas for different queries on one site are kept apart"""
+    return hashlib.sha1(" ".join((query or "").lower().split()).encode()).hexdigest()[:12]
+
+
+def template_fingerprint(html: str) -> str:
+    """
+    Hash of a page's structural skeleton: the distinct element signatures
+    (tag + classes) of its layout and of its repeated elements. Pages built
+    from one template (a directory today and next month, /stores and
+    /dining) share it however their content differs.
+    """
+    body = parse_html(html)
+    body = body.find("body") or body
+    skeleton: Set[str] = set()
+    counts: Dict[str, int] = {}
+
+    def walk(node: Node, depth: int):
+        for child in node.children:
+            if isinstance(child, Node):
+                key = signature(child)
+                if depth <= FINGERPRINT_DEPTH:
+                    skeleton.add(key)
+                counts[key] = counts.get(key, 0) + 1
+                walk(child, depth + 1)
+
+    walk(body, 1)
+    skeleton.update(key for key, n in counts.items() if n >= FINGERPRINT_REPEATS)
+    return hashlib.sha1("\n".join(sorted(skeleton)).encode()).hexdigest()[:16]
+
+
+def validate_items(items: List[Dict], min_items: int = MIN_ITEMS) -> bool:
+    """True when a schema's output looks like real records: enough of them, mostly filled in, not all the same"""
+    records = [item for item in items or [] if isinstance(item, dict)]
+    if len(records) < min_items:
+        return False
+    filled = sum(1 for item in records if next(iter(item.values()), None) not in (None, "", [], {}))
+    if filled < len(records) * MIN_FILLED:
+        return False
+    distinct = {json.dumps(item, sort_keys=True) for item in records}
+    return len(distinct) >= len(records) / 2
+
+
+@dataclass
+class SchemaEntry:
+    domain: str
+    fingerprint: str
+    query: str
+    schema: Dict
+    item_count: int  # Baseline for drop detection
+    created_at: float
+    used_at: float
+
+    def dropped(self, count: int) -> bool:
+        return count < self.item_count * DROP_RATIO
+
+    def comparable(self, count: int) -> bool:
+        """Within DROP_RATIO of the baseline either way, as a borrowed schema's count must be"""
+        return not self.dropped(count) and count * DROP_RATIO <= self.item_count
+
+
+class SchemaRegistry:
+    """
+    One SQLite row per (domain, template fingerprint, query). get() falls
+    back to the domain's most recently used schema for the query when the
+    exact template is new, so the caller can try it before generating.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.environ.get("SCHEMA_REGISTRY_PATH", DEFAULT_SCHEMA_REGISTRY_PATH)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schemas (
+                domain TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                query TEXT NOT NULL,
+                schema TEXT NOT NULL,
+                item_count INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                used_at REAL NOT NULL,
+                PRIMARY KEY (domain, fingerprint, query)
+            )
+            """
+        )
+        self.conn.commit()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "generated": 0, "regenerated": 0}
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, url: str, fingerprint: str, query: str, exact: bool = False) -> Optional[SchemaEntry]:
+        """The schema for this template, else (unless exact) the domain's latest schema for the query"""
+        columns = "domain, fingerprint, query, schema, item_count, created_at, used_at"
+        domain, key = domain_key(url), query_key(query)
+        row = self.conn.execute(
+            f"SELECT {columns} FROM schemas WHERE domain = ? AND fingerprint = ? AND query = ?",
+            (domain, fingerprint, key),
+        ).fetchone()
+        if row is None and not exact:
+            row = self.conn.execute(
+                f"SELECT {columns} FROM schemas WHERE domain = ? AND query = ? ORDER BY used_at DESC LIMIT 1",
+                (domain, key),
+            ).fetchone()
+        if row is None:
+            return None
+        return SchemaEntry(row[0], row[1], row[2], json.loads(row[3]), *row[4:])
+
+    def put(self, url: str, fingerprint: str, query: str, schema: Dict, item_count: int, now: float = None):
+        now = time.time() if now is None else now
+        self.conn.execute(
+            "INSERT OR REPLACE INTO schemas (domain, fingerprint, query, schema, item_count, created_at, used_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (domain_key(url), fingerprint, query_key(query), json.dumps(schema), item_count, now, now),
+        )
+        self.conn.commit()
+
+    def touch(self, entry: SchemaEntry, item_count: int, now: float = None):
+        """Record a successful use; the baseline follows the count so gradual changes never look like a drop"""
+        now = time.time() if now is None else now
+        self.conn.execute(
+            "UPDATE schemas SET item_count = ?, used_at = ? WHERE domain = ? AND fingerprint = ? AND query = ?",
+            (item_count, now, entry.domain, entry.fingerprint, entry.query),
+        )
+        self.conn.commit()
+        entry.item_count, entry.used_at = item_count, now
+
+    def invalidate(self, entry: SchemaEntry):
+        self.conn.execute(
+            "DELETE FROM schemas WHERE domain = ? AND fingerprint = ? AND query = ?",
+            (entry.domain, entry.fingerprint, entry.query),
+        )
+        self.conn.commit()
+
+    async def extract(self, url: str, html: str, query: str, apply: ApplySchema, generate: GenerateSchema,
+                      now: float = None) -> Tuple[List[Dict], str]:
+        """
+        Extract with the registered schema for this page's template when it
+        still validates and its item count hasn't dropped sharply (or, for a
+        new template, the domain's schema when its count is comparable to
+        that schema's baseline); otherwise generate a schema, validate it on
+        this page and register it.
+        Returns (items, method).
+        """
+        fingerprint = template_fingerprint(html)
+        entry = self.get(url, fingerprint, query)
+        exact = entry is not None and entry.fingerprint == fingerprint
+        items: List[Dict] = []
+        valid = False
+        if entry is not None:
+            items = await apply(entry.schema)
+            valid = validate_items(items)
+            if valid and exact and not entry.dropped(len(items)):
+                self.touch(entry, len(items), now)
+                self.stats["hits"] += 1
+                return items, "css"
+            if valid and not exact and entry.comparable(len(items)):
+                # Another template on the same site (/dining beside /stores) that the schema fits too;
+                # a count far off its baseline means it matched some other list on this page
+                self.put(url, fingerprint, query, entry.schema, len(items), now)
+                self.stats["hits"] += 1
+                return items, "css"
+        self.stats["stale" if exact else "misses"] += 1
+        if exact and not valid:
+            self.invalidate(entry)  # Its selectors no longer match anything usable
+
+        schema = await generate()
+        new_items = await apply(schema) if schema else []
+        if validate_items(new_items) and not (exact and valid and len(new_items) <= len(items)):
+            self.put(url, fingerprint, query, schema, len(new_items), now)
+            method = "regenerated" if exact else "generated"
+            self.stats[method] += 1
+            return new_items, method
+        if exact and valid:
+            # Regenerating found no more: the directory really shrank, so the old schema stands
+            self.touch(entry, len(items), now)
+            return items, "css"
+        return new_items or items, "failed"
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"Schema registry: {s['hits']} CSS-only, {s['misses']} new templates, {s['stale']} stale, "
+                f"{s['generated']} generated, {s['regenerated']} regenerated")
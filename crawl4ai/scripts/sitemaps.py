@@ -0,0 +1,428 @@
+"""
+Streaming sitemap parsing with per-site lastmod state for incremental re-crawls
+Sitemaps are parsed chunk by chunk as they download (gzip included), index
+files are followed, and every URL's <lastmod>/<changefreq> is kept in a SQLite
+store. A later run then only needs the URLs modified since they were last
+crawled, and skips child sitemaps whose index lastmod has not moved. URLs
+that drop out of a sitemap are pruned from the store after a complete sync.
+
+Usage:
+    state = SitemapState(".sitemap_state.sqlite", "https://centre.example")
+    sync = await sync_sitemaps(["https://centre.example/sitemap.xml"], state)
+    for url in sync.changed:
+        ...crawl url...
+    state.mark_crawled(crawled_urls)
+"""
+
+import asyncio
+import sqlite3
+import time
+import urllib.request
+import xml.etree.ElementTree as ET
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Iterable, List, Optional
+from urllib.parse import urlparse
+
+try:
+    import aiohttp  # Installed with crawl4ai
+except ImportError:
+    aiohttp = None
+
+HTTP_CLIENT_AVAILABLE = aiohttp is not None
+
+DEFAULT_SITEMAP_STATE_PATH = ".sitemap_state.sqlite"
+
+# How long a URL without <lastmod> stays fresh, from its <changefreq>
+CHANGEFREQ_SECONDS = {
+    "always": 0,
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 7 * 86400,
+    "monthly": 30 * 86400,
+    "yearly": 365 * 86400,
+    "never": float("inf"),
+}
+DEFAULT_MAX_AGE = CHANGEFREQ_SECONDS["weekly"]  # Matches the weekly tenant refresh
+
+USER_AGENT = "Mozilla/5.0 (compatible; sitemap reader)"
+MAX_SITEMAPS = 50  # Per sync; large retail sites split into a few dozen at most
+MAX_SITEMAP_BYTES = 50_000_000  # Protocol limit for one uncompressed sitemap
+
+
+@dataclass
+class SitemapEntry:
+    loc: str
+    lastmod: Optional[str] = None
+    changefreq: Optional[str] = None
+    is_index: bool = False  # A <sitemap> in an index file rather than a page <url>
+
+    @property
+    def lastmod_ts(self) -> Optional[float]:
+        return parse_lastmod(self.lastmod)
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """W3C datetime (2024, 2024-05, 2024-05-01, 2024-05-01T10:00:00+01:00, ...Z) -> epoch seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    for fmt in ("%Y", "%Y-%m"):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            pass
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace"""
+    return tag.rsplit("}", 1)[-1]
+
+
+class SitemapParser:
+    """
+    Incremental parser for <urlset> and <sitemapindex> documents.
+    feed() accepts raw (optionally gzip'd) chunks and returns the entries
+    completed so far; parsed elements are discarded as they are emitted.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root = None
+        self._inflate = None
+        self._sniffed = False
+
+    def _decode(self, chunk: bytes) -> bytes:
+        if not self._sniffed:
+            self._sniffed = True
+            if chunk[:2] == b"\x1f\x8b":
+                self._inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        return self._inflate.decompress(chunk) if self._inflate else chunk
+
+    def _drain(self) -> List[SitemapEntry]:
+        entries = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                continue
+            tag = _local(elem.tag)
+            if tag not in ("url", "sitemap"):
+                continue
+            fields = {_local(child.tag): (child.text or "").strip() for child in elem}
+            if fields.get("loc"):
+                entries.append(SitemapEntry(
+                    loc=fields["loc"],
+                    lastmod=fields.get("lastmod") or None,
+                    changefreq=(fields.get("changefreq") or "").lower() or None,
+                    is_index=(tag == "sitemap"),
+                ))
+            # Drop finished entries so memory stays flat on 50k-URL sitemaps
+            self._root.clear()
+        return entries
+
+    def feed(self, chunk: bytes) -> List[SitemapEntry]:
+        self._parser.feed(self._decode(chunk))
+        return self._drain()
+
+    def close(self) -> List[SitemapEntry]:
+        if self._inflate:
+            self._parser.feed(self._inflate.flush())
+        self._parser.close()
+        return self._drain()
+
+
+def sitemaps_from_robots(robots_txt: str) -> List[str]:
+    """Sitemap URLs declared by `Sitemap:` lines in a robots.txt"""
+    urls = []
+    for line in robots_txt.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip().lower() == "sitemap" and value.strip():
+            urls.append(value.strip())
+    return list(dict.fromkeys(urls))
+
+
+def parse_sitemap(data: bytes) -> List[SitemapEntry]:
+    """Parse a whole sitemap document (raises xml.etree.ElementTree.ParseError)"""
+    parser = SitemapParser()
+    return parser.feed(data) + parser.close()
+
+
+class SitemapState:
+    """
+    SQLite store of the sitemap URLs seen for one site: lastmod, changefreq
+    and when each was last crawled, plus the lastmod of every sitemap file.
+    Several sites can share one database file.
+    """
+
+    def __init__(self, path: str = DEFAULT_SITEMAP_STATE_PATH, site: str = ""):
+        self.site = urlparse(site).netloc.lower() or site
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sitemap_urls (
+                site TEXT NOT NULL,
+                url TEXT NOT NULL,
+                lastmod REAL,
+                changefreq TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                crawled_at REAL,
+                sitemap TEXT,
+                root TEXT,
+                PRIMARY KEY (site, url)
+            );
+            CREATE TABLE IF NOT EXISTS sitemap_files (
+                site TEXT NOT NULL,
+                url TEXT NOT NULL,
+                lastmod REAL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (site, url)
+            );
+            """
+        )
+        # Stores created before pruning have no sitemap/root columns
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(sitemap_urls)")}
+        for column in ("sitemap", "root"):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE sitemap_urls ADD COLUMN {column} TEXT")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, entries: Iterable[SitemapEntry], sitemap: str = None, root: str = None,
+               now: float = None) -> int:
+        """Upsert page entries read from sitemap (under root); a URL's crawled_at is kept across syncs"""
+        now = time.time() if now is None else now
+        rows = [(self.site, e.loc, e.lastmod_ts, e.changefreq, now, now, sitemap, root)
+                for e in entries if not e.is_index]
+        self.conn.executemany(
+            """
+            INSERT INTO sitemap_urls (site, url, lastmod, changefreq, first_seen, last_seen, sitemap, root)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (site, url) DO UPDATE SET
+                lastmod = excluded.lastmod,
+                changefreq = excluded.changefreq,
+                last_seen = excluded.last_seen,
+                sitemap = excluded.sitemap,
+                root = excluded.root
+            """,
+            rows,
+        )
+        self.conn.commit()
+        return len(rows)
+
+    def prune(self, roots: Iterable[str], since: float, unchanged: Iterable[str] = ()) -> int:
+        """
+        After a complete sync of roots started at `since`, drop their URLs that
+        were not seen again, except those of child sitemaps skipped as
+        unchanged (they were not re-read). Rows stored before URLs recorded
+        their root are dropped too when nothing was skipped.
+        """
+        roots, unchanged = list(roots), list(unchanged)
+        query = (f"DELETE FROM sitemap_urls WHERE site = ? AND last_seen < ? "
+                 f"AND (root IN ({','.join('?' * len(roots))})")
+        params = [self.site, since, *roots]
+        query += " OR root IS NULL)" if not unchanged else ")"
+        if unchanged:
+            query += f" AND (sitemap IS NULL OR sitemap NOT IN ({','.join('?' * len(unchanged))}))"
+            params += unchanged
+        pruned = self.conn.execute(query, params).rowcount
+        self.conn.commit()
+        return pruned
+
+    def sitemap_unchanged(self, entry: SitemapEntry) -> bool:
+        """True when an index entry's lastmod is no newer than when we last fetched that sitemap"""
+        lastmod = entry.lastmod_ts
+        if lastmod is None:
+            return False
+        row = self.conn.execute(
+            "SELECT lastmod FROM sitemap_files WHERE site = ? AND url = ?", (self.site, entry.loc)
+        ).fetchone()
+        return row is not None and row[0] is not None and lastmod <= row[0]
+
+    def record_sitemap(self, url: str, lastmod: Optional[float]):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sitemap_files (site, url, lastmod, fetched_at) VALUES (?, ?, ?, ?)",
+            (self.site, url, lastmod, time.time()),
+        )
+        self.conn.commit()
+
+    def due(self, now: float = None, default_max_age: float = DEFAULT_MAX_AGE) -> List[str]:
+        """
+        URLs to crawl: never crawled, modified (lastmod) since their last crawl,
+        or without lastmod and older than their changefreq allows
+        """
+        now = now if now is not None else time.time()
+        due = []
+        for url, lastmod, changefreq, crawled_at in self.conn.execute(
+            "SELECT url, lastmod, changefreq, crawled_at FROM sitemap_urls WHERE site = ? ORDER BY url",
+            (self.site,),
+        ):
+            if crawled_at is None:
+                due.append(url)
+            elif lastmod is not None:
+                if lastmod > crawled_at:
+                    due.append(url)
+            elif now - crawled_at >= CHANGEFREQ_SECONDS.get(changefreq, default_max_age):
+                due.append(url)
+        return due
+
+    def mark_crawled(self, urls: Iterable[str], at: float = None):
+        at = at if at is not None else time.time()
+        self.conn.executemany(
+            "UPDATE sitemap_urls SET crawled_at = ? WHERE site = ? AND url = ?",
+            [(at, self.site, url) for url in urls],
+        )
+        self.conn.commit()
+
+    def lastmod(self, url: str) -> Optional[float]:
+        row = self.conn.execute(
+            "SELECT lastmod FROM sitemap_urls WHERE site = ? AND url = ?", (self.site, url)
+        ).fetchone()
+        return row[0] if row else None
+
+    def urls(self) -> List[str]:
+        return [row[0] for row in self.conn.execute(
+            "SELECT url FROM sitemap_urls WHERE site = ? ORDER BY url", (self.site,)
+        )]
+
+
+@dataclass
+class SitemapSync:
+    urls: List[str] = field(default_factory=list)      # Page URLs read in this sync
+    changed: List[str] = field(default_factory=list)   # URLs due for (re-)crawl
+    fetched: List[str] = field(default_factory=list)   # Sitemap files downloaded
+    skipped: List[str] = field(default_factory=list)   # Child sitemaps unchanged since last sync
+    errors: List[str] = field(default_factory=list)
+    pruned: int = 0                                    # Stored URLs no longer in any sitemap
+
+
+ChunkFetcher = Callable[[str], AsyncIterator[bytes]]
+
+
+def aiohttp_fetcher(session, max_bytes: int = MAX_SITEMAP_BYTES) -> ChunkFetcher:
+    """Chunk fetcher over an aiohttp session; non-200 answers raise"""
+    async def fetch(url: str) -> AsyncIterator[bytes]:
+        async with session.get(url, allow_redirects=True) as response:
+            if response.status != 200:
+                raise ValueError(f"HTTP {response.status}")
+            read = 0
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                read += len(chunk)
+                if read > max_bytes:
+                    raise ValueError(f"sitemap larger than {max_bytes} bytes")
+                yield chunk
+    return fetch
+
+
+def urllib_fetcher(timeout: float = 15.0, max_bytes: int = MAX_SITEMAP_BYTES) -> ChunkFetcher:
+    """
+    Chunk fetcher over urllib in a worker thread, for when aiohttp is
+    missing. Reads the raw response body: a browser render of the same URL
+    would return its XML viewer page, not the sitemap.
+    """
+    async def fetch(url: str) -> AsyncIterator[bytes]:
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+        response = await asyncio.to_thread(urllib.request.urlopen, request, timeout=timeout)
+        try:
+            read = 0
+            while True:
+                chunk = await asyncio.to_thread(response.read, 64 * 1024)
+                if not chunk:
+                    break
+                read += len(chunk)
+                if read > max_bytes:
+                    raise ValueError(f"sitemap larger than {max_bytes} bytes")
+                yield chunk
+        finally:
+            response.close()
+    return fetch
+
+
+async def iter_sitemap(url: str, fetch: ChunkFetcher) -> AsyncIterator[SitemapEntry]:
+    """Stream the entries of one sitemap file as its bytes arrive"""
+    parser = SitemapParser()
+    async for chunk in fetch(url):
+        for entry in parser.feed(chunk):
+            yield entry
+    for entry in parser.close():
+        yield entry
+
+
+async def sync_sitemaps(roots: List[str], state: SitemapState, fetch: ChunkFetcher = None,
+                        max_sitemaps: int = MAX_SITEMAPS, timeout: float = 15.0) -> SitemapSync:
+    """
+    Read the sitemap(s) at roots, following index files, into state.
+    Child sitemaps whose index lastmod has not moved since the last sync are
+    skipped (their URLs are already in state). A sync that read every file
+    without errors prunes the stored URLs its sitemaps no longer list.
+    Without a fetch callable an aiohttp session is used, or urllib when
+    aiohttp is missing.
+    """
+    sync = SitemapSync()
+    if fetch is None:
+        if not HTTP_CLIENT_AVAILABLE:
+            return await sync_sitemaps(roots, state, urllib_fetcher(timeout), max_sitemaps)
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+            return await sync_sitemaps(roots, state, aiohttp_fetcher(session), max_sitemaps)
+
+    started = time.time()
+    queue = list(dict.fromkeys(roots))
+    seen = set(queue)
+    root_of = {url: url for url in queue}  # Sitemap file -> the root it was reached from
+    batch: List[SitemapEntry] = []
+    # Child sitemap -> lastmod from its index, recorded once the child was read
+    index_lastmods = {}
+    while queue and len(sync.fetched) < max_sitemaps:
+        sitemap_url = queue.pop(0)
+        try:
+            async for entry in iter_sitemap(sitemap_url, fetch):
+                if entry.is_index:
+                    if entry.loc in seen:
+                        continue
+                    seen.add(entry.loc)
+                    if state.sitemap_unchanged(entry):
+                        sync.skipped.append(entry.loc)
+                        continue
+                    index_lastmods[entry.loc] = entry.lastmod_ts
+                    root_of[entry.loc] = root_of[sitemap_url]
+                    queue.append(entry.loc)
+                else:
+                    sync.urls.append(entry.loc)
+                    batch.append(entry)
+                    if len(batch) >= 1000:
+                        state.record(batch, sitemap_url, root_of[sitemap_url])
+                        batch = []
+        except Exception as e:
+            sync.errors.append(f"{sitemap_url}: {type(e).__name__}: {e}")
+            batch = []
+            continue
+        sync.fetched.append(sitemap_url)
+        state.record(batch, sitemap_url, root_of[sitemap_url])
+        batch = []
+        if sitemap_url in index_lastmods:
+            state.record_sitemap(sitemap_url, index_lastmods[sitemap_url])
+
+    if sync.fetched and not sync.errors and not queue:
+        sync.pruned = state.prune(list(dict.fromkeys(roots)), started, sync.skipped)
+    sync.changed = state.due()
+    return sync
@@ -0,0 +1,176 @@
+"""
+Tenant name normalisation and brand alias index
+Folds the many spellings a brand appears under on centre directories
+("M&S", "Marks & Spencer", "Marks and Spencer Foodhall") onto one key, and
+finds near-duplicates through a trigram index with prefix filtering, so a
+lookup stays well under a millisecond across tens of thousands of brands.
+
+Usage:
+    normalise_name("Marks and Spencer Foodhall")   # "marks and spencer"
+    index = BrandIndex()
+    index.add("Marks & Spencer")
+    index.match("M&S")                               # "Marks & Spencer"
+"""
+
+import math
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Trailing words that describe the unit, not the brand ("Costa Cafe", "Next Store")
+SUFFIXES = (
+    ("ltd",), ("limited",), ("plc",), ("llp",), ("inc",), ("and", "co"), ("co",), ("uk",),
+    ("store",), ("stores",), ("superstore",), ("local",), ("outlet",), ("cafe",), ("restaurant",),
+    ("foodhall",), ("food", "hall"), ("simply", "food"),
+)
+PREFIXES = (("the",),)
+
+# Brands known by their initials. Only these pairs match as acronyms: initials
+# alone can't tell "B&M" from "Boots & More", and a wrong merge drops a tenant
+ACRONYMS = {
+    "M&S": "Marks & Spencer",
+    "KFC": "Kentucky Fried Chicken",
+}
+
+DEFAULT_THRESHOLD = 0.8  # Trigram Dice similarity for a near-duplicate
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _strip_affixes(tokens: List[str]) -> List[str]:
+    changed = True
+    while changed and len(tokens) > 1:
+        changed = False
+        for suffix in SUFFIXES:
+            if len(tokens) > len(suffix) and tuple(tokens[-len(suffix):]) == suffix:
+                tokens = tokens[:-len(suffix)]
+                changed = True
+                break
+    for prefix in PREFIXES:
+        if len(tokens) > len(prefix) and tuple(tokens[:len(prefix)]) == prefix:
+            tokens = tokens[len(prefix):]
+    return tokens
+
+
+def name_tokens(name: str) -> List[str]:
+    """Lowercase ASCII word tokens with '&'/'+' as "and", apostrophes dropped and affixes stripped"""
+    folded = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode().lower()
+    folded = re.sub(r"[&+]", " and ", folded)
+    folded = re.sub(r"['’`]", "", folded)
+    return _strip_affixes(_NON_ALNUM.sub(" ", folded).split())
+
+
+def normalise_name(name: str) -> str:
+    """"Marks & Spencer Ltd." -> "marks and spencer"; "The Body Shop" -> "body shop" """
+    return " ".join(name_tokens(name))
+
+
+def name_key(name: str) -> str:
+    """Exact-match key: the normalised name without spaces ("H & M" == "H&M", "Nando's" == "Nandos")"""
+    return "".join(name_tokens(name))
+
+
+# Each acronym's key -> its expansion's key and back
+_ACRONYM_KEYS = {**{name_key(short): name_key(full) for short, full in ACRONYMS.items()},
+                 **{name_key(full): name_key(short) for short, full in ACRONYMS.items()}}
+
+
+def trigrams(key: str) -> Set[str]:
+    """Character trigrams of a key, with boundary markers so short keys still have some"""
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class BrandIndex:
+    """
+    In-memory index of canonical brand names. A lookup tries, in order:
+    the exact normalised key, a registered alias, a known acronym from
+    ACRONYMS ("M&S" <-> "Marks & Spencer"), then the most similar brand by
+    trigram Dice coefficient at or above `threshold`.
+
+    Near-duplicate search uses prefix filtering: a brand can only reach the
+    threshold if it shares one of the query's rarest trigrams, so only those
+    posting lists are scanned.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.names: List[str] = []
+        self._keys: List[str] = []
+        self._grams: List[Set[str]] = []
+        self._by_key: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str) -> int:
+        """Add a canonical brand (no-op if its key is already known); returns its id"""
+        key = name_key(name)
+        if not key:
+            raise ValueError(f"Brand name has no letters or digits: {name!r}")
+        if key in self._by_key:
+            return self._by_key[key]
+        brand_id = len(self.names)
+        self.names.append(name)
+        self._keys.append(key)
+        self._by_key[key] = brand_id
+        grams = trigrams(key)
+        self._grams.append(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(brand_id)
+        return brand_id
+
+    def add_alias(self, alias: str, name: str):
+        """Map another spelling (e.g. a former name) onto a brand, adding the brand if needed"""
+        brand_id = self.add(name)
+        key = name_key(alias)
+        if key:
+            self._by_key.setdefault(key, brand_id)
+
+    def extend(self, names: Iterable[str]):
+        for name in names:
+            if name_key(name):
+                self.add(name)
+
+    def _similar(self, key: str) -> Optional[Tuple[int, float]]:
+        query = trigrams(key)
+        size = len(query)
+        # Dice >= t needs at least this many shared trigrams (since |B| >= t|Q|/(2-t))
+        min_shared = max(1, math.ceil(self.threshold * size / (2 - self.threshold)))
+        rarest = sorted(query, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates: Set[int] = set()
+        for gram in rarest[:size - min_shared + 1]:
+            candidates.update(self._postings.get(gram, ()))
+        min_len = self.threshold * size / (2 - self.threshold)
+        max_len = (2 - self.threshold) * size / self.threshold
+        best: Optional[Tuple[int, float]] = None
+        for brand_id in candidates:
+            grams = self._grams[brand_id]
+            if not min_len <= len(grams) <= max_len:
+                continue
+            score = 2 * len(query & grams) / (size + len(grams))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (brand_id, score)
+        return best
+
+    def lookup(self, name: str) -> Optional[Tuple[str, float]]:
+        """(canonical brand, similarity) for name, or None if nothing is close enough"""
+        key = name_key(name)
+        if not key:
+            return None
+        brand_id = self._by_key.get(key)
+        if brand_id is not None:
+            return self.names[brand_id], 1.0
+        # "M&S" <-> "Marks & Spencer", in whichever order they were seen
+        brand_id = self._by_key.get(_ACRONYM_KEYS.get(key, ""))
+        if brand_id is not None:
+            return self.names[brand_id], 1.0
+        similar = self._similar(key)
+        if similar is not None:
+            return self.names[similar[0]], similar[1]
+        return None
+
+    def match(self, name: str) -> Optional[str]:
+        found = self.lookup(name)
+        return found[0] if found else None
@@ -0,0 +1,145 @@
+"""
+Tenant taxonomy for locally extracted directories
+extract_cards reads a name, a category hint and a link off each card, but
+not the fields the LLM prompt asks for: a category from the fixed taxonomy,
+subcategory, tenant_type and is_anchor. This fills them in by rule - the
+card's category hint mapped onto the taxonomy, else the name (known anchor,
+food, leisure and service brands, and food/leisure/service words) - so
+tenants extracted without an LLM call keep the same shape and meaning.
+
+Usage:
+    fields = classify_tenant("Costa Coffee", hint=None, is_dining=False)
+    # {"category": "F&B", "subcategory": None, "tenant_type": "food_beverage", "is_anchor": True}
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from tenant_names import name_key
+
+RETAIL = "retail"
+FOOD = "food_beverage"
+SERVICE = "service"
+LEISURE = "leisure"
+OTHER = "Other"  # Category of an unrecognised tenant without a usable hint
+
+# Category hint -> (taxonomy category, tenant_type), first match wins: the
+# order settles hints naming two things ("Fashion & Accessories", "Sports & Leisure")
+HINT_RULES: List[Tuple[re.Pattern, str, str]] = [(re.compile(pattern, re.I), category, tenant_type) for pattern, category, tenant_type in (
+    (r"\b(food|drink|dining|restaurants?|caf[eé]s?|coffee|eat|bars?|takeaways?|bakery|desserts?|f\s?&\s?b)\b", "F&B", FOOD),
+    (r"\b(supermarkets?|grocer(y|ies)?|convenience)\b", "Supermarket", RETAIL),
+    (r"\bdepartment\b", "Department Store", RETAIL),
+    (r"\b(hair|barbers?|nails?|salons?|spa|opticians?|eyecare|dentist|clinic)\b", "Health & Beauty", SERVICE),
+    (r"\b(health|beauty|pharmacy|chemist|cosmetics?|fragrances?|perfumery)\b", "Health & Beauty", RETAIL),
+    (r"\b(electronics?|technology|tech|mobiles?|phones?|computers?|gaming|games|cameras?)\b", "Electronics", RETAIL),
+    (r"\b(sports?|outdoors?|fitness wear)\b", "Sports & Outdoors", RETAIL),
+    (r"\b(entertainment|leisure|cinemas?|bowling|gyms?|fitness|arcades?|play|activities|attractions?)\b", "Entertainment", LEISURE),
+    (r"\b(kids|children|childrens|toys?|baby|nursery)\b", "Kids & Toys", RETAIL),
+    (r"\b(fashion|clothing|clothes|apparel|\w*wear|shoes|footwear|boutiques?|lingerie)\b", "Fashion", RETAIL),
+    (r"\b(jewell?e?ry|watches|accessories)\b", "Jewelry", RETAIL),
+    (r"\b(home|living|furniture|interiors?|garden|homeware|diy|hardware|beds?)\b", "Home & Living", RETAIL),
+    (r"\b(services?|banks?|banking|building society|financial|finance|repairs?|travel|post office|"
+     r"estate agents?|dry cleaning|key cutting)\b", "Services", SERVICE),
+)]
+
+# A card's "other text" only stands in for a category when it reads like one
+# (short, no unit numbers / opening hours / phone numbers)
+HINT_MAX_WORDS = 4
+_DIGITS = re.compile(r"\d")
+
+# Words in a name that give its type away when the card has no usable hint
+FOOD_NAME = re.compile(r"\b(coffee|caf[eé]|kitchen|grill|pizza|pizzeria|burgers?|chicken|sushi|noodles?|bakery|"
+                       r"bakehouse|diner|bistro|restaurant|pub|tavern|kebab|doner|curry|tandoori|donuts?|doughnuts?|"
+                       r"cookies|juice|smoothies?|bubble tea|tea rooms?|gelato|ice cream|desserts?|crepes?|waffles?|"
+                       r"sandwich(es)?|deli|carvery|steakhouse|tapas|tacos?|burrito|ramen|wok|patisserie|espresso|"
+                       r"cantina|trattoria)\b", re.I)
+LEISURE_NAME = re.compile(r"\b(cinema|bowl|bowling|gym|fitness|escape rooms?|trampoline|soft play|arcade|"
+                          r"mini golf|crazy golf|laser|climbing)\b", re.I)
+SERVICE_NAME = re.compile(r"\b(bank|building society|barbers?|hair|salon|nails|spa|opticians?|dentist|clinic|"
+                          r"post office|repairs?|travel|estate agents?|dry clean(ers|ing)?|key cutting|cobbler|"
+                          r"tattoo)\b", re.I)
+
+# Major anchors (the prompt's examples plus department stores, supermarkets and large-format retail)
+ANCHOR_BRANDS = (
+    "Primark", "Marks & Spencer", "M&S", "Next", "Boots", "Costa", "Costa Coffee", "McDonald's", "TK Maxx", "H&M", "Zara",
+    "John Lewis", "Debenhams", "House of Fraser", "Fenwick", "Selfridges", "Frasers", "Sports Direct", "Matalan",
+    "B&M", "Home Bargains", "Wilko", "Argos", "Currys", "Tesco", "Tesco Extra", "Sainsbury's", "Asda", "Morrisons",
+    "Waitrose", "Aldi", "Lidl", "Iceland", "Dunelm", "The Range", "JD Sports", "Odeon", "Cineworld", "Vue",
+)
+FOOD_BRANDS = (
+    "Costa", "Costa Coffee", "Starbucks", "Greggs", "McDonald's", "KFC", "Burger King", "Subway", "Nando's", "Pizza Hut",
+    "Domino's", "Pret A Manger", "Caffe Nero", "Wagamama", "Five Guys", "Frankie & Benny's", "Bella Italia",
+    "Zizzi", "Prezzo", "Krispy Kreme", "Taco Bell", "Wimpy", "Harvester", "Toby Carvery", "Wetherspoon",
+    "Chopstix", "Tortilla", "Leon", "Itsu", "Yo! Sushi", "Patisserie Valerie", "Cinnabon", "Millie's Cookies",
+    "Ben's Cookies", "Auntie Anne's", "Tim Hortons", "Popeyes", "Wingstop", "German Doner Kebab", "Papa John's",
+    "Pizza Express", "Cafe Rouge", "Las Iguanas", "TGI Fridays", "Chiquito", "Boost", "Joe & the Juice",
+    "Shake Shack", "Bill's", "Pho", "Giraffe", "Handmade Burger Co", "Slim Chickens",
+)
+SUPERMARKET_BRANDS = ("Tesco", "Tesco Extra", "Sainsbury's", "Asda", "Morrisons", "Waitrose", "Aldi", "Lidl",
+                      "Iceland", "Co-op", "Farmfoods", "Heron Foods")
+DEPARTMENT_BRANDS = ("John Lewis", "Debenhams", "House of Fraser", "Fenwick", "Selfridges", "Frasers", "Beales",
+                     "Bentalls", "Harvey Nichols")
+LEISURE_BRANDS = ("Odeon", "Cineworld", "Vue", "Showcase", "Everyman", "Hollywood Bowl", "Tenpin", "PureGym",
+                  "The Gym Group", "Namco", "Gravity")
+SERVICE_BRANDS = ("HSBC", "Barclays", "NatWest", "Lloyds", "Santander", "Halifax", "Nationwide", "TSB",
+                  "Specsavers", "Vision Express", "Timpson", "Post Office", "Toni & Guy", "Regis")
+BEAUTY_SERVICE_BRANDS = ("Specsavers", "Vision Express", "Toni & Guy", "Regis")
+
+_ANCHORS = {name_key(name) for name in ANCHOR_BRANDS}
+_BRAND_TYPES: Dict[str, Tuple[str, str]] = {
+    **{name_key(name): ("Health & Beauty", SERVICE) if name in BEAUTY_SERVICE_BRANDS else ("Services", SERVICE)
+       for name in SERVICE_BRANDS},
+    **{name_key(name): ("Supermarket", RETAIL) for name in SUPERMARKET_BRANDS},
+    **{name_key(name): ("Department Store", RETAIL) for name in DEPARTMENT_BRANDS},
+    **{name_key(name): ("Entertainment", LEISURE) for name in LEISURE_BRANDS},
+    **{name_key(name): ("F&B", FOOD) for name in FOOD_BRANDS},
+}
+
+
+def category_from_hint(hint: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(taxonomy category, tenant_type) for a card's category hint, or None if it isn't recognised"""
+    if not hint:
+        return None
+    for pattern, category, tenant_type in HINT_RULES:
+        if pattern.search(hint):
+            return category, tenant_type
+    return None
+
+
+def category_from_name(name: str) -> Optional[Tuple[str, str]]:
+    """(taxonomy category, tenant_type) from a known brand or a telling word in the name, or None"""
+    known = _BRAND_TYPES.get(name_key(name))
+    if known:
+        return known
+    if FOOD_NAME.search(name):
+        return "F&B", FOOD
+    if LEISURE_NAME.search(name):
+        return "Entertainment", LEISURE
+    if SERVICE_NAME.search(name):
+        return "Services", SERVICE
+    return None
+
+
+def is_anchor(name: str) -> bool:
+    """True for the known anchor brands, under any spelling tenant_names folds together ("M&S Foodhall")"""
+    return name_key(name) in _ANCHORS
+
+
+def classify_tenant(name: str, hint: Optional[str] = None, is_dining: bool = False) -> Dict:
+    """
+    TenantInfo's category, subcategory, tenant_type and is_anchor for a
+    locally extracted tenant. A recognised hint wins, then the name; an
+    unrecognised tenant takes its page's type (F&B on a dining page) and
+    keeps its raw hint, else "Other", as the category. The raw hint is the subcategory
+    whenever it says more than the category; hints that don't read like a
+    category (unit numbers, opening hours, long descriptions) are ignored.
+    """
+    hint = " ".join((hint or "").split()) or None
+    if hint and (len(hint.split()) > HINT_MAX_WORDS or _DIGITS.search(hint)):
+        hint = None
+    found = category_from_hint(hint) or category_from_name(name)
+    if found is None and is_dining:
+        found = ("F&B", FOOD)
+    category, tenant_type = found if found else (hint or OTHER, RETAIL)
+    subcategory = hint if hint and hint.lower() != category.lower() else None
+    return {"category": category, "subcategory": subcategory, "tenant_type": tenant_type, "is_anchor": is_anchor(name)}
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Local fixture server for crawl benchmarks
+Serves shopping-centre directory pages built from fixtures/tenants.json in the
+layouts we meet in the wild, so crawls can be timed without the network:
+
+    /static/<centre>/stores          server-rendered directory, every tenant in the HTML
+    /js/<centre>/stores              empty app shell, tenants rendered client-side from the API
+    /scroll/<centre>/stores          infinite scroll: batches of 20 loaded as the page scrolls
+    /paged/<centre>/stores?page=N    server-rendered, 25 tenants per page with a Next link
+    /api/<centre>/tenants            JSON backing the JS and scroll layouts (?offset=&limit=)
+    /tenant/<centre>/<slug>          tenant detail page
+
+Each centre serves the same tenant corpus in a different (seeded) order, so
+pages differ between centres. Responses can be delayed to mimic a real origin.
+
+Usage:
+    python fixture_server.py [--port 8765] [--delay-ms 50]
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+LAYOUTS = ("static", "js", "scroll", "paged")
+PAGE_SIZE = 25
+SCROLL_BATCH = 20
+
+
+def load_tenants() -> List[Dict[str, str]]:
+    with open(FIXTURES_DIR / "tenants.json") as f:
+        return json.load(f)
+
+
+TENANTS = load_tenants()
+
+
+def centre_tenants(centre: str) -> List[Dict[str, str]]:
+    """The corpus in this centre's stable order"""
+    tenants = list(TENANTS)
+    random.Random(centre).shuffle(tenants)
+    return tenants
+
+
+def centre_name(centre: str) -> str:
+    return centre.replace("-", " ").title()
+
+
+def tenant_items(centre: str, tenants: List[Dict[str, str]]) -> str:
+    return "\n".join(
+        f'<li class="tenant"><a href="/tenant/{centre}/{t["slug"]}">'
+        f'<span class="tenant-name">{escape(t["name"])}</span></a>'
+        f'<span class="tenant-category">{escape(t["category"])}</span>'
+        f'<span class="tenant-unit">{escape(t["unit"])}</span></li>'
+        for t in tenants
+    )
+
+
+def page(title: str, body: str, script: str = "") -> str:
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{escape(title)}</title>
+<meta name="description" content="Find every shop, restaurant and service at {escape(title)}.">
+<style>.tenant {{ display: block; height: 120px; }}</style>
+</head>
+<body>
+<header><nav><a href="/">Home</a> <a href="/visit">Plan your visit</a> <a href="/offers">Offers</a></nav></header>
+{body}
+<footer><p>Opening hours: Monday to Saturday 9am - 8pm, Sunday 11am - 5pm.</p></footer>
+{f"<script>{script}</script>" if script else ""}
+</body>
+</html>"""
+
+
+# Client-side renderer shared by the JS and infinite-scroll layouts
+RENDER_SCRIPT = """
+const centre = %(centre)s;
+const list = document.getElementById("directory");
+let offset = 0, loading = false, done = false;
+function render(items) {
+  for (const t of items) {
+    const li = document.createElement("li");
+    li.className = "tenant";
+    li.innerHTML = `<a href="/tenant/${centre}/${t.slug}"><span class="tenant-name"></span></a>` +
+      `<span class="tenant-category"></span><span class="tenant-unit"></span>`;
+    li.querySelector(".tenant-name").textContent = t.name;
+    li.querySelector(".tenant-category").textContent = t.category;
+    li.querySelector(".tenant-unit").textContent = t.unit;
+    list.appendChild(li);
+  }
+}
+async function load() {
+  if (loading || done) return;
+  loading = true;
+  const response = await fetch(`/api/${centre}/tenants?offset=${offset}&limit=%(limit)s`);
+  const data = await response.json();
+  render(data.items);
+  offset += data.items.length;
+  done = !data.has_more;
+  loading = false;
+}
+"""
+
+SCROLL_SCRIPT = """
+window.addEventListener("scroll", () => {
+  if (window.innerHeight + window.scrollY >= document.body.offsetHeight - 400) load();
+});
+load();
+"""
+
+
+def render_layout(layout: str, centre: str, query: Dict[str, List[str]]) -> str:
+    tenants = centre_tenants(centre)
+    title = f"{centre_name(centre)} Shopping Centre - Stores"
+    if layout == "static":
+        return page(title, f'<main><h1>Store Directory</h1><ul id="directory">{tenant_items(centre, tenants)}</ul></main>')
+    if layout == "js":
+        script = RENDER_SCRIPT % {"centre": json.dumps(centre), "limit": len(tenants)} + "load();"
+        return page(title, '<div id="root"></div><main><ul id="directory"></ul></main>', script)
+    if layout == "scroll":
+        script = RENDER_SCRIPT % {"centre": json.dumps(centre), "limit": SCROLL_BATCH} + SCROLL_SCRIPT
+        return page(title, '<main><h1>Store Directory</h1><ul id="directory"></ul></main>', script)
+    # paged
+    pages = (len(tenants) + PAGE_SIZE - 1) // PAGE_SIZE
+    try:
+        number = min(max(int(query.get("page", ["1"])[0]), 1), pages)
+    except ValueError:
+        number = 1
+    chunk = tenants[(number - 1) * PAGE_SIZE:number * PAGE_SIZE]
+    nav = f'<span class="page-info">Page {number} of {pages}</span>'
+    if number < pages:
+        nav += f' <a class="next" rel="next" href="/paged/{centre}/stores?page={number + 1}">Next</a>'
+    return page(f"{title} (page {number})",
+                f'<main><h1>Store Directory</h1><ul id="directory">{tenant_items(centre, chunk)}</ul>'
+                f'<nav class="pagination">{nav}</nav></main>')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server_version = "FixtureServer/1.0"
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+    def _send(self, status: int, body: str, content_type: str = "text/html; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        parts = [p for p in parsed.path.split("/") if p]
+        query = parse_qs(parsed.query)
+        self.server.requests[parts[0] if parts else "/"] += 1
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        if parsed.path == "/robots.txt":
+            self._send(200, "User-agent: *\nAllow: /\n", "text/plain")
+        elif len(parts) == 3 and parts[0] in LAYOUTS and parts[2] == "stores":
+            self._send(200, render_layout(parts[0], parts[1], query))
+        elif len(parts) == 3 and parts[0] == "api" and parts[2] == "tenants":
+            tenants = centre_tenants(parts[1])
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(len(tenants))])[0])
+            items = tenants[offset:offset + limit]
+            self._send(200, json.dumps({"items": items, "has_more": offset + limit < len(tenants)}),
+                       "application/json")
+        elif len(parts) == 3 and parts[0] == "tenant":
+            tenant = next((t for t in TENANTS if t["slug"] == parts[2]), None)
+            if tenant is None:
+                self._send(404, page("Not found", "<h1>Not found</h1>"))
+            else:
+                self._send(200, page(f'{tenant["name"]} - {centre_name(parts[1])}',
+                                     f'<main><h1>{escape(tenant["name"])}</h1>'
+                                     f'<p>{escape(tenant["category"])}, {escape(tenant["unit"])}</p></main>'))
+        else:
+            self._send(404, page("Not found", "<h1>Not found</h1>"))
+
+
+class FixtureServer:
+    """
+    Threaded fixture server running in the background.
+    `requests` counts hits per top-level path segment (static, js, api, ...).
+    """
+
+    def __init__(self, port: int = 0, delay_ms: float = 0.0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.delay = delay_ms / 1000
+        self.httpd.requests = Counter()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> Counter:
+        return self.httpd.requests
+
+    def start(self) -> "FixtureServer":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def directory_urls(self, layout: str, centres: int) -> List[str]:
+        """Directory URLs for `centres` centres; paged layouts list every page"""
+        urls = []
+        pages = (len(TENANTS) + PAGE_SIZE - 1) // PAGE_SIZE
+        for index in range(centres):
+            centre = f"centre-{index + 1:03d}"
+            if layout == "paged":
+                urls.extend(f"{self.base_url}/paged/{centre}/stores?page={n}" for n in range(1, pages + 1))
+            else:
+                urls.append(f"{self.base_url}/{layout}/{centre}/stores")
+        return urls
+
+    def expected_tenants(self, url: str) -> int:
+        """Tenants a directory URL exposes without scrolling"""
+        parsed = urlparse(url)
+        layout = parsed.path.strip("/").split("/")[0]
+        if layout == "scroll":
+            return min(SCROLL_BATCH, len(TENANTS))
+        if layout == "paged":
+            number = int(parse_qs(parsed.query).get("page", ["1"])[0])
+            return len(TENANTS[(number - 1) * PAGE_SIZE:number * PAGE_SIZE])
+        return len(TENANTS)
+
+def main():
+    port = 8765
+    delay_ms = 0.0
+    args = sys.argv[1:]
+    if "--port" in args:
+        port = int(args[args.index("--port") + 1])
+    if "--delay-ms" in args:
+        delay_ms = float(args[args.index("--delay-ms") + 1])
+
+    server = FixtureServer(port, delay_ms)
+    print(f"🏬 Serving {len(TENANTS)} tenants at {server.base_url}")
+    for layout in LAYOUTS:
+        print(f"   {server.base_url}/{layout}/centre-001/stores")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Crawl throughput/latency benchmarks against the local fixture server
+Runs crawl_batch, crawl_with_extraction and (with --with-llm) the tenant
+extractors over the fixture directory pages and reports pages/sec,
+p50/p95/p99 page latency, peak RSS and peak browser count per scenario.
+Results are written as JSON so runs can be compared between commits.
+
+Usage:
+    python run_benchmarks.py [--centres 5] [--max-concurrent 5] [--delay-ms 20]
+                             [--only crawl_batch,crawl_with_extraction]
+                             [--output benchmark_results.json] [--compare baseline.json]
+                             [--with-llm]
+
+--with-llm also runs smart_tenant_extraction and playwright_openai_scraper,
+which call OpenAI (needs OPENAI_API_KEY and costs tokens).
+--compare exits non-zero when a scenario regresses by more than 10%.
+"""
+
+import asyncio
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).parent
+REPO_ROOT = BENCH_DIR.parent.parent.parent
+sys.path.insert(0, str(BENCH_DIR.parent.parent / "scripts"))
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+try:
+    import psutil  # Installed with crawl4ai
+except ImportError:
+    psutil = None
+
+from fixture_server import FIXTURES_DIR, LAYOUTS, FixtureServer
+
+REGRESSION_THRESHOLD = 0.10
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell", "firefox", "webkit")
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, None for an empty sample"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "samples": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
+
+
+class ResourceSampler:
+    """
+    Polls RSS of this process plus all descendants (browsers, drivers) and the
+    number of browser main processes. Without psutil only this process's
+    peak RSS is known and the browser count is reported as None.
+    """
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_browsers: Optional[int] = 0 if psutil else None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    def _sample(self):
+        root = psutil.Process()
+        rss = 0
+        browsers = 0
+        for proc in [root] + root.children(recursive=True):
+            try:
+                rss += proc.memory_info().rss
+                name = proc.name().lower()
+                # Renderer/GPU/utility helpers carry --type=; the main process does not
+                if any(b in name for b in BROWSER_PROCESS_NAMES) and not any(
+                    arg.startswith("--type=") for arg in proc.cmdline()
+                ):
+                    browsers += 1
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        self.peak_rss = max(self.peak_rss, rss)
+        self.peak_browsers = max(self.peak_browsers, browsers)
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if psutil is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if psutil is not None:
+            self._stop.set()
+            self._thread.join()
+        else:
+            # ru_maxrss is in KiB on Linux, bytes on macOS
+            scale = 1 if sys.platform == "darwin" else 1024
+            self.peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+    @property
+    def peak_rss_mb(self) -> float:
+        return round(self.peak_rss / 1_000_000, 1)
+
+
+async def run_scenario(name: str, server: FixtureServer, pages: int,
+                       body: Callable[[], Any]) -> Dict[str, Any]:
+    """Time body() and collect its latencies/counters into one scenario record"""
+    from browser_pool import close_pool
+
+    print(f"\n⏱️  {name}: {pages} pages")
+    server.requests.clear()
+    with ResourceSampler() as sampler:
+        started = time.perf_counter()
+        try:
+            details = await body()
+        finally:
+            await close_pool()  # Every scenario starts from a cold pool
+        wall = time.perf_counter() - started
+
+    latencies = details.pop("latencies_ms", [])
+    record = {
+        "pages": pages,
+        "wall_seconds": round(wall, 2),
+        "pages_per_sec": round(pages / wall, 2) if wall else None,
+        "latency_ms": latency_summary(latencies),
+        "peak_rss_mb": sampler.peak_rss_mb,
+        "peak_browsers": sampler.peak_browsers,
+        "server_requests": dict(server.requests),
+        **details,
+    }
+    print(f"   {record['pages_per_sec']} pages/sec, p95 {record['latency_ms']['p95']} ms, "
+          f"peak RSS {record['peak_rss_mb']} MB, browsers {record['peak_browsers']}")
+    return record
+
+
+def fixture_urls(server: FixtureServer, centres: int) -> List[str]:
+    return [url for layout in LAYOUTS for url in server.directory_urls(layout, centres)]
+
+
+async def bench_crawl_batch(server: FixtureServer, urls: List[str], max_concurrent: int,
+                            http_first: bool) -> Dict[str, Any]:
+    from batch_crawler import crawl_batch
+
+    ndjson_path = "bench_batch.ndjson"
+    # One local origin: lift the politeness limits so the crawler itself is measured
+    output = await crawl_batch(
+        urls,
+        max_concurrent=max_concurrent,
+        stream=True,
+        ndjson_path=ndjson_path,
+        per_host=max_concurrent,
+        host_delay=0.0,
+        respect_robots=False,
+        max_retries=0,
+        http_first=http_first,
+        cache_dir=None,
+    )
+    with open(ndjson_path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return {
+        "success": output["success_count"],
+        "failed": output["failed_count"],
+        "latencies_ms": [r["elapsed_ms"] for r in records if "elapsed_ms" in r],
+    }
+
+
+async def bench_crawl_with_extraction(server: FixtureServer, urls: List[str],
+                                      max_concurrent: int) -> Dict[str, Any]:
+    from batch_crawler import crawl_with_extraction
+
+    extracted = await crawl_with_extraction(urls, str(FIXTURES_DIR / "directory_schema.json"),
+                                            max_concurrent)
+    items = sum(len(entry["data"]) for entry in extracted if isinstance(entry["data"], list))
+    expected = sum(server.expected_tenants(url) for url in urls)
+    return {
+        "success": len(extracted),
+        "items_extracted": items,
+        "items_expected": expected,
+        "recall": round(items / expected, 3) if expected else None,
+        "latencies_ms": [entry["elapsed_ms"] for entry in extracted if "elapsed_ms" in entry],
+    }
+
+
+async def bench_tenant_extractor(server: FixtureServer, urls: List[str],
+                                 extract: Callable[[str], Any]) -> Dict[str, Any]:
+    """Run an LLM tenant extractor page by page (the extractors are single-URL)"""
+    latencies = []
+    items = 0
+    for url in urls:
+        started = time.perf_counter()
+        tenants = await extract(url)
+        latencies.append((time.perf_counter() - started) * 1000)
+        items += len(tenants or [])
+    expected = sum(server.expected_tenants(url) for url in urls)
+    return {
+        "items_extracted": items,
+        "items_expected": expected,
+        "recall": round(items / expected, 3) if expected else None,
+        "latencies_ms": latencies,
+    }
+
+
+async def run_benchmarks(server: FixtureServer, centres: int, max_concurrent: int,
+                         only: Optional[List[str]], with_llm: bool) -> Dict[str, Any]:
+    urls = fixture_urls(server, centres)
+    # One directory URL per layout is plenty for the (slow, paid) LLM extractors
+    llm_urls = [server.directory_urls(layout, 1)[0] for layout in LAYOUTS]
+
+    scenarios = {
+        "crawl_batch": (len(urls), lambda: bench_crawl_batch(server, urls, max_concurrent, True)),
+        "crawl_batch_browser_only": (len(urls), lambda: bench_crawl_batch(server, urls, max_concurrent, False)),
+        "crawl_with_extraction": (len(urls), lambda: bench_crawl_with_extraction(server, urls, max_concurrent)),
+    }
+    if with_llm:
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            print("⚠️  --with-llm needs OPENAI_API_KEY; skipping tenant extractors")
+        else:
+            from smart_tenant_extraction import extract_tenants
+            from playwright_openai_scraper import scrape_stores
+            scenarios["smart_tenant_extraction"] = (len(llm_urls), lambda: bench_tenant_extractor(
+                server, llm_urls, lambda url: extract_tenants(url, api_key)))
+            scenarios["playwright_openai_scraper"] = (len(llm_urls), lambda: bench_tenant_extractor(
+                server, llm_urls, lambda url: scrape_stores(url, api_key)))
+
+    results = {}
+    for name, (pages, body) in scenarios.items():
+        if only and name not in only:
+            continue
+        results[name] = await run_scenario(name, server, pages, body)
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Print per-scenario deltas against a baseline run; returns the regressions"""
+    regressions = []
+    print(f"\n📈 Compared with {baseline.get('commit') or 'baseline'}:")
+    for name, record in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            print(f"   {name}: no baseline")
+            continue
+        checks = [
+            ("pages_per_sec", record["pages_per_sec"], before["pages_per_sec"], True),
+            ("p95_ms", record["latency_ms"]["p95"], before["latency_ms"]["p95"], False),
+            ("peak_rss_mb", record["peak_rss_mb"], before["peak_rss_mb"], False),
+        ]
+        parts = []
+        for metric, now, then, higher_is_better in checks:
+            if not now or not then:
+                continue
+            change = (now - then) / then
+            worse = -change if higher_is_better else change
+            flag = " ⚠️" if worse > REGRESSION_THRESHOLD else ""
+            parts.append(f"{metric} {then} → {now} ({change:+.0%}){flag}")
+            if flag:
+                regressions.append(f"{name}.{metric}")
+        print(f"   {name}: " + ", ".join(parts))
+    return regressions
+
+
+async def main():
+    args = sys.argv[1:]
+
+    def option(flag: str, default: str) -> str:
+        return args[args.index(flag) + 1] if flag in args else default
+
+    centres = int(option("--centres", "5"))
+    max_concurrent = int(option("--max-concurrent", "5"))
+    delay_ms = float(option("--delay-ms", "20"))
+    output_path = Path(option("--output", "benchmark_results.json")).resolve()
+    baseline_path = option("--compare", None)
+    only = option("--only", None)
+    only = only.split(",") if only else None
+    with_llm = "--with-llm" in args
+
+    baseline = None
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+    with FixtureServer(delay_ms=delay_ms) as server:
+        print(f"🏬 Fixture server at {server.base_url} ({delay_ms:g} ms per response)")
+        # Crawl outputs (markdown, NDJSON, extracted JSON) go to a scratch directory
+        workdir = tempfile.mkdtemp(prefix="crawl_bench_")
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            scenarios = await run_benchmarks(server, centres, max_concurrent, only, with_llm)
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {"centres": centres, "max_concurrent": max_concurrent, "delay_ms": delay_ms},
+        "scenarios": scenarios,
+    }
+    try:
+        from crawl4ai.__version__ import __version__
+        report["crawl4ai"] = __version__
+    except ImportError:
+        pass
+
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Benchmark results saved to: {output_path}")
+
+    if baseline is not None:
+        regressions = compare(report, baseline)
+        if regressions:
+            print(f"❌ Regressions beyond {REGRESSION_THRESHOLD:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -25,7 +25,22 @@ def main():
         "test_basic_crawling.py",
         "test_markdown_generation.py",
         "test_data_extraction.py",
-        "test_advanced_patterns.py"
+        "test_advanced_patterns.py",
+        "test_crawl_frontier.py",
+        "test_host_scheduler.py",
+        "test_retry_policy.py",
+        "test_http_fetch.py",
+        "test_crawl_cache.py",
+        "test_crawl_profiles.py",
+        "test_sitemaps.py",
+        "test_directory_classifier.py",
+        "test_discovery_cache.py",
+        "test_directory_chunks.py",
+        "test_tenant_names.py",
+        "test_page_loader.py",
+        "test_directory_region.py",
+        "test_schema_registry.py",
+        "test_tenant_taxonomy.py"
     ]
 
     results = {}
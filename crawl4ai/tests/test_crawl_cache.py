@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed crawl cache used by batch_crawler.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from crawl_cache import CrawlCache, normalize_url
+
+def test_normalize_url():
+    """Test that equivalent URLs share one cache key"""
+    print("Testing URL normalisation...")
+
+    assert normalize_url("HTTPS://Centre.Example:443/Stores/?utm_source=x&b=2&a=1#top") == \
+        "https://centre.example/Stores?a=1&b=2"
+    assert normalize_url("http://centre.example") == "http://centre.example/"
+    assert normalize_url("http://centre.example:8080/") == "http://centre.example:8080/"
+
+    print("✅ URL normalisation works")
+
+def test_store_and_revalidate():
+    """Test storing a render and reusing it after a 304"""
+    print("\nTesting cache store and reuse...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = CrawlCache(tmp)
+        assert cache.get("https://centre.example/stores") is None
+
+        summary = {"url": "https://centre.example/stores", "title": "Stores"}
+        cache.put("https://centre.example/stores/", "<html>same</html>", "# Stores", summary,
+                  headers={"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"})
+        # A second URL with identical content shares the blobs
+        cache.put("https://mirror.example/stores", "<html>same</html>", "# Stores", summary)
+
+        entry = cache.get("https://centre.example/stores")
+        assert CrawlCache.conditional_headers(entry) == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        }
+        assert CrawlCache.conditional_headers(cache.get("https://mirror.example/stores")) == {}
+
+        render = cache.load_render(entry)
+        assert render["markdown"] == "# Stores"
+        assert render["html"] == "<html>same</html>"
+        assert render["summary"] == summary
+        assert len(list(Path(tmp, "blobs").rglob("*.gz"))) == 2, "Identical content should be stored once"
+        cache.close()
+
+    print("✅ Cache store and reuse works")
+
+if __name__ == "__main__":
+    test_normalize_url()
+    test_store_and_revalidate()
+    print("\n✅ All crawl cache tests passed!")
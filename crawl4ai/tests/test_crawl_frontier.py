@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test the disk-backed crawl frontier used by batch_crawler.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from crawl_frontier import CrawlFrontier, PENDING, IN_FLIGHT, DONE, FAILED
+
+def test_resume_skips_completed():
+    """Test that completed URLs survive a crash and are skipped on resume"""
+    print("Testing frontier resume...")
+
+    urls = ["https://a.example", "https://b.example", "https://c.example"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "frontier.sqlite")
+
+        frontier = CrawlFrontier(path)
+        frontier.add(urls)
+        frontier.mark_in_flight(urls)
+        frontier.mark_done(urls[0], {"url": urls[0]})
+        frontier.mark_failed(urls[1], {"url": urls[1], "error": "timeout"})
+        # Simulate a crash: urls[2] is left in flight
+        frontier.close()
+
+        frontier = CrawlFrontier(path)
+        assert frontier.recover() == 1, "In-flight URL should be requeued"
+        frontier.add(urls)  # Re-adding keeps existing state
+
+        counts = frontier.counts()
+        assert counts == {PENDING: 1, IN_FLIGHT: 0, DONE: 1, FAILED: 1}, counts
+        assert frontier.pending() == [urls[2]]
+        assert frontier.pending(include_failed=True) == [urls[1], urls[2]]
+        assert frontier.results() == [{"url": urls[0]}]
+        assert frontier.position(urls[2]) == 2
+        frontier.close()
+
+        print("✅ Frontier resume works")
+
+if __name__ == "__main__":
+    test_resume_skips_completed()
+    print("\n✅ All crawl frontier tests passed!")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test the text-only resource blocking profile shared by the crawl scripts
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from crawl_profiles import ResourceBlocker, merge_resource_stats
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = FakeRequest(url, resource_type)
+        self.outcome = None
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+async def test_text_only_profile():
+    """Test that images, fonts, media and trackers are aborted and counted"""
+    print("Testing text-only profile...")
+
+    assert ResourceBlocker.from_profile("full") is None
+    blocker = ResourceBlocker.from_profile("text-only")
+
+    routes = [
+        FakeRoute("https://centre.example/stores", "document"),
+        FakeRoute("https://centre.example/app.js", "script"),
+        FakeRoute("https://centre.example/hero.jpg", "image"),
+        FakeRoute("https://centre.example/font.woff2", "font"),
+        FakeRoute("https://www.googletagmanager.com/gtm.js?id=GTM-X", "script"),
+    ]
+    for route in routes:
+        await blocker._route(route)
+
+    assert [r.outcome for r in routes] == ["continued", "continued", "aborted", "aborted", "aborted"]
+    stats = blocker.stats()
+    assert stats["requests_allowed"] == 2
+    assert stats["requests_blocked"] == 3
+    assert stats["blocked_by_type"] == {"image": 1, "font": 1, "tracker": 1}
+    assert stats["estimated_bytes_saved"] > 0
+
+    print(f"✅ Text-only profile works: {blocker.summary()}")
+
+def test_merge_resource_stats():
+    """Test that sharded workers' stats add up to one summary"""
+    print("\nTesting merged resource stats...")
+
+    a = {"profile": "text-only", "requests_allowed": 10, "requests_blocked": 4,
+         "blocked_by_type": {"image": 3, "font": 1}, "estimated_bytes_saved": 215_000}
+    b = {"profile": "text-only", "requests_allowed": 5, "requests_blocked": 2,
+         "blocked_by_type": {"image": 1, "tracker": 1}, "estimated_bytes_saved": 100_000}
+    merged = merge_resource_stats([a, None, b])  # A worker that crashed reports nothing
+    assert merged == {"profile": "text-only", "requests_allowed": 15, "requests_blocked": 6,
+                      "blocked_by_type": {"image": 4, "font": 1, "tracker": 1},
+                      "estimated_bytes_saved": 315_000}, merged
+    assert merge_resource_stats([None]) is None
+
+    print("✅ Merged resource stats work")
+
+if __name__ == "__main__":
+    asyncio.run(test_text_only_profile())
+    test_merge_resource_stats()
+    print("\n✅ All crawl profile tests passed!")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test DOM-aligned chunking of large directories and the chunked extraction merge
+"""
+import asyncio
+import string
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from directory_chunks import TenantMerge, extract_chunks, merge_tenants, split_directory
+
+def a_to_z_directory(per_letter: int = 10) -> tuple[str, list[str]]:
+    """A 260-tenant directory in A-Z sections of cards"""
+    names, sections = [], []
+    for letter in string.ascii_uppercase:
+        cards = []
+        for i in range(per_letter):
+            name = f"{letter}-Store {i:02d}"
+            names.append(name)
+            cards.append(f'<li class="card"><a href="/stores/{letter.lower()}{i}">{name}</a>'
+                         f'<span>Fashion</span><span>Unit {letter}{i}</span></li>')
+        sections.append(f'<h2>{letter}</h2><ul>{"".join(cards)}</ul>')
+    html = (f'<html><head><script>var x = "<li>not a tenant</li>";</script></head><body>'
+            f'<nav><a href="/">Home</a></nav><main>{"".join(sections)}</main></body></html>')
+    return html, names
+
+def test_dom_aligned_chunks():
+    """Test that chunks are bounded, cover every tenant once and split on element boundaries"""
+    print("Testing DOM-aligned chunking...")
+
+    html, names = a_to_z_directory()
+    chunks = split_directory(html, base_url="https://centre.example/stores", max_chars=2000)
+    assert len(chunks) > 5
+    assert all(len(chunk) <= 2000 for chunk in chunks)
+
+    # Every tenant line lands in exactly one chunk, with its absolute link
+    for name in names:
+        assert sum(name in chunk for chunk in chunks) == 1, name
+    assert "(https://centre.example/stores/a0)" in chunks[0]
+    assert "not a tenant" not in "".join(chunks)
+
+    # Chunks after the first open on an A-Z heading, not mid-section
+    for chunk in chunks[1:]:
+        assert len(chunk.splitlines()[0]) == 1, chunk.splitlines()[0]
+
+    # Small pages are a single chunk
+    assert len(split_directory("<ul><li>Boots</li><li>Next</li></ul>")) == 1
+
+    print("✅ DOM-aligned chunking works")
+
+def test_concurrent_extraction_and_merge():
+    """Test bounded concurrency, failed chunks and name-normalised dedupe"""
+    print("\nTesting concurrent chunk extraction and merge...")
+
+    in_flight = 0
+    peak = 0
+
+    async def extract(chunk):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if chunk == "bad":
+            raise ValueError("LLM returned invalid JSON")
+        return [{"name": line} for line in chunk.splitlines()]
+
+    chunks = ["Next\nMarks & Spencer", "bad", "MARKS AND SPENCER.\nH&M", "H & M\nBoots"]
+    results = asyncio.run(extract_chunks(chunks, extract, concurrency=2))
+    assert peak == 2
+    assert isinstance(results[1], ValueError)
+
+    tenants = merge_tenants(r for r in results if not isinstance(r, Exception))
+    assert [t["name"] for t in tenants] == ["Next", "Marks & Spencer", "H&M", "Boots"]
+
+    merged = merge_tenants([[{"name": "Costa", "url": None}], [{"name": "COSTA", "url": "/costa"}]])
+    assert merged == [{"name": "Costa", "url": "/costa"}]
+
+    # Streaming merge as store/dining pages finish in any order
+    merge = TenantMerge()
+    assert merge.add([{"name": "Costa"}, {"name": "Nando's"}]) == 2
+    assert merge.add([{"name": "Nandos", "tenant_type": "food_beverage"}, {"name": "Boots"}]) == 1
+    assert len(merge) == 3 and merge.tenants[1]["tenant_type"] == "food_beverage"
+    assert merge.add([{"name": "M&S"}, {"name": "Marks and Spencer Foodhall"}]) == 1
+
+    print("✅ Concurrent chunk extraction and merge work")
+
+if __name__ == "__main__":
+    test_dom_aligned_chunks()
+    test_concurrent_extraction_and_merge()
+    print("\n✅ All directory chunking tests passed!")
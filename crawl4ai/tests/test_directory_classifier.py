@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the local store/dining directory URL classifier used by tenant discovery
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from directory_classifier import DINING, STORE, DirectoryClassifier
+
+SITE_URLS = [
+    "https://centre.example/",
+    "https://centre.example/stores",
+    "https://centre.example/stores/next",
+    "https://centre.example/stores/costa-coffee",
+    "https://centre.example/food-drink",
+    "https://centre.example/news/new-store-opening",
+    "https://centre.example/opening-hours",
+    "https://centre.example/gift-cards",
+    "https://centre.example/files/store-guide.pdf",
+]
+
+def test_common_layouts_resolve_locally():
+    """Test that /stores and /food-drink style sites need no LLM"""
+    print("Testing local classification of common layouts...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        classifier = DirectoryClassifier(str(Path(tmp) / "weights.json"))
+        result = classifier.classify(SITE_URLS)
+        assert result.confident
+        assert result.store_url == "https://centre.example/stores"
+        assert result.dining_url == "https://centre.example/food-drink"
+
+        # Detail pages, news and documents are not directories
+        assert classifier.score("https://centre.example/stores/next", STORE) < 2
+        assert classifier.score("https://centre.example/news/new-store-opening", STORE) < 2
+        assert classifier.score("https://centre.example/files/store-guide.pdf", STORE) == 0
+
+        # Anchor text lifts an unusual path into contention
+        plain = classifier.score("https://centre.example/whats-here", STORE)
+        anchored = classifier.score("https://centre.example/whats-here", STORE, "Store Directory")
+        assert anchored > plain
+
+    print("✅ Common layouts resolve locally")
+
+def test_unclear_sites_and_learning():
+    """Test that ambiguous sites defer to the LLM until the URL shape is learned"""
+    print("\nTesting low-confidence fallback and learned weights...")
+
+    urls = ["https://centre.example/", "https://centre.example/whats-in-store", "https://centre.example/visit"]
+    with tempfile.TemporaryDirectory() as tmp:
+        weights_path = str(Path(tmp) / "weights.json")
+        classifier = DirectoryClassifier(weights_path)
+        result = classifier.classify(urls)
+        assert not result.confident, "A lone keyword token should not skip the LLM"
+        assert result.store_url == "https://centre.example/whats-in-store"
+
+        for _ in range(5):
+            classifier.learn("https://other.example/whats-in-store/", STORE)
+        classifier.learn("https://other.example/eat-play", DINING)
+
+        # Weights persist for the next process
+        reloaded = DirectoryClassifier(weights_path)
+        assert reloaded.weights[STORE]["whats-in-store"] == 5
+        assert reloaded.classify(urls).confident
+
+        # Two processes learning at once both keep their confirmations
+        first, second = DirectoryClassifier(weights_path), DirectoryClassifier(weights_path)
+        first.learn("https://a.example/whats-in-store", STORE)
+        second.learn("https://b.example/whats-in-store", STORE)
+        second.learn("https://b.example/food-court", DINING)
+        merged = DirectoryClassifier(weights_path).weights
+        assert merged[STORE]["whats-in-store"] == 7 and merged[DINING] == {"eat-play": 1, "food-court": 1}
+        assert sorted(p.name for p in Path(tmp).iterdir()) == ["weights.json", "weights.json.lock"]
+
+    print("✅ Low-confidence fallback and learning work")
+
+if __name__ == "__main__":
+    test_common_layouts_resolve_locally()
+    test_unclear_sites_and_learning()
+    print("\n✅ All directory classifier tests passed!")
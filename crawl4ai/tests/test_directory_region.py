@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test directory region detection and the compact line-per-tenant prompt input
+"""
+import string
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from directory_chunks import split_directory
+from directory_region import MIN_CONFIDENCE, compact_directory, extract_cards, prompt_chunks
+
+CHROME = (
+    '<header class="site-header"><nav><ul>'
+    + "".join(f'<li class="menu-item"><a href="/{p}">{p.title()}</a></li>' for p in
+              ("stores", "dining", "events", "offers", "parking", "opening-hours", "contact", "jobs"))
+    + '</ul></nav></header>'
+    '<div class="cookie-banner"><p>We use cookies to improve your experience.</p><button>Accept</button></div>'
+)
+FOOTER = (
+    '<footer><ul>'
+    + "".join(f'<li><a href="/{p}">{p.title()}</a></li>' for p in ("privacy", "terms", "accessibility", "sitemap", "careers"))
+    + '</ul><p>© Centre Ltd. All rights reserved.</p></footer>'
+)
+
+def card_directory() -> tuple[str, list[str]]:
+    """A-Z directory of cards with a logo, name, category pill and unit number"""
+    names, sections = [], []
+    for letter in string.ascii_uppercase[:12]:
+        cards = []
+        for i in range(4):
+            name = f"{letter}-Brand {i}"
+            names.append(name)
+            cards.append(
+                f'<li class="store-card store-{letter}{i}"><a href="/stores/{letter.lower()}{i}">'
+                f'<img src="/logos/{i}.png" alt="{name} logo"><h3 class="store-card__name">{name}</h3></a>'
+                f'<span class="store-card__category">Fashion</span><span class="unit">Unit {letter}{i}</span></li>')
+        sections.append(f'<section class="letter"><h2>{letter}</h2><ul class="store-list">{"".join(cards)}</ul></section>')
+    html = f'<html><body>{CHROME}<main><h1>Store directory</h1>{"".join(sections)}</main>{FOOTER}</body></html>'
+    return html, names
+
+def test_compact_directory():
+    """Test that only the directory's cards are emitted, one compact line each"""
+    print("Testing directory region detection...")
+
+    html, names = card_directory()
+    lines = compact_directory(html, base_url="https://centre.example/stores")
+    assert len(lines) == len(names), lines[:5]
+    assert lines[0] == "A-Brand 0 | Fashion | https://centre.example/stores/a0", lines[0]
+    text = "\n".join(lines)
+    for chrome in ("Parking", "cookies", "Privacy", "rights reserved", "Store directory"):
+        assert chrome not in text, chrome
+
+    # Smaller than the full page text, which also carries the logo alts and unit numbers
+    assert len(text) < len("\n".join(split_directory(html, "https://centre.example/stores"))) * 0.8
+
+    # Logo grids: the alt text is the name
+    logos = "".join(f'<a class="logo" href="/s/{i}"><img alt="Brand {i}"></a>' for i in range(8))
+    lines = compact_directory(f"<body><div class='grid'>{logos}</div></body>")
+    assert lines[3] == "Brand 3 | - | /s/3", lines[3]
+
+    print("✅ Directory region detection works")
+
+def test_prompt_chunks_fallback():
+    """Test compact chunking limits and the full-page fallback"""
+    print("\nTesting prompt chunks...")
+
+    html, names = card_directory()
+    chunks, compact = prompt_chunks(html, "https://centre.example/stores")
+    assert compact and len(chunks) == 1
+    chunks, compact = prompt_chunks(html * 3, "https://centre.example/stores")
+    assert compact and all(len(chunk.splitlines()) <= 80 for chunk in chunks)
+
+    # An article page, or a short list beside lots of other text, is not a directory
+    article = "<body><main>" + "".join(f"<p>Paragraph {i} " + "words " * 60 + "</p>" for i in range(6)) + "</main></body>"
+    chunks, compact = prompt_chunks(article)
+    assert not compact and "Paragraph 5" in chunks[0]
+    featured = ("<body><main>" + "<p>" + "Opening times and news. " * 200 + "</p><ul>"
+                + "".join(f'<li><a href="/s/{i}">Brand {i}</a></li>' for i in range(5)) + "</ul></main></body>")
+    assert compact_directory(featured) == []
+
+    print("✅ Prompt chunks work")
+
+def test_local_extraction():
+    """Test schema-free extraction from repeated cards, and low confidence on irregular pages"""
+    print("\nTesting local card extraction...")
+
+    html, names = card_directory()
+    local = extract_cards(html, base_url="https://centre.example/stores")
+    assert local.confident and local.cards == len(names)
+    assert [t["name"] for t in local.tenants] == names
+    assert local.tenants[5] == {"name": "B-Brand 1", "category": "Fashion",
+                                "url": "https://centre.example/stores/b1"}, local.tenants[5]
+
+    # Unclassed tiles: the name is the distinct field, the category the repeated one,
+    # and neither is the unit number or the "View store" link
+    categories = ["Fashion", "Food & Drink", "Health & Beauty"]
+    brands = ["Primark", "Costa Coffee", "Boots", "Next", "Greggs", "Superdrug", "River Island", "Nando's",
+              "The Body Shop", "New Look", "Subway", "Savers"]
+    tiles = "".join(
+        f'<div class="tile"><div><p>{brand}</p><p>{categories[i % 3]}</p><p>Unit {i + 1}</p></div>'
+        f'<a href="/brand/{i}">View store</a></div>' for i, brand in enumerate(brands))
+    local = extract_cards(f"<body>{CHROME}<main>{tiles}</main></body>", "https://centre.example")
+    assert local.confident, local.confidence
+    assert [t["name"] for t in local.tenants] == brands
+    assert local.tenants[1]["category"] == "Food & Drink" and local.tenants[1]["url"] == "https://centre.example/brand/1"
+
+    # Cards whose only text is generic or detail text leave the LLM to it
+    vague = "".join(f'<li class="c"><a href="/x/{i}">View details</a><span>Unit {i}</span></li>' for i in range(12))
+    local = extract_cards(f"<body><ul>{vague}</ul></body>")
+    assert not local.confident, local
+
+    # News and event listings are linked, regular cards too, but their "names" are headlines
+    headlines = ["Christmas event at the centre this weekend", "Santa arrives on Saturday",
+                 "Half term fun for all the family", "New store opening: Primark", "Win a £100 gift card",
+                 "Late night shopping returns", "Easter egg hunt", "Free parking this December",
+                 "Summer of sport", "Blood donation session", "Charity bake sale", "Meet the Gruffalo"]
+    posts = "".join(f'<article class="post"><h2><a href="/news/{i}">{title}</a></h2><p>Posted {i + 1} Dec 2024</p>'
+                    f'</article>' for i, title in enumerate(headlines))
+    local = extract_cards(f"<body>{CHROME}<main>{posts}</main></body>", "https://centre.example")
+    assert not local.confident, local.confidence
+
+    # No directory region at all
+    assert not extract_cards("<body><p>Welcome to the centre.</p></body>").confident
+    assert 0 < MIN_CONFIDENCE < 1
+
+    print("✅ Local card extraction works")
+
+if __name__ == "__main__":
+    test_compact_directory()
+    test_prompt_chunks_fallback()
+    test_local_extraction()
+    print("\n✅ All directory region tests passed!")
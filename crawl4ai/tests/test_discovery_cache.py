@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test the per-domain discovery result cache and its HEAD revalidation
+"""
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from discovery_cache import DiscoveryCache, domain_key
+
+RESULT = {
+    "website": "https://www.centre.example",
+    "store_directory_url": "https://www.centre.example/stores",
+    "dining_directory_url": "https://www.centre.example/food-drink",
+    "all_relevant_urls": [],
+    "confidence": "high",
+    "method": "sitemap",
+}
+
+def test_domain_keys():
+    """Test that www., scheme, path and default ports share one key"""
+    print("Testing domain keys...")
+
+    assert domain_key("https://www.Centre.example/") == "centre.example"
+    assert domain_key("http://centre.example:80/stores") == "centre.example"
+    assert domain_key("centre.example") == "centre.example"
+    assert domain_key("https://centre.example:8443") == "centre.example:8443"
+
+    print("✅ Domain keys work")
+
+def test_lookup_and_validation():
+    """Test TTL expiry, HEAD validation and invalidation of moved directories"""
+    print("\nTesting cached lookups...")
+
+    statuses = {}
+    heads = []
+
+    async def head(url):
+        heads.append(url)
+        return statuses.get(url, 200)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiscoveryCache(str(Path(tmp) / "discovery.sqlite"), ttl=3600)
+        assert asyncio.run(cache.lookup("https://centre.example", head)) is None
+        assert not cache.put({**RESULT, "store_directory_url": None}), "Failures are not cached"
+        assert cache.put(RESULT, now=1000.0)
+
+        # Within the TTL and still answering 200: reused without discovery
+        cached = asyncio.run(cache.lookup("https://centre.example/", head, now=2000.0))
+        assert cached == RESULT
+        assert heads == [RESULT["store_directory_url"], RESULT["dining_directory_url"]]
+
+        # Past the TTL the entry is not even validated
+        heads.clear()
+        assert asyncio.run(cache.lookup("https://centre.example", head, now=1000.0 + 3601)) is None
+        assert not heads
+
+        # A directory that moved fails validation and is dropped
+        statuses[RESULT["dining_directory_url"]] = 404
+        assert asyncio.run(cache.lookup("https://centre.example", head, now=2000.0)) is None
+        assert cache.get("https://centre.example", now=2000.0) is None
+
+        # --refresh records results but never serves them
+        cache.put(RESULT)
+        refreshing = DiscoveryCache(cache.path, refresh=True)
+        assert asyncio.run(refreshing.lookup("https://centre.example")) is None
+        assert cache.stats == {"hits": 1, "misses": 1, "expired": 1, "invalid": 1, "stored": 2}
+        refreshing.close()
+        cache.close()
+
+    print("✅ Cached lookups and validation work")
+
+if __name__ == "__main__":
+    test_domain_keys()
+    test_lookup_and_validation()
+    print("\n✅ All discovery cache tests passed!")
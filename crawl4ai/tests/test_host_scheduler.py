@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the per-host politeness scheduler used by batch_crawler.py
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from host_scheduler import HostScheduler, parse_retry_after
+
+async def test_per_host_limits():
+    """Test per-host caps, round-robin interleaving and robots Crawl-delay"""
+    print("Testing per-host scheduling...")
+
+    async def fake_robots(host, user_agent):
+        return 0.2 if "slow" in host else None
+
+    scheduler = HostScheduler(max_concurrent=3, per_host=1, min_delay=0.01,
+                              robots_fetcher=fake_robots)
+    scheduler.add([f"https://big.example/{i}" for i in range(4)])
+    scheduler.add(["https://slow.example/1", "https://slow.example/2", "https://small.example/1"])
+
+    started = []
+    in_flight = {}
+
+    async def fetch(url):
+        host = url.split("/")[2]
+        in_flight[host] = in_flight.get(host, 0) + 1
+        assert in_flight[host] <= 1, f"Per-host cap exceeded for {host}"
+        started.append((time.monotonic(), url))
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+
+    await scheduler.run(fetch)
+
+    urls = [url for _, url in started]
+    assert len(urls) == 7, urls
+    # Every host gets a slot before the big host gets its second
+    first_hosts = {url.split("/")[2] for url in urls[:3]}
+    assert first_hosts == {"big.example", "slow.example", "small.example"}, urls[:3]
+    # Crawl-delay from robots.txt spaces out the slow host
+    slow_starts = [t for t, url in started if "slow" in url]
+    assert slow_starts[1] - slow_starts[0] >= 0.19, slow_starts
+
+    print("✅ Per-host scheduling works")
+
+async def test_fetch_errors_returned():
+    """Test that a fetch raising doesn't lose its URL or stop the run"""
+    print("\nTesting fetch errors...")
+
+    scheduler = HostScheduler(max_concurrent=2, per_host=2, min_delay=0, respect_robots=False)
+    scheduler.add([f"https://centre.example/{i}" for i in range(5)])
+    done = []
+
+    async def fetch(url):
+        if url.endswith(("/1", "/3")):
+            raise RuntimeError(f"sink write failed for {url}")
+        done.append(url)
+
+    errors = await scheduler.run(fetch)
+    assert len(done) == 3
+    assert sorted(url for url, _ in errors) == ["https://centre.example/1", "https://centre.example/3"]
+    assert all(isinstance(e, RuntimeError) for _, e in errors)
+
+    print("✅ Fetch errors are returned")
+
+def test_parse_retry_after():
+    """Test Retry-After parsing"""
+    print("\nTesting Retry-After parsing...")
+
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+    print("✅ Retry-After parsing works")
+
+async def main():
+    await test_per_host_limits()
+    await test_fetch_errors_returned()
+    test_parse_retry_after()
+
+if __name__ == "__main__":
+    asyncio.run(main())
+    print("\n✅ All host scheduler tests passed!")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test the HTTP-first content check used by batch_crawler.py and basic_crawler.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from http_fetch import (FetchResult, analyse_html, default_min_store_links, is_content_complete, rebase_links,
+                        with_base_href)
+
+STATIC_DIRECTORY = """
+<html><head><title>Our Stores</title><meta name="description" content="All shops"></head>
+<body>
+  <a href="/stores/boots">Boots</a><a href="/stores/next">Next</a><a href="/dining/costa">Costa</a>
+  <p>{text}</p>
+  <script>window.tracking = "not visible text";</script>
+</body></html>
+""".format(text="Opening hours and centre information. " * 30)
+
+THEMED_DIRECTORY = """
+<html><head><title>Store Directory</title></head>
+<body><nav><a href="/">Home</a><a href="/visit">Visit</a></nav><p>{text}</p><div class="store-grid"></div>
+<script src="/wp-content/themes/centre/js/stores.js"></script></body></html>
+""".format(text="Plan your visit, parking, opening hours and gift cards. " * 20)
+
+APP_SHELL = """
+<html><head><title>Centre</title></head>
+<body><div id="root"></div><noscript>You need to enable JavaScript to run this app.</noscript></body></html>
+"""
+
+def test_static_page_is_complete():
+    """Test that server-rendered directory HTML needs no browser"""
+    print("Testing static page detection...")
+
+    page = FetchResult(url="https://centre.example/stores", status_code=200, html=STATIC_DIRECTORY)
+    analyse_html(page)
+
+    assert page.title == "Our Stores"
+    assert page.description == "All shops"
+    assert page.links_count == 3 and page.store_links_count == 3
+    assert is_content_complete(page, min_store_links=3)
+    assert not is_content_complete(page, min_store_links=10)
+
+    print("✅ Static page detection works")
+
+def test_app_shell_escalates():
+    """Test that JS app shells and error responses escalate to the browser"""
+    print("\nTesting browser escalation...")
+
+    shell = FetchResult(url="https://centre.example/", status_code=200, html=APP_SHELL)
+    analyse_html(shell)
+    assert not is_content_complete(shell)
+
+    blocked = FetchResult(url="https://centre.example/", status_code=403, html=STATIC_DIRECTORY)
+    analyse_html(blocked)
+    assert not is_content_complete(blocked)
+
+    # A theme page whose store list is injected by JS: plenty of text, but on a
+    # directory URL it also needs store links
+    themed = FetchResult(url="https://centre.example/store-directory/", status_code=200, html=THEMED_DIRECTORY)
+    analyse_html(themed)
+    assert is_content_complete(themed)
+    assert not is_content_complete(themed, min_store_links=default_min_store_links(themed.url))
+    assert default_min_store_links("https://centre.example/stores") > 0
+    assert default_min_store_links("https://centre.example/dining/") > 0
+    assert default_min_store_links("https://centre.example/stores/boots") == 0
+    assert default_min_store_links("https://centre.example/about-us") == 0
+
+    print("✅ Browser escalation works")
+
+def test_raw_render_base_url():
+    """Test that raw:// renders of fetched HTML keep the page URL as their base"""
+    print("\nTesting raw render base URL...")
+
+    url = "https://www.centre.example/stores?a=1&b=2"
+    html = with_base_href(STATIC_DIRECTORY, url)
+    assert '<head><base href="https://www.centre.example/stores?a=1&amp;b=2"><title>' in html
+    assert with_base_href(html, "https://other.example/") == html  # A page's own <base> wins
+    assert with_base_href("<p>x</p>", url).startswith("<head><base href=")
+    assert with_base_href("<html lang='en'><body></body></html>", url).startswith("<html lang='en'><head><base")
+
+    # crawl4ai files every link under "external" against the raw:// pseudo-URL
+    links = {"internal": [], "external": [
+        {"href": "https://www.centre.example/stores/boots", "text": "Boots"},
+        {"href": "/dining/costa", "text": "Costa"},
+        {"href": "https://shop.centre.example/gift-cards", "text": "Gift cards"},
+        {"href": "https://www.facebook.com/centre", "text": "Facebook"},
+        {"href": "https://www.centre.example/stores/boots", "text": "Boots"},
+    ]}
+    rebased = rebase_links(links, url)
+    assert [l["href"] for l in rebased["internal"]] == [
+        "https://www.centre.example/stores/boots", "https://www.centre.example/dining/costa",
+        "https://shop.centre.example/gift-cards"]
+    assert [l["href"] for l in rebased["external"]] == ["https://www.facebook.com/centre"]
+
+    print("✅ Raw render base URL works")
+
+if __name__ == "__main__":
+    test_static_page_is_complete()
+    test_app_shell_escalates()
+    test_raw_render_base_url()
+    print("\n✅ All HTTP fetch tests passed!")
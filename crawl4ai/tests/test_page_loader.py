@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test the event-driven directory loader's scroll / load-more / pagination logic
+against a scripted stand-in for a Playwright page
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import page_loader
+from page_loader import CARD_COUNT_JS, CARD_EDGES_JS, FIND_CONTROL_JS, MUTATION_AGE_JS, load_directory
+
+page_loader.QUIET_MS = 0  # The scripted page is always settled
+
+class ScriptedPage:
+    """
+    Directory of `total` cards: `scroll_batch` more appear per scroll up to
+    `scroll_limit`, then a "Load more" button adds `more_batch` at a time;
+    `pages` > 1 splits the cards across ?page=N links instead (or across
+    clicks of a script-driven Next button with `next_clicks`). With
+    `carousel_slides`, a "Next" button that the control search can't tell
+    from pagination cycles a hero carousel and leaves the cards alone.
+    """
+
+    def __init__(self, total, scroll_batch=0, scroll_limit=0, more_batch=0, pages=1,
+                 next_clicks=False, carousel_slides=0):
+        self.total, self.scroll_batch, self.scroll_limit = total, scroll_batch, scroll_limit
+        self.more_batch, self.pages = more_batch, pages
+        self.next_clicks, self.carousel_slides = next_clicks, carousel_slides
+        self.url = ""
+        self.number = 1
+        self.slide = 0
+        self.shown = 0
+        self.goto_urls = []
+
+    def on(self, event, handler):
+        pass
+
+    async def add_init_script(self, script):
+        pass
+
+    async def goto(self, url, **kwargs):
+        self.goto_urls.append(url)
+        self.url = url
+        self.number = int(url.split("page=")[1]) if "page=" in url else 1
+        per_page = self.total // self.pages
+        self.shown = per_page if self.pages > 1 else min(self.total, self.scroll_batch or self.total)
+
+    async def evaluate(self, script, arg=None):
+        if script == MUTATION_AGE_JS:
+            return 1e9
+        if script == CARD_COUNT_JS:
+            return self.shown
+        if script == CARD_EDGES_JS:
+            first = (self.number - 1) * (self.total // self.pages)
+            return [self.shown, f"Brand {first}", f"Brand {first + self.shown - 1}"]
+        if script == FIND_CONTROL_JS:
+            if arg == "more" and self.more_batch and self.shown < self.total:
+                return {"href": None}
+            if arg == "next" and self.carousel_slides:
+                return {"href": None}
+            if arg == "next" and self.number < self.pages:
+                return {"href": None if self.next_clicks else f"https://centre.example/stores?page={self.number + 1}"}
+            return None
+        if "scrollTo" in script:
+            if self.scroll_batch and self.shown < self.scroll_limit:
+                self.shown = min(self.scroll_limit, self.shown + self.scroll_batch)
+            return None
+        if "innerHTML" in script:
+            return f"<div>slide {self.slide}</div><ul>page {self.number}: {self.shown} cards</ul>"
+        raise AssertionError(f"Unexpected script: {script[:40]}")
+
+    async def click(self, selector, **kwargs):
+        if selector == '[data-page-loader="next"]':
+            if self.carousel_slides:
+                self.slide = (self.slide + 1) % self.carousel_slides
+            else:
+                self.number += 1
+            return
+        assert selector == '[data-page-loader="more"]'
+        self.shown = min(self.total, self.shown + self.more_batch)
+
+    async def content(self):
+        return f"<html><body>{self.shown} cards</body></html>"
+
+def test_scroll_and_load_more():
+    """Test that scrolling continues while cards grow, then Load more runs until exhausted"""
+    print("Testing scroll and load-more loading...")
+
+    page = ScriptedPage(total=200, scroll_batch=20, scroll_limit=100, more_batch=40)
+    result = asyncio.run(load_directory(page, "https://centre.example/stores"))
+    assert result.cards == 200, result
+    assert result.clicks == 3  # 100 -> 140 -> 180 -> 200
+    assert result.stop_reason == "complete"
+    assert result.pages == 1
+
+    # A static page stops after one unproductive scroll
+    page = ScriptedPage(total=50)
+    result = asyncio.run(load_directory(page, "https://centre.example/stores"))
+    assert result.cards == 50 and result.scrolls == 1 and result.clicks == 0
+
+    print("✅ Scroll and load-more loading works")
+
+def test_pagination():
+    """Test that Next pages are followed and combined"""
+    print("\nTesting pagination...")
+
+    page = ScriptedPage(total=90, pages=3)
+    result = asyncio.run(load_directory(page, "https://centre.example/stores"))
+    assert page.goto_urls[1:] == ["https://centre.example/stores?page=2", "https://centre.example/stores?page=3"]
+    assert result.pages == 3 and result.cards == 90
+    assert all(f"page {n}:" in result.html for n in (1, 2, 3))
+    assert result.url == "https://centre.example/stores"
+
+    # Script-driven Next buttons page the cards in place
+    page = ScriptedPage(total=90, pages=3, next_clicks=True)
+    result = asyncio.run(load_directory(page, "https://centre.example/stores"))
+    assert result.pages == 3 and result.cards == 90 and page.goto_urls == ["https://centre.example/stores"]
+
+    print("✅ Pagination works")
+
+def test_carousel_next_is_not_pagination():
+    """Test that a Next control that only cycles a carousel doesn't duplicate the directory"""
+    print("\nTesting carousel Next controls...")
+
+    page = ScriptedPage(total=60, carousel_slides=4)
+    result = asyncio.run(load_directory(page, "https://centre.example/stores"))
+    assert result.pages == 1 and result.cards == 60, result
+    assert result.clicks == 0 and result.stop_reason == "complete"
+    assert result.html.count("60 cards") == 1
+
+    print("✅ Carousel Next controls are ignored")
+
+if __name__ == "__main__":
+    test_scroll_and_load_more()
+    test_pagination()
+    test_carousel_next_is_not_pagination()
+    print("\n✅ All page loader tests passed!")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test failure classification and retry backoff used by batch_crawler.py
+"""
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from retry_policy import (
+    DNS, HTTP_4XX, HTTP_5XX, NAVIGATION, TIMEOUT,
+    backoff_delay, classify_failure, is_transient
+)
+
+def test_classify_failure():
+    """Test that crawl errors map to the right failure class"""
+    print("Testing failure classification...")
+
+    assert classify_failure("Page.goto: Timeout 30000ms exceeded.") == TIMEOUT
+    assert classify_failure("net::ERR_NAME_NOT_RESOLVED at https://x.example") == DNS
+    assert classify_failure("[Errno -3] Temporary failure in name resolution") == DNS
+    assert classify_failure("Page.goto: Timeout 30000ms exceeded navigating to https://xdns.co.uk/") == TIMEOUT
+    assert classify_failure("net::ERR_CONNECTION_RESET") == NAVIGATION
+    assert classify_failure("Failed on navigating ACS-GOTO", status_code=404) == HTTP_4XX
+    assert classify_failure(None, status_code=502) == HTTP_5XX
+    assert classify_failure(None, status_code=408) == TIMEOUT
+
+    assert is_transient(TIMEOUT) and is_transient(HTTP_5XX) and is_transient(NAVIGATION)
+    assert not is_transient(DNS) and not is_transient(HTTP_4XX)
+
+    print("✅ Failure classification works")
+
+def test_backoff_delay():
+    """Test jittered exponential backoff bounds"""
+    print("\nTesting backoff delay...")
+
+    rng = random.Random(0)
+    for attempt, ceiling in [(1, 2.0), (2, 4.0), (3, 8.0), (10, 60.0)]:
+        for _ in range(50):
+            delay = backoff_delay(attempt, base=2.0, cap=60.0, rng=rng)
+            assert ceiling / 2 <= delay <= ceiling, (attempt, delay)
+
+    print("✅ Backoff delay works")
+
+if __name__ == "__main__":
+    test_classify_failure()
+    test_backoff_delay()
+    print("\n✅ All retry policy tests passed!")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test the per-domain learned CSS schema registry: template fingerprints,
+validation, reuse without generation (across templates only at a comparable
+item count) and regeneration on item-count drops
+"""
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from schema_registry import SchemaRegistry, template_fingerprint, validate_items
+
+def directory_page(names, card_class="store-card"):
+    cards = "".join(f'<li class="{card_class} store-{i}"><a href="/s/{i}">{name}</a></li>' for i, name in enumerate(names))
+    return (f'<html><body><header class="site-header"><nav><a href="/">Home</a></nav></header>'
+            f'<main><h1>Stores</h1><ul class="directory">{cards}</ul></main><footer>©</footer></body></html>')
+
+def items(n, offset=0):
+    return [{"name": f"Store {offset + i}", "url": f"/s/{i}"} for i in range(n)]
+
+class Site:
+    """Stand-in for the crawl4ai side: schemas are dicts naming how many items they find"""
+
+    def __init__(self):
+        self.found = {}  # schema version -> items it extracts from the current page
+        self.next_schema = {"version": 1}
+        self.generated = 0
+
+    async def apply(self, schema):
+        return self.found.get(schema["version"], [])
+
+    async def generate(self):
+        self.generated += 1
+        return self.next_schema
+
+def test_fingerprints_and_validation():
+    """Test that one template shares a fingerprint whatever its tenants, and item validation"""
+    print("Testing template fingerprints and validation...")
+
+    page = directory_page(["Boots", "Next", "Primark", "Greggs"])
+    assert template_fingerprint(page) == template_fingerprint(directory_page(["Costa", "Zara", "H&M"] * 20))
+    assert template_fingerprint(page) != template_fingerprint(directory_page(["Boots"] * 4, card_class="tile"))
+
+    assert validate_items(items(10))
+    assert not validate_items(items(2))  # Too few
+    assert not validate_items([{"name": "", "url": "/x"}] * 10)  # Empty first field
+    assert not validate_items([{"name": "Home", "url": "/"}] * 10)  # One element matched over and over
+
+    print("✅ Template fingerprints and validation work")
+
+def test_registry_lifecycle():
+    """Test generate-once, CSS reuse, sibling templates, drops and shrinking directories"""
+    print("\nTesting schema registry lifecycle...")
+
+    with tempfile.TemporaryDirectory() as tmp, SchemaRegistry(str(Path(tmp) / "schemas.sqlite")) as registry:
+        site = Site()
+        page = directory_page(["Boots", "Next", "Primark"])
+        url = "https://www.centre.example/stores"
+        query = "Extract every store with its name and link"
+
+        def extract(page_html, page_url=url, q=query):
+            return asyncio.run(registry.extract(page_url, page_html, q, site.apply, site.generate))
+
+        # First contact generates and registers
+        site.found = {1: items(100)}
+        result, method = extract(page)
+        assert method == "generated" and len(result) == 100 and site.generated == 1
+
+        # Then pure CSS, for this domain under any host spelling; a different query is separate
+        result, method = extract(page, "https://centre.example/stores")
+        assert method == "css" and site.generated == 1
+        assert extract(page, q="Extract events")[1] == "generated" and site.generated == 2
+
+        # A new template on the same site tries the domain's schema before generating
+        dining = directory_page(["Costa", "Nando's"], card_class="restaurant")
+        site.found = {1: items(80)}
+        assert extract(dining, "https://centre.example/dining")[1] == "css" and site.generated == 2
+        assert registry.get(url, template_fingerprint(dining), query, exact=True).item_count == 80
+
+        # ...but only when its count is comparable: far fewer means it matched some other list
+        offers = directory_page(["Deal"] * 5, card_class="offer")
+        site.found = {1: items(6), 4: items(12)}
+        site.next_schema = {"version": 4}
+        result, method = extract(offers, "https://centre.example/offers")
+        assert method == "generated" and len(result) == 12 and site.generated == 3
+        assert registry.get(url, template_fingerprint(offers), query, exact=True).schema == {"version": 4}
+        entry = registry.get(url, template_fingerprint(page), query, exact=True)
+        assert entry.comparable(100) and entry.comparable(190)
+        assert not entry.comparable(40) and not entry.comparable(260)
+
+        # A sharp drop regenerates; the new schema replaces the old one
+        site.found = {1: items(20), 2: items(95)}
+        site.next_schema = {"version": 2}
+        result, method = extract(page)
+        assert method == "regenerated" and len(result) == 95 and site.generated == 4
+        assert registry.get(url, template_fingerprint(page), query, exact=True).schema == {"version": 2}
+
+        # A real shrink: regeneration finds no more, so the schema stays with a new baseline
+        site.found = {2: items(40), 3: items(40)}
+        site.next_schema = {"version": 3}
+        result, method = extract(page)
+        assert method == "css" and len(result) == 40 and site.generated == 5
+        entry = registry.get(url, template_fingerprint(page), query, exact=True)
+        assert entry.schema == {"version": 2} and entry.item_count == 40
+
+        # Gradual changes never count as a drop
+        site.found = {2: items(35)}
+        assert extract(page)[1] == "css" and site.generated == 5
+
+        # A schema matching nothing is dropped, even if regeneration fails
+        site.found = {}
+        site.next_schema = None
+        result, method = extract(page)
+        assert method == "failed" and result == []
+        assert registry.get(url, template_fingerprint(page), query, exact=True) is None
+
+        print(f"   {registry.summary()}")
+
+    print("✅ Schema registry lifecycle works")
+
+if __name__ == "__main__":
+    test_fingerprints_and_validation()
+    test_registry_lifecycle()
+    print("\n✅ All schema registry tests passed!")
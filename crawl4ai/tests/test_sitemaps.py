@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test the streaming sitemap parser and incremental sitemap state
+"""
+import asyncio
+import gzip
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from sitemaps import SitemapParser, SitemapState, parse_lastmod, parse_sitemap, sync_sitemaps, urllib_fetcher
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+INDEX = f"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex {NS}>
+  <sitemap><loc>https://centre.example/sitemap-pages.xml</loc><lastmod>2025-03-01</lastmod></sitemap>
+  <sitemap><loc>https://centre.example/sitemap-stores.xml.gz</loc><lastmod>2025-03-05T09:00:00Z</lastmod></sitemap>
+</sitemapindex>"""
+
+PAGES = f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset {NS}>
+  <url><loc>https://centre.example/</loc><changefreq>daily</changefreq></url>
+  <url><loc>https://centre.example/visit</loc><lastmod>2025-01-10</lastmod></url>
+</urlset>"""
+
+STORES = f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset {NS}>
+  <url><loc>https://centre.example/stores</loc><lastmod>2025-03-04T12:00:00+00:00</lastmod></url>
+  <url><loc>https://centre.example/dining</loc><lastmod>2025-02-01</lastmod></url>
+</urlset>"""
+
+def test_streaming_parser():
+    """Test chunked parsing of plain and gzip'd sitemaps"""
+    print("Testing streaming sitemap parser...")
+
+    entries = parse_sitemap(INDEX.encode())
+    assert [e.is_index for e in entries] == [True, True]
+    assert entries[1].lastmod == "2025-03-05T09:00:00Z"
+
+    # Feed gzip'd bytes a few at a time, as they would arrive over the network
+    data = gzip.compress(STORES.encode())
+    parser = SitemapParser()
+    entries = []
+    for i in range(0, len(data), 7):
+        entries.extend(parser.feed(data[i:i + 7]))
+    entries.extend(parser.close())
+    assert [e.loc for e in entries] == ["https://centre.example/stores", "https://centre.example/dining"]
+    assert not entries[0].is_index
+
+    assert parse_lastmod("2025") == parse_lastmod("2025-01-01T00:00:00Z")
+    assert parse_lastmod("2025-03-04T13:00:00+01:00") == parse_lastmod("2025-03-04T12:00:00Z")
+    assert parse_lastmod("not a date") is None
+
+    print("✅ Streaming sitemap parser works")
+
+def test_incremental_sync():
+    """Test index following, changed-URL selection and skipping unchanged child sitemaps"""
+    print("\nTesting incremental sitemap sync...")
+
+    documents = {
+        "https://centre.example/sitemap.xml": INDEX.encode(),
+        "https://centre.example/sitemap-pages.xml": PAGES.encode(),
+        "https://centre.example/sitemap-stores.xml.gz": gzip.compress(STORES.encode()),
+    }
+    requested = []
+
+    async def fetch(url):
+        requested.append(url)
+        yield documents[url]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = SitemapState(str(Path(tmp) / "state.sqlite"), "https://centre.example")
+        root = ["https://centre.example/sitemap.xml"]
+
+        sync = asyncio.run(sync_sitemaps(root, state, fetch))
+        assert len(sync.fetched) == 3 and not sync.errors
+        assert len(sync.urls) == 4
+        assert len(sync.changed) == 4, "Nothing has been crawled yet"
+
+        crawled_at = parse_lastmod("2025-03-02")
+        state.mark_crawled(sync.urls, at=crawled_at)
+
+        # The index now reports a newer stores sitemap; the pages sitemap is unchanged
+        documents["https://centre.example/sitemap.xml"] = INDEX.replace(
+            "2025-03-05T09:00:00Z", "2025-03-06T09:00:00Z").encode()
+        requested.clear()
+        sync = asyncio.run(sync_sitemaps(root, state, fetch))
+        assert "https://centre.example/sitemap-pages.xml" not in requested
+        assert "https://centre.example/sitemap-stores.xml.gz" in requested
+        assert sync.skipped == ["https://centre.example/sitemap-pages.xml"]
+        assert set(state.urls()) == {
+            "https://centre.example/", "https://centre.example/visit",
+            "https://centre.example/stores", "https://centre.example/dining",
+        }
+        assert state.due(now=crawled_at + 3600) == ["https://centre.example/stores"]
+
+        # Without lastmod, changefreq decides when a page is due again
+        assert "https://centre.example/" in state.due(now=crawled_at + 2 * 86400)
+        assert "https://centre.example/visit" not in state.due(now=crawled_at + 2 * 86400)
+
+        # A URL dropped from a re-read sitemap is pruned; the skipped sitemap's URLs stay
+        documents["https://centre.example/sitemap.xml"] = INDEX.replace(
+            "2025-03-05T09:00:00Z", "2025-03-07T09:00:00Z").encode()
+        documents["https://centre.example/sitemap-stores.xml.gz"] = gzip.compress(
+            STORES.replace("<url><loc>https://centre.example/dining</loc><lastmod>2025-02-01</lastmod></url>", "").encode())
+        sync = asyncio.run(sync_sitemaps(root, state, fetch))
+        assert sync.pruned == 1
+        assert set(state.urls()) == {"https://centre.example/", "https://centre.example/visit",
+                                     "https://centre.example/stores"}
+
+        # A child sitemap dropped from the index takes its URLs with it
+        documents["https://centre.example/sitemap.xml"] = INDEX.replace(
+            "2025-03-05T09:00:00Z", "2025-03-08T09:00:00Z").replace(
+            "<sitemap><loc>https://centre.example/sitemap-pages.xml</loc><lastmod>2025-03-01</lastmod></sitemap>", "").encode()
+        sync = asyncio.run(sync_sitemaps(root, state, fetch))
+        assert state.urls() == ["https://centre.example/stores"]
+
+        # A failed read prunes nothing
+        documents.pop("https://centre.example/sitemap-stores.xml.gz")
+        documents["https://centre.example/sitemap.xml"] = INDEX.replace(
+            "2025-03-05T09:00:00Z", "2025-03-09T09:00:00Z").encode()
+        sync = asyncio.run(sync_sitemaps(root, state, fetch))
+        assert sync.errors and sync.pruned == 0
+        assert "https://centre.example/stores" in state.urls()
+        state.close()
+
+    print("✅ Incremental sitemap sync works")
+
+def test_urllib_fetcher():
+    """Test that the aiohttp-free fetcher streams the raw (gzip'd) sitemap body"""
+    print("\nTesting urllib sitemap fetcher...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sitemap-stores.xml.gz"
+        path.write_bytes(gzip.compress(STORES.encode()))
+        state = SitemapState(str(Path(tmp) / "state.sqlite"), "https://centre.example")
+        sync = asyncio.run(sync_sitemaps([path.as_uri()], state, urllib_fetcher()))
+        assert sync.urls == ["https://centre.example/stores", "https://centre.example/dining"], sync
+        state.close()
+
+    print("✅ urllib sitemap fetcher works")
+
+if __name__ == "__main__":
+    test_streaming_parser()
+    test_incremental_sync()
+    test_urllib_fetcher()
+    print("\n✅ All sitemap tests passed!")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test tenant name normalisation and the brand alias index
+"""
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from tenant_names import BrandIndex, name_key, normalise_name
+
+def test_normalisation():
+    """Test punctuation folding, ampersands and suffix stripping"""
+    print("Testing tenant name normalisation...")
+
+    assert normalise_name("Marks & Spencer Ltd.") == "marks and spencer"
+    assert normalise_name("Marks and Spencer Foodhall") == "marks and spencer"
+    assert normalise_name("The Body Shop") == "body shop"
+    assert normalise_name("Costa Cafe") == "costa"
+    assert normalise_name("Café Rouge") == "cafe rouge", "Only trailing words are suffixes"
+    assert normalise_name("Store") == "store", "A suffix alone is still a name"
+    assert name_key("H & M") == name_key("H&M") == name_key("h+m")
+    assert name_key("Nando's") == name_key("Nandos") == name_key("NANDO’S")
+    assert name_key("Caffè Nero") == name_key("Caffe Nero")
+
+    print("✅ Tenant name normalisation works")
+
+def test_brand_index():
+    """Test exact, alias, acronym and trigram lookups"""
+    print("\nTesting brand alias index...")
+
+    index = BrandIndex()
+    index.extend(["Marks & Spencer", "H&M", "Primark", "JD Sports", "Sainsbury's", "Boots"])
+    index.add_alias("Dorothy Perkins", "Boohoo")
+
+    assert index.match("M&S") == "Marks & Spencer"
+    assert index.match("KFC") is None, "Only a known acronym's expansion matches it"
+    assert index.match("Marks and Spencer Foodhall") == "Marks & Spencer"
+    assert index.match("Sainsburys Local") == "Sainsbury's"
+    assert index.match("Primarkk") == "Primark"
+    assert index.match("JD Sport") == "JD Sports"
+    assert index.match("Dorothy Perkins") == "Boohoo"
+    assert index.match("Next") is None
+    assert index.match("Boss") is None, "Short names need a close match"
+    assert index.add("Marks and Spencer") == index.add("Marks & Spencer")
+    assert len(index) == 7
+
+    # Sharing initials doesn't make two tenants one brand, in either order
+    index.extend(["Boots & More", "Kentucky Fried Chicken"])
+    assert index.match("B&M") is None
+    index.add("B&M")
+    assert index.match("Boots & More") == "Boots & More" and index.match("B and M") == "B&M"
+    assert index.match("KFC") == "Kentucky Fried Chicken"
+
+    print("✅ Brand alias index works")
+
+def test_lookup_speed():
+    """Test that lookups stay sub-millisecond with tens of thousands of brands"""
+    print("\nTesting lookup speed at portfolio scale...")
+
+    rng = random.Random(7)
+    names = [" ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+                      for _ in range(rng.randint(1, 3))) for _ in range(30000)]
+    index = BrandIndex()
+    index.extend(names)
+
+    queries = [name[:-1] + "x" for name in names[:2000]]
+    started = time.perf_counter()
+    for query in queries:
+        index.lookup(query)
+    per_lookup_ms = (time.perf_counter() - started) / len(queries) * 1000
+    print(f"   {per_lookup_ms:.3f} ms per lookup over {len(index)} brands")
+    assert per_lookup_ms < 1.0
+
+    print("✅ Lookups are sub-millisecond")
+
+if __name__ == "__main__":
+    test_normalisation()
+    test_brand_index()
+    test_lookup_speed()
+    print("\n✅ All tenant name tests passed!")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test mapping locally extracted tenants onto the TenantInfo taxonomy
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from tenant_taxonomy import classify_tenant, is_anchor
+
+def test_category_hints():
+    """Test that card category hints map onto the taxonomy and its tenant types"""
+    print("Testing category hints...")
+
+    fashion = classify_tenant("Fat Face", "Fashion & Accessories")
+    assert fashion == {"category": "Fashion", "subcategory": "Fashion & Accessories",
+                       "tenant_type": "retail", "is_anchor": False}, fashion
+    assert classify_tenant("Fat Face", "fashion")["subcategory"] is None, "A hint that is the category adds nothing"
+    assert classify_tenant("Wok Express", "Food & Drink")["tenant_type"] == "food_beverage"
+    assert classify_tenant("Headmasters", "Hair & Beauty")["tenant_type"] == "service"
+    assert classify_tenant("Superdrug", "Health & Beauty")["tenant_type"] == "retail"
+    assert classify_tenant("Game", "Gaming")["category"] == "Electronics"
+    assert classify_tenant("Sports Direct", "Sports & Leisure")["category"] == "Sports & Outdoors"
+    assert classify_tenant("HSBC", "Banks")["tenant_type"] == "service"
+
+    # Unknown hints pass through; hints that aren't categories are dropped
+    assert classify_tenant("Clintons", "Cards & Gifts")["category"] == "Cards & Gifts"
+    unit = classify_tenant("Clintons", "Unit 23, Level 1")
+    assert unit["category"] == "Other" and unit["subcategory"] is None, unit
+
+    print("✅ Category hints work")
+
+def test_names_and_anchors():
+    """Test the name fallback, the page-type default and anchor brands"""
+    print("\nTesting names and anchors...")
+
+    costa = classify_tenant("Costa Coffee")
+    assert costa["category"] == "F&B" and costa["tenant_type"] == "food_beverage" and costa["is_anchor"], costa
+    assert classify_tenant("Greggs")["tenant_type"] == "food_beverage"
+    assert classify_tenant("Wing Kitchen")["tenant_type"] == "food_beverage"
+    assert classify_tenant("Hollywood Bowl")["tenant_type"] == "leisure"
+    assert classify_tenant("Joe's Barbers")["tenant_type"] == "service"
+    assert classify_tenant("Tesco Superstore")["category"] == "Supermarket"
+
+    # Nothing to go on: the page decides
+    assert classify_tenant("Mooboo", is_dining=True)["tenant_type"] == "food_beverage"
+    assert classify_tenant("Mooboo") == {"category": "Other", "subcategory": None,
+                                         "tenant_type": "retail", "is_anchor": False}
+
+    assert is_anchor("M&S Foodhall") and is_anchor("Marks and Spencer") and is_anchor("H & M")
+    assert not is_anchor("Hair Mania"), "Initials alone don't make an anchor"
+    assert not is_anchor("Next Door Deli")
+
+    print("✅ Names and anchors work")
+
+if __name__ == "__main__":
+    test_category_hints()
+    test_names_and_anchors()
+    print("\n✅ All tenant taxonomy tests passed!")
@@ -1,16 +1,23 @@
 #!/usr/bin/env python3
 """
 Crawl4AI Store Directory Scraper
-Uses AI-powered extraction to intelligently extract store listings
+Reads store listings straight off regular directory cards, and uses
+AI-powered extraction for pages whose structure isn't clear enough
 """
 import asyncio
 import json
 import sys
 import os
 
+# Shared crawl helpers (browser pool etc.) live with the crawl4ai skill scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "crawl4ai", "scripts"))
+
 try:
-    from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+    from crawl4ai import CrawlerRunConfig, CacheMode
     from crawl4ai.extraction_strategy import LLMExtractionStrategy
+    from browser_pool import close_pool, get_pool, lease_crawler
+    from directory_chunks import extract_chunks, merge_tenants
+    from directory_region import extract_cards, prompt_chunks
     from pydantic import BaseModel, Field
 except ImportError:
     print(json.dumps({"error": "crawl4ai not installed. Run: pip3 install crawl4ai"}))
@@ -25,64 +32,86 @@ class StoreDirectory(BaseModel):
     stores: list[StoreInfo] = Field(..., description="List of all stores/shops/brands found on this page")
 
 async def crawl_stores(url: str, api_key: str):
-    """Extract store directory using LLM-based extraction"""
+    """Extract store directory: read from the page's repeated cards, or with LLM-based extraction"""
     
     if not api_key or api_key == "NONE":
         print(json.dumps({"error": "OPENAI_API_KEY environment variable not set"}))
         return []
     
+    strategy = LLMExtractionStrategy(
+        provider="openai/gpt-4o-mini",
+        api_token=api_key,
+        schema=StoreDirectory.model_json_schema(),
+        extraction_type="schema",
+        instruction="""
+        Extract ALL stores, shops, brands, and retailers from this page.
+        The content is either the page text, or the directory's entries one per line as
+        "name | category hint | link" (with - for a missing field).
+        
+        Look for:
+        - Store names in any format (links, cards, lists, grids, tables)
+        - Category/type information if shown
+        - URLs to individual store pages
+        
+        Be VERY thorough - if you see 100 stores, extract all 100.
+        Include major brands like H&M, Zara, Apple, Costa, etc.
+        Don't miss any stores!
+        """,
+        apply_chunking=False,  # Chunks are already sized by directory_chunks; don't re-split them
+    )
+    # The page is only rendered here; extraction happens below, locally when
+    # the directory's cards are regular enough, else with the LLM
     config = CrawlerRunConfig(
         cache_mode=CacheMode.BYPASS,
-        extraction_strategy=LLMExtractionStrategy(
-            provider="openai/gpt-4o-mini",
-            api_token=api_key,
-            schema=StoreDirectory.model_json_schema(),
-            extraction_type="schema",
-            instruction="""
-            Extract ALL stores, shops, brands, and retailers from this page.
-            
-            Look for:
-            - Store names in any format (links, cards, lists, grids, tables)
-            - Category/type information if shown
-            - URLs to individual store pages
-            
-            Be VERY thorough - if you see 100 stores, extract all 100.
-            Include major brands like H&M, Zara, Apple, Costa, etc.
-            Don't miss any stores!
-            """,
-        ),
         word_count_threshold=10,
         page_timeout=60000,
         wait_until="networkidle",
         verbose=False
     )
     
+    async def extract_chunk(chunk: str) -> list:
+        blocks = await asyncio.to_thread(strategy.run, url, [chunk])
+        stores = []
+        for block in blocks or []:
+            if not isinstance(block, dict) or block.get("error"):
+                continue
+            if "stores" in block:
+                stores.extend(s for s in block["stores"] or [] if isinstance(s, dict))
+            elif block.get("name"):
+                stores.append(block)
+        return stores
+    
     try:
-        async with AsyncWebCrawler(verbose=False) as crawler:
+        async with lease_crawler() as crawler:
             result = await crawler.arun(url=url, config=config)
-            
-            if result.success and result.extracted_content:
-                try:
-                    data = json.loads(result.extracted_content)
-                    # Handle both list and dict responses
-                    if isinstance(data, list):
-                        stores = data
-                    elif isinstance(data, dict):
-                        stores = data.get("stores", [])
-                    else:
-                        stores = []
-                    return stores
-                except Exception as e:
-                    print(json.dumps({"error": f"Parse error: {str(e)}"}), file=sys.stderr)
-                    return []
-            else:
-                error_msg = result.error_message if hasattr(result, 'error_message') else "Unknown error"
-                print(json.dumps({"error": f"Crawl failed: {error_msg}"}), file=sys.stderr)
-                return []
+        
+        if not result.success or not result.html:
+            error_msg = result.error_message if hasattr(result, 'error_message') else "Unknown error"
+            print(json.dumps({"error": f"Crawl failed: {error_msg}"}), file=sys.stderr)
+            return []
+        
+        base_url = result.url or url
+        local = extract_cards(result.html, base_url=base_url)
+        if local.confident:
+            return local.tenants
+        
+        chunks, _ = prompt_chunks(result.html, base_url=base_url)
+        results = await extract_chunks(chunks, extract_chunk)
+        for i, chunk_result in enumerate(results):
+            if isinstance(chunk_result, Exception):
+                print(json.dumps({"warning": f"Chunk {i + 1}/{len(chunks)} failed: {chunk_result}"}), file=sys.stderr)
+        return merge_tenants(r for r in results if not isinstance(r, Exception))
     except Exception as e:
         print(json.dumps({"error": f"Exception: {str(e)}"}), file=sys.stderr)
         return []
 
+async def main(url: str, api_key: str):
+    get_pool(profile="text-only")
+    try:
+        return await crawl_stores(url, api_key)
+    finally:
+        await close_pool()
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({"error": "Usage: python3 crawl4ai_scraper.py <url>"}))
@@ -91,6 +120,6 @@ if __name__ == "__main__":
     url = sys.argv[1]
     api_key = os.environ.get("OPENAI_API_KEY", "NONE")
     
-    stores = asyncio.run(crawl_stores(url, api_key))
+    stores = asyncio.run(main(url, api_key))
     print(json.dumps(stores, indent=2))
 
@@ -0,0 +1,35 @@
+import { PrismaClient } from '@prisma/client';
+import * as fs from 'fs';
+
+const prisma = new PrismaClient();
+
+// id -> website map for smart_tenant_discovery.py --batch --websites, since the
+// enrichment target exports (enrichment_targets.json, managed_enrichment_queue.json)
+// only carry id/name/city
+const OUTPUT = process.argv[2] || 'location_websites.json';
+
+async function main() {
+    console.log("🌐 Exporting shopping centre websites...");
+
+    const locations = await prisma.location.findMany({
+        where: {
+            type: 'SHOPPING_CENTRE',
+            website: { not: null }
+        },
+        select: { id: true, website: true }
+    });
+
+    const websites: Record<string, string> = {};
+    for (const loc of locations) {
+        if (loc.website && loc.website.trim().length > 0) {
+            websites[loc.id] = loc.website.trim();
+        }
+    }
+
+    fs.writeFileSync(OUTPUT, JSON.stringify(websites, null, 2));
+    console.log(`✅ Saved ${Object.keys(websites).length} websites to ${OUTPUT}`);
+}
+
+main()
+    .catch(e => console.error(e))
+    .finally(async () => await prisma.$disconnect());
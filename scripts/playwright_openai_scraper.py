@@ -8,6 +8,12 @@ import json
 import sys
 import os
 
+# DOM chunking and page loading helpers live with the crawl4ai skill scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "crawl4ai", "scripts"))
+from directory_chunks import extract_chunks, merge_tenants
+from directory_region import extract_cards, prompt_chunks
+from page_loader import load_directory
+
 try:
     from playwright.async_api import async_playwright
 except ImportError:
@@ -15,13 +21,50 @@ except ImportError:
     sys.exit(1)
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI
 except ImportError:
     print(json.dumps({"error": "openai not installed. Run: pip3 install openai"}))
     sys.exit(1)
 
-async def scrape_stores(url: str, api_key: str):
-    """Extract store directory using Playwright + OpenAI"""
+# Concurrent OpenAI calls per page (one per DOM-aligned chunk)
+LLM_CHUNK_CONCURRENCY = int(os.environ.get("LLM_CHUNK_CONCURRENCY", "4"))
+CHUNK_MAX_TOKENS = 4096  # Output budget per chunk; a chunk holds ~100 stores at most
+
+
+def parse_store_list(result_text: str) -> list:
+    """JSON array from a model reply (remove markdown code blocks if present)"""
+    result_text = result_text.strip()
+    if result_text.startswith("```"):
+        result_text = result_text.split("```")[1]
+        if result_text.startswith("json"):
+            result_text = result_text[4:]
+    stores = json.loads(result_text)
+    return stores if isinstance(stores, list) else []
+
+
+async def render_directory(browser, url: str) -> tuple[str, str]:
+    """Render url in a new page of `browser`; returns (html, final url) once the whole directory has loaded"""
+    page = await browser.new_page()
+    try:
+        # Scrolls, clicks "Load more" and follows "Next" pages, waiting on DOM
+        # mutations and network quiet rather than fixed sleeps, until the
+        # number of tenant cards stops growing
+        loaded = await load_directory(page, url)
+        print(json.dumps({"loader": {
+            "cards": loaded.cards, "pages": loaded.pages, "scrolls": loaded.scrolls,
+            "clicks": loaded.clicks, "elapsed_ms": round(loaded.elapsed_ms), "stop": loaded.stop_reason,
+        }}), file=sys.stderr)
+        return loaded.html, loaded.url
+    finally:
+        await page.close()
+
+
+async def scrape_stores(url: str, api_key: str, browser=None, client=None):
+    """
+    Extract store directory using Playwright + OpenAI.
+    A long-lived caller (tenant_worker.py) passes its warm `browser` and
+    OpenAI `client`; otherwise both are created for this call.
+    """
     
     if not api_key or api_key == "NONE":
         print(json.dumps({"error": "OPENAI_API_KEY environment variable not set"}))
@@ -29,39 +72,39 @@ async def scrape_stores(url: str, api_key: str):
     
     try:
         # Use Playwright to render the page
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            
-            # Navigate and wait for content
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            await page.wait_for_timeout(2000)  # Extra wait for any dynamic content
-            
-            # AUTO-SCROLL to trigger lazy loading (crucial for large directories!)
-            previous_height = 0
-            for i in range(20):  # Scroll up to 20 times
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await page.wait_for_timeout(500)  # Wait for content to load
-                
-                current_height = await page.evaluate("document.body.scrollHeight")
-                if current_height == previous_height:
-                    break  # No more content loading
-                previous_height = current_height
-            
-            # Get the page content AFTER scrolling
-            html_content = await page.content()
-            text_content = await page.inner_text('body')
-            
-            await browser.close()
+        if browser is None:
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=True)
+                try:
+                    html_content, page_url = await render_directory(browser, url)
+                finally:
+                    await browser.close()
+        else:
+            html_content, page_url = await render_directory(browser, url)
+        
+        # Regular card directories are read locally, without an LLM call
+        local = extract_cards(html_content, base_url=page_url)
+        print(json.dumps({"local_extraction": {
+            "cards": local.cards, "tenants": len(local.tenants), "confidence": local.confidence,
+        }}), file=sys.stderr)
+        if local.confident:
+            return local.tenants
         
-        # Use OpenAI to extract stores from the content
-        client = OpenAI(api_key=api_key)
+        # Isolate the directory's repeated cards as one "name | category | link"
+        # line each (no nav, footer or cookie banner text), or failing that
+        # split the whole page along its DOM; chunks are extracted concurrently
+        chunks, compact = prompt_chunks(html_content, base_url=page_url)
+        if compact:
+            content_label = "Directory entries, one per line as: name | category hint | link (- if none)"
+        else:
+            content_label = "Text Content (links in brackets after their text)"
+        client = client or AsyncOpenAI(api_key=api_key)
         
-        prompt = f"""Extract ALL stores/shops/brands from this retail location's store directory page.
+        async def extract_chunk(chunk: str) -> list:
+            prompt = f"""Extract ALL stores/shops/brands from this section of a retail location's store directory page.
 
-HTML Content Length: {len(html_content)} chars
-Text Content (showing up to 50,000 chars):
-{text_content[:50000]}
+{content_label}:
+{chunk}
 
 Return a JSON array of stores with this structure:
 [
@@ -69,30 +112,27 @@ Return a JSON array of stores with this structure:
   ...
 ]
 
-Be thorough - extract EVERY store you can find. If you see 200+ stores, extract ALL of them.
+Be thorough - extract EVERY store you can find in this section.
 Major brands to look for: H&M, Zara, Apple, Nike, Costa, Starbucks, JD Sports, Primark, etc.
+If the section has no stores, return [].
 Return ONLY the JSON array, no explanation."""
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a data extraction assistant. Extract ALL stores from retail directory pages. Be exhaustive - don't miss any stores!"},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0,
-            max_tokens=16000  # Increased for large store lists
-        )
-        
-        result_text = response.choices[0].message.content.strip()
-        
-        # Parse JSON (remove markdown code blocks if present)
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
+            response = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": "You are a data extraction assistant. Extract ALL stores from retail directory pages. Be exhaustive - don't miss any stores!"},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0,
+                max_tokens=CHUNK_MAX_TOKENS
+            )
+            return parse_store_list(response.choices[0].message.content)
         
-        stores = json.loads(result_text)
-        return stores
+        results = await extract_chunks(chunks, extract_chunk, LLM_CHUNK_CONCURRENCY)
+        for i, chunk_result in enumerate(results):
+            if isinstance(chunk_result, Exception):
+                print(json.dumps({"warning": f"Chunk {i + 1}/{len(chunks)} failed: {chunk_result}"}), file=sys.stderr)
+        return merge_tenants(r for r in results if not isinstance(r, Exception))
         
     except Exception as e:
         print(json.dumps({"error": f"Exception: {str(e)}"}), file=sys.stderr)
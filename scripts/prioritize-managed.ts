@@ -68,6 +68,7 @@ async function main() {
             id: loc.id,
             name: loc.name,
             city: loc.city,
+            website: loc.website,
             score: score,
             missing: missing,
             management: loc.management
@@ -13,7 +13,7 @@
  */
 
 import { PrismaClient } from '@prisma/client';
-import { spawn } from 'child_process';
+import { TenantWorker } from './utils/tenant-worker';
 
 const prisma = new PrismaClient();
 
@@ -32,57 +32,19 @@ interface ExtractionResult {
     categories: Record<string, number>;
 }
 
-// Run Python extraction script
-async function extractTenants(storeUrl: string, diningUrl?: string): Promise<ExtractionResult | null> {
-    return new Promise((resolve) => {
-        const pythonPath = '/Users/mbeckett/miniconda3/bin/python3';
-        const scriptPath = './scripts/smart_tenant_extraction.py';
-        const args = diningUrl ? [scriptPath, storeUrl, diningUrl] : [scriptPath, storeUrl];
-
-        const childProcess = spawn(pythonPath, args, {
-            env: { ...process.env, OPENAI_API_KEY: process.env.OPENAI_API_KEY || '' }
-        });
-
-        let output = '';
-        let error = '';
-
-        childProcess.stdout.on('data', (data) => { output += data.toString(); });
-        childProcess.stderr.on('data', (data) => {
-            // Log stderr but don't treat as error (crawl4ai logs to stderr)
-            const msg = data.toString();
-            if (!msg.includes('[INIT]') && !msg.includes('[FETCH]') && !msg.includes('[SCRAPE]')) {
-                process.stderr.write(msg);
-            }
-        });
-
-        const timer = setTimeout(() => {
-            childProcess.kill();
-            console.log(`   ⏱️  Timeout after 3 minutes`);
-            resolve(null);
-        }, 180000); // 3 minute timeout
-
-        childProcess.on('close', (code) => {
-            clearTimeout(timer);
-            if (code !== 0) {
-                resolve(null);
-                return;
-            }
+// Python extraction runs in one long-lived worker (warm browser pool) for the whole run
+const tenantWorker = new TenantWorker({
+    pythonPath: '/Users/mbeckett/miniconda3/bin/python3',
+    timeoutMs: 180000, // 3 minute timeout
+});
 
-            try {
-                // Find the JSON in the output (may have stderr mixed in)
-                const jsonMatch = output.match(/\{[\s\S]*\}/);
-                if (jsonMatch) {
-                    const result = JSON.parse(jsonMatch[0]);
-                    resolve(result);
-                } else {
-                    resolve(null);
-                }
-            } catch (e) {
-                console.log(`   ⚠️  Parse error`);
-                resolve(null);
-            }
-        });
-    });
+async function extractTenants(storeUrl: string, diningUrl?: string): Promise<ExtractionResult | null> {
+    try {
+        return await tenantWorker.extract(storeUrl, diningUrl);
+    } catch (e: any) {
+        console.log(`   ⚠️  ${e.message}`);
+        return null;
+    }
 }
 
 // Map category strings to normalized database categories
@@ -284,4 +246,4 @@ async function main() {
 
 main()
     .catch(console.error)
-    .finally(() => prisma.$disconnect());
+    .finally(() => Promise.all([prisma.$disconnect(), tenantWorker.close()]));
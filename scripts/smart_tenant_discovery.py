@@ -9,22 +9,49 @@ for store/retail and F&B/dining pages.
 Usage:
   python smart_tenant_discovery.py <website_url>
   python smart_tenant_discovery.py https://cwmbrancentre.com
+
+Batch mode (one process and browser pool for many centres, NDJSON out):
+  python smart_tenant_discovery.py --batch sites.txt [--concurrency 4] [--output discovered.ndjson]
+  npx tsx scripts/export-location-websites.ts   # writes location_websites.json (id -> website)
+  python smart_tenant_discovery.py --batch enrichment_targets.json --websites location_websites.json
+
+Location exports such as enrichment_targets.json carry id/name/city but no
+website; --websites resolves each target's website from its id.
+
+Results are cached per domain (.discovery_cache.sqlite, DISCOVERY_CACHE_PATH)
+and reused while their directory URLs still answer 200; --refresh ignores the cache.
 """
 
 import asyncio
 import json
 import sys
 import os
-import re
+from contextlib import nullcontext
 from dataclasses import dataclass
+from urllib.parse import urljoin, urlparse
+
+# Shared crawl helpers (browser pool etc.) live with the crawl4ai skill scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "crawl4ai", "scripts"))
 
 try:
-    from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+    from crawl4ai import CrawlerRunConfig, CacheMode
     from crawl4ai.extraction_strategy import LLMExtractionStrategy
+    from browser_pool import close_pool, get_pool, lease_crawler
+    from directory_classifier import DirectoryClassifier
+    from discovery_cache import DiscoveryCache
+    from http_fetch import HttpFetcher, PageStatsParser
+    from sitemaps import (DEFAULT_SITEMAP_STATE_PATH, SitemapState, aiohttp_fetcher,
+                          sitemaps_from_robots, sync_sitemaps)
 except ImportError:
     print(json.dumps({"error": "crawl4ai not installed. Run: pip3 install crawl4ai"}))
     sys.exit(1)
 
+SITEMAP_STATE_PATH = os.environ.get("SITEMAP_STATE_PATH", DEFAULT_SITEMAP_STATE_PATH)
+
+SITEMAP_PATHS = ["/sitemap.xml", "/sitemap_index.xml", "/sitemap-index.xml"]
+PROBE_TIMEOUT = 10.0  # seconds, per HTTP request
+MIN_HOMEPAGE_LINKS = 5  # Fewer static links than this means a JS shell: ask the browser
+
 @dataclass
 class DiscoveredUrls:
     website: str
@@ -32,41 +59,107 @@ class DiscoveredUrls:
     dining_directory_url: str | None
     all_relevant_urls: list[str]
     confidence: str
-    method: str  # "sitemap", "link_analysis", "fallback"
+    method: str  # "sitemap", "link_analysis", "fallback", "cache"
 
 
-async def fetch_sitemap(crawler, website: str) -> list[str]:
-    """Attempt to fetch and parse sitemap.xml"""
-    sitemap_urls = [
-        f"{website}/sitemap.xml",
-        f"{website}/sitemap_index.xml",
-        f"{website}/sitemap-index.xml",
-    ]
-    
-    for sitemap_url in sitemap_urls:
+async def fetch_sitemap(website: str) -> list[str]:
+    """
+    Stream-parse the site's sitemap, following index files, without the
+    pooled HTTP client (sync_sitemaps reads the raw XML over urllib). Every
+    URL's lastmod is kept in the per-site sitemap state so re-crawls can
+    skip pages that have not changed.
+    """
+    sitemap_urls = [f"{website}{path}" for path in SITEMAP_PATHS]
+
+    with SitemapState(SITEMAP_STATE_PATH, website) as state:
+        for sitemap_url in sitemap_urls:
+            sync = await sync_sitemaps([sitemap_url], state, timeout=PROBE_TIMEOUT)
+            if sync.urls or sync.skipped:
+                # Child sitemaps unchanged since the last run were not re-read
+                urls = state.urls() if sync.skipped else sync.urls
+                print(f"   ✅ Found sitemap with {len(urls)} URLs "
+                      f"({len(sync.changed)} new or modified since last run)", file=sys.stderr)
+                return urls
+
+    return []
+
+
+async def probe_sitemaps(fetcher: HttpFetcher, website: str) -> list[str]:
+    """
+    Probe the common sitemap locations and the robots.txt Sitemap: entries
+    concurrently over HTTP; the first probe that yields URLs wins and the
+    rest are cancelled.
+    """
+    fetch = aiohttp_fetcher(fetcher.session)
+    common = [f"{website}{path}" for path in SITEMAP_PATHS]
+
+    with SitemapState(SITEMAP_STATE_PATH, website) as state:
+        async def probe(roots: list[str]) -> list[str]:
+            sync = await sync_sitemaps(roots, state, fetch)
+            # Child sitemaps unchanged since the last run were not re-read
+            urls = state.urls() if sync.skipped else sync.urls
+            if urls:
+                print(f"   ✅ Found sitemap {roots[0]} with {len(urls)} URLs "
+                      f"({len(sync.changed)} new or modified since last run)", file=sys.stderr)
+            return urls
+
+        async def probe_robots() -> list[str]:
+            try:
+                async with fetcher.session.get(f"{website}/robots.txt") as response:
+                    if response.status != 200:
+                        return []
+                    declared = sitemaps_from_robots(await response.text(errors="replace"))
+            except Exception:
+                return []
+            declared = [url for url in declared if url not in common]
+            return await probe(declared) if declared else []
+
+        tasks = [asyncio.create_task(probe([url])) for url in common]
+        tasks.append(asyncio.create_task(probe_robots()))
         try:
-            result = await crawler.arun(
-                url=sitemap_url,
-                config=CrawlerRunConfig(
-                    cache_mode=CacheMode.BYPASS,
-                    page_timeout=10000,
-                )
-            )
-            
-            if result.success and result.html:
-                # Extract URLs from sitemap XML
-                urls = re.findall(r'<loc>([^<]+)</loc>', result.html)
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    urls = await next_done
+                except Exception:
+                    continue
                 if urls:
-                    print(f"   ✅ Found sitemap with {len(urls)} URLs", file=sys.stderr)
                     return urls
-        except Exception:
-            continue
-    
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     return []
 
 
-async def get_internal_links(crawler, website: str) -> list[str]:
-    """Crawl homepage and extract internal links"""
+async def fetch_homepage_links(fetcher: HttpFetcher, website: str) -> list[tuple[str, str]]:
+    """Internal (url, anchor text) links from the homepage's static HTML (no browser)"""
+    page = await fetcher.fetch(website)
+    if not page.ok:
+        return []
+    parser = PageStatsParser()
+    try:
+        parser.feed(page.html)
+        parser.close()
+    except Exception:
+        pass
+
+    host = urlparse(page.url).netloc.lower().removeprefix("www.")
+    internal_links = {}
+    for href, text in parser.links:
+        url = urljoin(page.url, href).split("#")[0]
+        parsed = urlparse(url)
+        if parsed.scheme in ("http", "https") and parsed.netloc.lower().removeprefix("www.") == host:
+            # Keep the first non-empty anchor text per URL
+            if not internal_links.get(url):
+                internal_links[url] = text
+    internal_links = list(internal_links.items())
+    print(f"   ✅ Found {len(internal_links)} internal links in static homepage", file=sys.stderr)
+    return internal_links
+
+
+async def get_internal_links(crawler, website: str) -> list[tuple[str, str]]:
+    """Crawl homepage and extract internal (url, anchor text) links"""
     try:
         result = await crawler.arun(
             url=website,
@@ -83,9 +176,9 @@ async def get_internal_links(crawler, website: str) -> list[str]:
             internal_links = []
             for link in raw_links:
                 if isinstance(link, str):
-                    internal_links.append(link)
+                    internal_links.append((link, ""))
                 elif isinstance(link, dict) and 'href' in link:
-                    internal_links.append(link['href'])
+                    internal_links.append((link['href'], link.get('text') or ""))
             print(f"   ✅ Found {len(internal_links)} internal links", file=sys.stderr)
             return internal_links
     except Exception as e:
@@ -94,12 +187,38 @@ async def get_internal_links(crawler, website: str) -> list[str]:
     return []
 
 
-async def classify_urls_with_ai(urls: list[str], website: str, api_key: str) -> dict:
-    """Use AI to classify URLs and find store/dining directories"""
+def classify_urls_locally(urls: list[str], anchors: dict[str, str] | None = None) -> dict | None:
+    """
+    Score URLs with the local directory classifier; returns a classification
+    in the LLM's shape when it is confident, else None
+    """
+    result = DirectoryClassifier().classify(urls, anchors)
+    if not result.confident:
+        return None
+    print(f"   ⚡ Local classifier: {result.store_url} (score {result.store_score:.1f})", file=sys.stderr)
+    return {
+        "store_directory_url": result.store_url,
+        "dining_directory_url": result.dining_url,
+        "alternative_urls": result.alternatives,
+        "confidence": result.confidence,
+        "reasoning": f"local classifier: store score {result.store_score:.1f}, dining score {result.dining_score:.1f}",
+    }
+
+
+async def classify_urls_with_ai(urls: list[str], website: str, api_key: str,
+                                anchors: dict[str, str] | None = None) -> dict:
+    """
+    Find store/dining directories: the local scored classifier first, the LLM
+    only when its top store score is below the confidence threshold
+    """
     
     if not urls:
         return {"store_directory_url": None, "dining_directory_url": None, "confidence": "none"}
     
+    local = classify_urls_locally(urls, anchors)
+    if local is not None:
+        return local
+    
     # Filter to potentially relevant URLs
     keywords = ['store', 'shop', 'retail', 'brand', 'directory', 'dining', 
                 'restaurant', 'food', 'eat', 'cafe', 'leisure', 'tenant']
@@ -117,12 +236,18 @@ async def classify_urls_with_ai(urls: list[str], website: str, api_key: str) ->
     
     print(f"   🤖 Analyzing {len(urls_to_analyze)} URLs with AI...", file=sys.stderr)
     
-    config = CrawlerRunConfig(
-        cache_mode=CacheMode.BYPASS,
-        extraction_strategy=LLMExtractionStrategy(
-            provider="openai/gpt-4o-mini",
-            api_token=api_key,
-            instruction=f"""
+    # The prompt is the candidate links themselves, labelled with the anchor text
+    # from the homepage render we already have - no page needs to be loaded
+    anchors = anchors or {}
+    links_listing = "\n".join(
+        f"- {url} ({anchors[url]})" if anchors.get(url) else f"- {url}"
+        for url in urls_to_analyze
+    )
+    
+    strategy = LLMExtractionStrategy(
+        provider="openai/gpt-4o-mini",
+        api_token=api_key,
+        instruction=f"""
             You are analyzing URLs from a shopping centre website: {website}
             
             Your task: Identify the URLs that lead to:
@@ -131,8 +256,7 @@ async def classify_urls_with_ai(urls: list[str], website: str, api_key: str) ->
             2. DINING DIRECTORY - A page listing ALL restaurants, cafes, food outlets
                (look for: /dining, /eat, /food, /restaurants, /food-drink, /cafes)
             
-            Analyze these URLs:
-            {chr(10).join(urls_to_analyze)}
+            Analyze the URLs listed in the content (link text in brackets where known).
             
             Return JSON:
             {{
@@ -146,61 +270,86 @@ async def classify_urls_with_ai(urls: list[str], website: str, api_key: str) ->
             IMPORTANT: Return the FULL URL, not just the path.
             If a URL contains both stores AND dining together, use it for store_directory_url.
             """,
-        ),
-        page_timeout=60000,
     )
     
     try:
-        async with AsyncWebCrawler(verbose=False) as crawler:
-            # Create a simple text page with the URLs for analysis
-            result = await crawler.arun(
-                url=website,  # Just need any page to trigger extraction
-                config=config
-            )
-            
-            if result.success and result.extracted_content:
-                try:
-                    data = json.loads(result.extracted_content)
-                    if isinstance(data, list) and len(data) > 0:
-                        data = data[0]
-                    return data
-                except:
-                    pass
+        # Call the strategy directly (blocking LLM client, so off the event loop)
+        data = await asyncio.to_thread(strategy.run, website, [links_listing])
+        if isinstance(data, list) and len(data) > 0:
+            data = data[0]
+        if isinstance(data, dict) and not data.get("error"):
+            return data
     except Exception as e:
         print(f"   ⚠️  AI classification error: {e}", file=sys.stderr)
     
     return {"store_directory_url": None, "dining_directory_url": None, "confidence": "none"}
 
 
-async def discover_urls(website: str, api_key: str) -> DiscoveredUrls:
-    """Main discovery function - uses multiple strategies"""
+async def discover_urls(website: str, api_key: str, cache: DiscoveryCache | None = None,
+                        fetcher: HttpFetcher | None = None) -> DiscoveredUrls:
+    """
+    Main discovery function - uses multiple strategies.
+    Long-lived callers pass an open `fetcher` to reuse its connection pool.
+    """
     
     website = website.rstrip('/')
     print(f"\n🔍 Discovering store/dining URLs for: {website}", file=sys.stderr)
     
     all_urls = []
     method = "unknown"
+    sitemap_urls: list[str] = []
+    internal_links: list[tuple[str, str]] = []
     
-    async with AsyncWebCrawler(verbose=False) as crawler:
+    async with (nullcontext(fetcher) if fetcher else HttpFetcher(timeout=PROBE_TIMEOUT)) as fetcher:
+        if cache is not None:
+            # A cached result is reused if its directory URLs still answer HEAD with 200
+            # (without aiohttp there is no cheap check, so the TTL alone decides)
+            cached = await cache.lookup(website, fetcher.head if fetcher.available else None)
+            if cached:
+                print(f"   ♻️  Reusing cached discovery ({cached.get('method')}, "
+                      f"{cached.get('confidence')} confidence)", file=sys.stderr)
+                return DiscoveredUrls(
+                    website=website,
+                    store_directory_url=cached.get("store_directory_url"),
+                    dining_directory_url=cached.get("dining_directory_url"),
+                    all_relevant_urls=cached.get("all_relevant_urls", []),
+                    confidence=cached.get("confidence", "low"),
+                    method="cache"
+                )
+        
+        if fetcher.available:
+            # Strategies 1 + 2 at once: sitemap probes race each other while the
+            # homepage is fetched, so discovery costs about one request
+            print("   📍 Probing sitemaps and homepage links concurrently...", file=sys.stderr)
+            sitemap_urls, internal_links = await asyncio.gather(
+                probe_sitemaps(fetcher, website),
+                fetch_homepage_links(fetcher, website),
+            )
+    
+    if not fetcher.available:
         # Strategy 1: Check sitemap
         print("   📍 Checking sitemap...", file=sys.stderr)
-        sitemap_urls = await fetch_sitemap(crawler, website)
-        
-        if sitemap_urls:
-            all_urls.extend(sitemap_urls)
-            method = "sitemap"
-        
-        # Strategy 2: Get internal links from homepage
-        print("   📍 Analyzing homepage links...", file=sys.stderr)
-        internal_links = await get_internal_links(crawler, website)
-        
-        if internal_links:
-            all_urls.extend(internal_links)
-            if not sitemap_urls:
-                method = "link_analysis"
+        sitemap_urls = await fetch_sitemap(website)
+
+    if not fetcher.available or len(internal_links) < MIN_HOMEPAGE_LINKS:
+        async with lease_crawler() as crawler:
+            # Strategy 2: Get internal links from the rendered homepage (JS-built menus)
+            print("   📍 Analyzing homepage links...", file=sys.stderr)
+            internal_links = list(dict.fromkeys(internal_links + await get_internal_links(crawler, website)))
+    
+    if sitemap_urls:
+        all_urls.extend(sitemap_urls)
+        method = "sitemap"
+    
+    # Anchor text of homepage links feeds the local classifier
+    anchors = {url: text for url, text in internal_links if text}
+    if internal_links:
+        all_urls.extend(url for url, _ in internal_links)
+        if not sitemap_urls:
+            method = "link_analysis"
     
     # Deduplicate
-    all_urls = list(set(all_urls))
+    all_urls = list(dict.fromkeys(all_urls))
     
     if not all_urls:
         print("   ❌ No URLs found to analyze", file=sys.stderr)
@@ -214,7 +363,7 @@ async def discover_urls(website: str, api_key: str) -> DiscoveredUrls:
         )
     
     # Strategy 3: AI classification
-    classification = await classify_urls_with_ai(all_urls, website, api_key)
+    classification = await classify_urls_with_ai(all_urls, website, api_key, anchors)
     
     # Build result
     store_url = classification.get("store_directory_url")
@@ -238,7 +387,7 @@ async def discover_urls(website: str, api_key: str) -> DiscoveredUrls:
     print(f"      Dining Directory: {dining_url or 'Not found'}", file=sys.stderr)
     print(f"      Confidence: {confidence}", file=sys.stderr)
     
-    return DiscoveredUrls(
+    result = DiscoveredUrls(
         website=website,
         store_directory_url=store_url,
         dining_directory_url=dining_url,
@@ -246,34 +395,166 @@ async def discover_urls(website: str, api_key: str) -> DiscoveredUrls:
         confidence=confidence,
         method=method
     )
+    if cache is not None:
+        cache.put(result_to_dict(result))
+    return result
+
+
+def result_to_dict(result: DiscoveredUrls) -> dict:
+    """JSON shape the TypeScript side parses"""
+    return {
+        "website": result.website,
+        "store_directory_url": result.store_directory_url,
+        "dining_directory_url": result.dining_directory_url,
+        "all_relevant_urls": result.all_relevant_urls,
+        "confidence": result.confidence,
+        "method": result.method
+    }
+
+
+def load_websites(path: str) -> dict[str, str]:
+    """
+    Location id -> website map: a JSON object (as written by
+    export-location-websites.ts) or a JSON list of objects with id and website
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return {str(k): v for k, v in data.items() if v}
+    return {str(item["id"]): item["website"] for item in data
+            if isinstance(item, dict) and item.get("id") and item.get("website")}
+
+
+def load_targets(path: str, websites: dict[str, str] | None = None) -> list[dict]:
+    """
+    Sites to discover: a text file with one website per line, or a JSON list of
+    websites or of location objects. Location exports (enrichment_targets.json,
+    managed_enrichment_queue.json) have id/name/city but usually no website,
+    so it is looked up by id in `websites` when the object has no `website`
+    or `url` field. Other fields such as id and name are passed through to
+    the output.
+    """
+    websites = websites or {}
+    with open(path) as f:
+        if not path.endswith(".json"):
+            return [{"website": line.strip()} for line in f if line.strip() and not line.startswith("#")]
+        data = json.load(f)
+    targets = []
+    for item in data:
+        if isinstance(item, str):
+            targets.append({"website": item})
+        elif isinstance(item, dict):
+            website = item.get("website") or item.get("url") or websites.get(str(item.get("id")))
+            targets.append({
+                **{k: item[k] for k in ("id", "name", "city") if k in item},
+                "website": website,
+            })
+    return targets
+
+
+async def discover_batch(targets: list[dict], api_key: str, concurrency: int = 4, out=sys.stdout,
+                         cache: DiscoveryCache | None = None) -> dict:
+    """
+    Discover many sites concurrently through the shared browser pool, at most
+    `concurrency` at a time, writing one NDJSON line per site as it finishes
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {"found": 0, "not_found": 0, "errors": 0}
+
+    async def discover_one(target: dict):
+        passthrough = {k: v for k, v in target.items() if k != "website"}
+        if not target.get("website"):
+            record = {**passthrough, "website": None, "error": "no website (pass --websites for id lookups)"}
+            counts["errors"] += 1
+        else:
+            async with semaphore:
+                try:
+                    result = await discover_urls(target["website"], api_key, cache)
+                    record = {**passthrough, **result_to_dict(result)}
+                    counts["found" if result.store_directory_url else "not_found"] += 1
+                except Exception as e:
+                    record = {**passthrough, "website": target["website"], "error": f"{type(e).__name__}: {e}"}
+                    counts["errors"] += 1
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    await asyncio.gather(*(discover_one(target) for target in targets))
+    return counts
 
 
 async def main():
+    # --refresh skips cache reads but still records the fresh results
+    refresh = "--refresh" in sys.argv
+    if refresh:
+        sys.argv.remove("--refresh")
+    
     if len(sys.argv) < 2:
         print("Usage: python smart_tenant_discovery.py <website_url>")
+        print("       python smart_tenant_discovery.py --batch <targets.json|sites.txt> [--concurrency 4] [--output FILE]")
+        print("       --websites FILE  id -> website map for location exports without a website field")
+        print("       --refresh  rediscover even if a validated cached result exists")
         print("Example: python smart_tenant_discovery.py https://cwmbrancentre.com")
         sys.exit(1)
     
-    website = sys.argv[1]
     api_key = os.environ.get("OPENAI_API_KEY", "")
     
     if not api_key:
         print(json.dumps({"error": "OPENAI_API_KEY not set"}))
         sys.exit(1)
     
-    result = await discover_urls(website, api_key)
+    cache = DiscoveryCache(refresh=refresh)
     
-    # Output as JSON for easy parsing by TypeScript
-    output = {
-        "website": result.website,
-        "store_directory_url": result.store_directory_url,
-        "dining_directory_url": result.dining_directory_url,
-        "all_relevant_urls": result.all_relevant_urls,
-        "confidence": result.confidence,
-        "method": result.method
-    }
+    if sys.argv[1] == "--batch":
+        if len(sys.argv) < 3:
+            print(json.dumps({"error": "--batch needs a targets file"}))
+            sys.exit(1)
+        concurrency = 4
+        output_path = None
+        websites = None
+        for i, arg in enumerate(sys.argv[3:], 3):
+            if arg == "--concurrency" and i + 1 < len(sys.argv):
+                concurrency = int(sys.argv[i + 1])
+            elif arg == "--output" and i + 1 < len(sys.argv):
+                output_path = sys.argv[i + 1]
+            elif arg == "--websites" and i + 1 < len(sys.argv):
+                websites = load_websites(sys.argv[i + 1])
+        targets = load_targets(sys.argv[2], websites)
+        
+        missing = sum(1 for target in targets if not target.get("website"))
+        if missing:
+            print(f"⚠️  {missing}/{len(targets)} targets have no website"
+                  f"{'' if websites else ' (pass --websites location_websites.json)'}", file=sys.stderr)
+        print(f"🔍 Discovering {len(targets)} sites ({concurrency} at a time)", file=sys.stderr)
+        pool = get_pool(profile="text-only", max_leases=concurrency)
+        out = open(output_path, "w") if output_path else sys.stdout
+        try:
+            counts = await discover_batch(targets, api_key, concurrency, out, cache)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+            print(f"   ♻️  {cache.summary()}", file=sys.stderr)
+            cache.close()
+            if pool.blocker is not None:
+                print(f"   🚫 {pool.blocker.summary()}", file=sys.stderr)
+            await close_pool()
+        print(f"\n📊 Batch discovery: {counts['found']} found, {counts['not_found']} not found, "
+              f"{counts['errors']} errors", file=sys.stderr)
+        return
     
-    print(json.dumps(output, indent=2))
+    website = sys.argv[1]
+    
+    # Only text and links are used, so skip images, fonts, media and trackers
+    pool = get_pool(profile="text-only")
+    try:
+        result = await discover_urls(website, api_key, cache)
+    finally:
+        cache.close()
+        if pool.blocker is not None:
+            print(f"   🚫 {pool.blocker.summary()}", file=sys.stderr)
+        await close_pool()
+    
+    # Output as JSON for easy parsing by TypeScript
+    print(json.dumps(result_to_dict(result), indent=2))
 
 
 if __name__ == "__main__":
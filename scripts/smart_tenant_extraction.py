@@ -6,8 +6,11 @@ AI-powered extraction of store/tenant data from shopping centre directories.
 Extracts both retail stores AND F&B venues with proper categorization.
 
 Usage:
-  python smart_tenant_extraction.py <store_directory_url> [dining_url]
+  python smart_tenant_extraction.py <store_directory_url> [dining_url] [--alternative URL ...]
   python smart_tenant_extraction.py https://cwmbrancentre.com/shopping
+
+All URLs are extracted concurrently over one shared crawler and merged as
+their results arrive.
 """
 
 import asyncio
@@ -17,14 +20,30 @@ import os
 from typing import Optional
 from pydantic import BaseModel, Field
 
+# Shared crawl helpers (browser pool etc.) live with the crawl4ai skill scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "crawl4ai", "scripts"))
+
 try:
-    from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+    from crawl4ai import CrawlerRunConfig, CacheMode
     from crawl4ai.extraction_strategy import LLMExtractionStrategy
+    from browser_pool import close_pool, get_pool, lease_crawler
+    from directory_chunks import TenantMerge, extract_chunks, merge_tenants
+    from directory_region import extract_cards, prompt_chunks
+    from directory_classifier import DINING, STORE, DirectoryClassifier
+    from tenant_taxonomy import classify_tenant
 except ImportError:
     print(json.dumps({"error": "crawl4ai not installed. Run: pip3 install crawl4ai"}))
     sys.exit(1)
 
 
+# Tenant counts that confirm a URL really is a store / dining directory
+CONFIRMED_STORE_TENANTS = 10
+CONFIRMED_DINING_TENANTS = 3
+
+# Concurrent LLM calls per directory page (one per DOM-aligned chunk)
+LLM_CHUNK_CONCURRENCY = int(os.environ.get("LLM_CHUNK_CONCURRENCY", "4"))
+
+
 class TenantInfo(BaseModel):
     """Individual tenant/store information"""
     name: str = Field(..., description="Store or restaurant name")
@@ -42,14 +61,33 @@ class TenantDirectory(BaseModel):
     categories_found: list[str] = Field(default_factory=list, description="List of all categories found")
 
 
-async def extract_tenants(url: str, api_key: str, is_dining: bool = False) -> list[dict]:
-    """Extract all tenants from a directory page using AI"""
+def tenants_from_blocks(blocks) -> list[dict]:
+    """Tenant dicts from LLMExtractionStrategy output (TenantDirectory objects or bare tenants)"""
+    if isinstance(blocks, str):
+        blocks = json.loads(blocks)
+    if isinstance(blocks, dict):
+        blocks = [blocks]
+    tenants = []
+    for block in blocks or []:
+        if not isinstance(block, dict) or block.get("error"):
+            continue
+        if "tenants" in block:
+            tenants.extend(t for t in block["tenants"] or [] if isinstance(t, dict))
+        elif block.get("name"):
+            tenants.append(block)
+    return tenants
+
+
+async def extract_tenants(url: str, api_key: str, is_dining: bool = False, crawler=None) -> list[dict]:
+    """Extract all tenants from a directory page using AI (on `crawler` if given, else a leased one)"""
     
     page_type = "dining/F&B" if is_dining else "store/retail"
     print(f"\n🔍 Extracting {page_type} tenants from: {url}", file=sys.stderr)
     
     instruction = """
-    Extract ALL stores, shops, restaurants, cafes, and tenants from this shopping centre directory page.
+    Extract ALL stores, shops, restaurants, cafes, and tenants from this section of a shopping centre directory page.
+    The content is either the page text, or the directory's entries one per line as
+    "name | category hint | link" (with - for a missing field).
     
     For EACH tenant found, provide:
     - name: The official store/restaurant name
@@ -70,86 +108,128 @@ async def extract_tenants(url: str, api_key: str, is_dining: bool = False) -> li
     If you see 100 tenants, extract all 100.
     """
     
+    # The page is rendered once and split along its DOM (card groups, A-Z
+    # sections); each chunk is its own LLM call, so large directories are not
+    # truncated and the calls run concurrently
+    strategy = LLMExtractionStrategy(
+        provider="openai/gpt-4o-mini",
+        api_token=api_key,
+        schema=TenantDirectory.model_json_schema(),
+        extraction_type="schema",
+        instruction=instruction,
+        apply_chunking=False,  # Chunks are already sized by directory_chunks; don't re-split them
+    )
     config = CrawlerRunConfig(
         cache_mode=CacheMode.BYPASS,
-        extraction_strategy=LLMExtractionStrategy(
-            provider="openai/gpt-4o-mini",
-            api_token=api_key,
-            schema=TenantDirectory.model_json_schema(),
-            extraction_type="schema",
-            instruction=instruction,
-        ),
         word_count_threshold=10,
         page_timeout=90000,
         wait_until="networkidle",
         verbose=False
     )
     
+    async def extract_chunk(chunk: str) -> list[dict]:
+        blocks = await asyncio.to_thread(strategy.run, url, [chunk])
+        return tenants_from_blocks(blocks)
+    
     try:
-        async with AsyncWebCrawler(verbose=False) as crawler:
+        if crawler is not None:
             result = await crawler.arun(url=url, config=config)
+        else:
+            async with lease_crawler() as leased:
+                result = await leased.arun(url=url, config=config)
+        
+        if not result.success or not result.html:
+            error_msg = result.error_message if hasattr(result, 'error_message') else "Unknown error"
+            print(f"   ❌ Extraction failed: {error_msg}", file=sys.stderr)
+            return []
+        
+        # Regular card directories are read locally; the LLM only sees pages
+        # whose structure doesn't identify the tenant names confidently
+        local = extract_cards(result.html, base_url=result.url or url)
+        if local.confident:
+            # Category hints and names mapped onto TenantInfo's taxonomy by rule, in place of the LLM's judgement
+            tenants = [{**t, **classify_tenant(t["name"], t.get("category"), is_dining)} for t in local.tenants]
+            print(f"   ⚡ Extracted {len(tenants)} tenants locally (confidence {local.confidence:.2f}, no LLM call)",
+                  file=sys.stderr)
+            return tenants
+        
+        # Compact "name | category | link" lines for the directory's cards when
+        # a directory region is found, else the whole page split along its DOM
+        chunks, compact = prompt_chunks(result.html, base_url=result.url or url)
+        if compact:
+            print(f"   🧾 Directory region: {sum(len(c.splitlines()) for c in chunks)} entries", file=sys.stderr)
+        if len(chunks) > 1:
+            print(f"   ✂️  {len(chunks)} chunks, {LLM_CHUNK_CONCURRENCY} at a time", file=sys.stderr)
+        results = await extract_chunks(chunks, extract_chunk, LLM_CHUNK_CONCURRENCY)
+        for i, chunk_result in enumerate(results):
+            if isinstance(chunk_result, Exception):
+                print(f"   ⚠️  Chunk {i + 1} failed: {chunk_result}", file=sys.stderr)
+        tenants = merge_tenants(r for r in results if not isinstance(r, Exception))
+        
+        print(f"   ✅ Extracted {len(tenants)} tenants", file=sys.stderr)
+        
+        # Categorize and summarize
+        if tenants:
+            categories = {}
+            anchors = 0
+            for t in tenants:
+                cat = t.get("category", "Other")
+                categories[cat] = categories.get(cat, 0) + 1
+                if t.get("is_anchor"):
+                    anchors += 1
             
-            if result.success and result.extracted_content:
-                try:
-                    data = json.loads(result.extracted_content)
-                    
-                    # Handle various response formats
-                    if isinstance(data, list):
-                        tenants = data
-                    elif isinstance(data, dict):
-                        tenants = data.get("tenants", [])
-                    else:
-                        tenants = []
-                    
-                    print(f"   ✅ Extracted {len(tenants)} tenants", file=sys.stderr)
-                    
-                    # Categorize and summarize
-                    if tenants:
-                        categories = {}
-                        anchors = 0
-                        for t in tenants:
-                            cat = t.get("category", "Other")
-                            categories[cat] = categories.get(cat, 0) + 1
-                            if t.get("is_anchor"):
-                                anchors += 1
-                        
-                        print(f"   📊 Categories: {dict(categories)}", file=sys.stderr)
-                        if anchors:
-                            print(f"   ⭐ Anchor tenants: {anchors}", file=sys.stderr)
-                    
-                    return tenants
-                    
-                except Exception as e:
-                    print(f"   ⚠️  Parse error: {e}", file=sys.stderr)
-                    return []
-            else:
-                error_msg = result.error_message if hasattr(result, 'error_message') else "Unknown error"
-                print(f"   ❌ Extraction failed: {error_msg}", file=sys.stderr)
-                return []
+            print(f"   📊 Categories: {dict(categories)}", file=sys.stderr)
+            if anchors:
+                print(f"   ⭐ Anchor tenants: {anchors}", file=sys.stderr)
+        
+        return tenants
                 
     except Exception as e:
         print(f"   ❌ Exception: {e}", file=sys.stderr)
         return []
 
 
-async def extract_from_urls(store_url: str, dining_url: Optional[str], api_key: str) -> dict:
-    """Extract tenants from both store and dining URLs"""
+async def extract_from_urls(store_url: str, dining_url: Optional[str], api_key: str,
+                            alternative_urls: Optional[list[str]] = None) -> dict:
+    """
+    Extract tenants from the store, dining and any alternative URLs at once,
+    over one shared crawler, merging (with name-normalised dedupe) as each
+    page's results arrive
+    """
     
-    all_tenants = []
+    classifier = DirectoryClassifier()
     
-    # Extract from store directory
+    # url -> is_dining; a combined store+dining page is extracted once
+    sources: dict[str, bool] = {}
     if store_url:
-        store_tenants = await extract_tenants(store_url, api_key, is_dining=False)
-        all_tenants.extend(store_tenants)
-    
-    # Extract from dining directory (if different URL)
-    if dining_url and dining_url != store_url:
-        dining_tenants = await extract_tenants(dining_url, api_key, is_dining=True)
-        # Merge, avoiding duplicates
-        existing_names = {t.get("name", "").lower() for t in all_tenants}
-        for t in dining_tenants:
-            if t.get("name", "").lower() not in existing_names:
-                all_tenants.append(t)
+        sources[store_url] = False
+    if dining_url:
+        sources.setdefault(dining_url, True)
+    for url in alternative_urls or []:
+        sources.setdefault(url, False)
+    
+    merge = TenantMerge()
+    counts: dict[str, int] = {}
+    
+    async with lease_crawler() as crawler:
+        async def extract(url: str, is_dining: bool) -> tuple[str, list[dict]]:
+            return url, await extract_tenants(url, api_key, is_dining=is_dining, crawler=crawler)
+        
+        tasks = [extract(url, is_dining) for url, is_dining in sources.items()]
+        for finished in asyncio.as_completed(tasks):
+            url, tenants = await finished
+            counts[url] = len(tenants)
+            added = merge.add(tenants)
+            if len(sources) > 1:
+                print(f"   🔀 {url}: +{added} new ({len(merge)} total)", file=sys.stderr)
+    
+    # Real directories teach discovery's local classifier their URL shape
+    if store_url and counts.get(store_url, 0) >= CONFIRMED_STORE_TENANTS:
+        classifier.learn(store_url, STORE)
+    if dining_url and dining_url != store_url and counts.get(dining_url, 0) >= CONFIRMED_DINING_TENANTS:
+        classifier.learn(dining_url, DINING)
+    
+    all_tenants = merge.tenants
     
     # Categorize summary
     categories = {}
@@ -171,26 +251,43 @@ async def extract_from_urls(store_url: str, dining_url: Optional[str], api_key:
         "type_breakdown": type_counts,
         "sources": {
             "store_url": store_url,
-            "dining_url": dining_url
+            "dining_url": dining_url,
+            "alternative_urls": [url for url in sources if url not in (store_url, dining_url)],
+            "tenant_counts": counts
         }
     }
 
 
 async def main():
-    if len(sys.argv) < 2:
-        print("Usage: python smart_tenant_extraction.py <store_url> [dining_url]")
+    args = sys.argv[1:]
+    alternative_urls = []
+    while "--alternative" in args:
+        i = args.index("--alternative")
+        if i + 1 < len(args):
+            alternative_urls.append(args[i + 1])
+        del args[i:i + 2]
+    
+    if not args:
+        print("Usage: python smart_tenant_extraction.py <store_url> [dining_url] [--alternative URL ...]")
         print("Example: python smart_tenant_extraction.py https://cwmbrancentre.com/shopping")
         sys.exit(1)
     
-    store_url = sys.argv[1]
-    dining_url = sys.argv[2] if len(sys.argv) > 2 else None
+    store_url = args[0]
+    dining_url = args[1] if len(args) > 1 else None
     api_key = os.environ.get("OPENAI_API_KEY", "")
     
     if not api_key:
         print(json.dumps({"error": "OPENAI_API_KEY not set"}))
         sys.exit(1)
     
-    result = await extract_from_urls(store_url, dining_url, api_key)
+    # Only text and links are used, so skip images, fonts, media and trackers
+    pool = get_pool(profile="text-only")
+    try:
+        result = await extract_from_urls(store_url, dining_url, api_key, alternative_urls)
+    finally:
+        if pool.blocker is not None:
+            print(f"   🚫 {pool.blocker.summary()}", file=sys.stderr)
+        await close_pool()
     
     print(json.dumps(result, indent=2))
 
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+🧵 Tenant Worker
+
+Long-lived worker for the tenant scripts: one process keeps the browser
+pool, HTTP client, Playwright browser and OpenAI client warm and runs
+discover/extract jobs concurrently, so enrichment calls skip the interpreter
+start, imports and browser launch that each one-shot CLI pays.
+
+Protocol: newline-delimited JSON over stdin/stdout.
+  Request:  {"id": "1", "type": "discover", "website": "https://centre.example"}
+            {"id": "2", "type": "extract", "store_url": "...", "dining_url": "...", "alternative_urls": [...]}
+            {"id": "3", "type": "scrape", "url": "..."}   (playwright_openai_scraper)
+            {"id": "4", "type": "stores", "url": "..."}   (crawl4ai_scraper)
+            {"id": "5", "type": "ping"}
+            {"id": "1", "type": "cancel"}                 cancel job 1, queued or running
+            {"type": "shutdown"}
+            Any job may carry "timeout": seconds, overriding --job-timeout.
+  Response: {"event": "ready", "jobs": [...]}                 once, at startup
+            {"id": "1", "event": "started"}                    when the job gets a slot
+            {"id": "1", "event": "result", "data": {...}, "elapsed_ms": 1234}
+            {"id": "1", "event": "error", "error": "..."}       includes running past its timeout
+            {"id": "1", "event": "cancelled"}
+Results stream back as each job finishes, not in request order. Logs and
+the scripts' progress output go to stderr. A timed-out or cancelled job
+frees its slot at once; blocking work it started in a thread (an LLM call)
+finishes in the background and is discarded.
+
+Usage:
+  python tenant_worker.py [--concurrency 4] [--job-timeout 170]
+"""
+
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+
+# Shared crawl helpers (browser pool etc.) live with the crawl4ai skill scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "crawl4ai", "scripts"))
+
+import smart_tenant_discovery as discovery
+import smart_tenant_extraction as extraction
+from browser_pool import close_pool, get_pool
+from discovery_cache import DiscoveryCache
+from http_fetch import HttpFetcher
+
+JOB_TYPES = ("discover", "extract", "scrape", "stores", "ping")
+# Seconds a job may run once it has a slot, for jobs that don't carry their own
+# "timeout" (the TypeScript client always sends one, 10s inside its own timer)
+DEFAULT_JOB_TIMEOUT = float(os.environ.get("TENANT_JOB_TIMEOUT", "170"))
+
+
+class TenantWorker:
+    """Runs jobs at most `concurrency` at a time over shared, lazily started clients"""
+
+    def __init__(self, api_key: str, out, concurrency: int = 4, job_timeout: float = DEFAULT_JOB_TIMEOUT):
+        self.api_key = api_key
+        self.out = out
+        self.job_timeout = job_timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.cache = DiscoveryCache()
+        self.fetcher = HttpFetcher(timeout=discovery.PROBE_TIMEOUT)
+        self.pool = get_pool(profile="text-only", max_leases=concurrency)
+        self._playwright = None
+        self._browser = None
+        self._openai = None
+        self._browser_lock = asyncio.Lock()
+        self.tasks: set[asyncio.Task] = set()
+        self.jobs: dict[str, asyncio.Task] = {}  # Job id -> its task, for cancel requests
+
+    def send(self, message: dict):
+        self.out.write(json.dumps(message) + "\n")
+        self.out.flush()
+
+    async def start(self):
+        await self.fetcher.__aenter__()
+        self.send({"event": "ready", "jobs": list(JOB_TYPES), "pid": os.getpid()})
+
+    async def close(self):
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        await self.fetcher.__aexit__(None, None, None)
+        self.cache.close()
+        if self._browser is not None:
+            await self._browser.close()
+            await self._playwright.stop()
+        await close_pool()
+
+    async def _scraper(self):
+        """playwright_openai_scraper with a warm browser and OpenAI client, started on first use"""
+        async with self._browser_lock:
+            try:
+                scraper = importlib.import_module("playwright_openai_scraper")
+            except SystemExit:
+                raise RuntimeError("playwright/openai not installed") from None
+            if self._browser is None:
+                self._playwright = await scraper.async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self._openai = scraper.AsyncOpenAI(api_key=self.api_key)
+            return scraper
+
+    async def run_job(self, job: dict):
+        job_type = job.get("type")
+        if job_type == "ping":
+            return {"pong": True}
+        if job_type == "discover":
+            result = await discovery.discover_urls(job["website"], self.api_key, self.cache, self.fetcher)
+            return discovery.result_to_dict(result)
+        if job_type == "extract":
+            return await extraction.extract_from_urls(
+                job["store_url"], job.get("dining_url"), self.api_key, job.get("alternative_urls"))
+        if job_type == "scrape":
+            scraper = await self._scraper()
+            return await scraper.scrape_stores(job["url"], self.api_key, self._browser, self._openai)
+        if job_type == "stores":
+            return await importlib.import_module("crawl4ai_scraper").crawl_stores(job["url"], self.api_key)
+        raise ValueError(f"Unknown job type: {job_type!r} (expected one of {', '.join(JOB_TYPES)})")
+
+    async def handle(self, job: dict):
+        job_id = job.get("id")
+        timeout = float(job.get("timeout") or self.job_timeout)
+        try:
+            async with self.semaphore:
+                self.send({"id": job_id, "event": "started"})
+                started = time.perf_counter()
+                try:
+                    data = await asyncio.wait_for(self.run_job(job), timeout)
+                except asyncio.TimeoutError:
+                    self.send({"id": job_id, "event": "error",
+                               "error": f"{job.get('type')} job timed out after {timeout:g}s"})
+                except KeyError as e:
+                    self.send({"id": job_id, "event": "error", "error": f"Missing field: {e.args[0]}"})
+                except Exception as e:
+                    self.send({"id": job_id, "event": "error", "error": f"{type(e).__name__}: {e}"})
+                else:
+                    elapsed_ms = round((time.perf_counter() - started) * 1000)
+                    self.send({"id": job_id, "event": "result", "data": data, "elapsed_ms": elapsed_ms})
+        except asyncio.CancelledError:
+            self.send({"id": job_id, "event": "cancelled"})
+
+    def submit(self, job: dict):
+        task = asyncio.create_task(self.handle(job))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        job_id = job.get("id")
+        if job_id is not None:
+            self.jobs[str(job_id)] = task
+            task.add_done_callback(lambda _: self.jobs.pop(str(job_id), None))
+
+    def cancel(self, job_id) -> bool:
+        """Cancel a queued or running job; False if it already finished (or never existed)"""
+        task = self.jobs.get(str(job_id))
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+
+async def serve(concurrency: int, job_timeout: float = DEFAULT_JOB_TIMEOUT):
+    # The protocol owns stdout; anything the scripts print goes to stderr
+    out = sys.stdout
+    sys.stdout = sys.stderr
+
+    api_key = os.environ.get("OPENAI_API_KEY", "")
+    if not api_key:
+        out.write(json.dumps({"event": "fatal", "error": "OPENAI_API_KEY not set"}) + "\n")
+        out.flush()
+        sys.exit(1)
+
+    worker = TenantWorker(api_key, out, concurrency, job_timeout)
+    await worker.start()
+    print(f"🧵 Tenant worker ready (pid {os.getpid()}, {concurrency} concurrent jobs, "
+          f"{job_timeout:g}s per job)", file=sys.stderr)
+    try:
+        while True:
+            line = await asyncio.to_thread(sys.stdin.readline)
+            if not line:
+                break  # stdin closed: finish running jobs and exit
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                worker.send({"event": "error", "error": f"Invalid JSON: {e}"})
+                continue
+            if not isinstance(job, dict):
+                worker.send({"event": "error", "error": "Request must be a JSON object"})
+                continue
+            if job.get("type") == "shutdown":
+                break
+            if job.get("type") == "cancel":
+                worker.cancel(job.get("id"))  # The job itself answers "cancelled"
+                continue
+            worker.submit(job)
+    finally:
+        await worker.close()
+        print(f"   ♻️  {worker.cache.summary()}", file=sys.stderr)
+        if worker.pool.blocker is not None:
+            print(f"   🚫 {worker.pool.blocker.summary()}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    concurrency = 4
+    job_timeout = DEFAULT_JOB_TIMEOUT
+    if "--concurrency" in sys.argv:
+        i = sys.argv.index("--concurrency")
+        if i + 1 < len(sys.argv):
+            concurrency = int(sys.argv[i + 1])
+    if "--job-timeout" in sys.argv:
+        i = sys.argv.index("--job-timeout")
+        if i + 1 < len(sys.argv):
+            job_timeout = float(sys.argv[i + 1])
+    asyncio.run(serve(concurrency, job_timeout))
@@ -0,0 +1,144 @@
+/**
+ * 🧵 Tenant Worker Client
+ *
+ * Talks to scripts/tenant_worker.py, a long-lived Python process that keeps
+ * browsers and HTTP clients warm, instead of spawning one Python process per
+ * URL. Jobs run concurrently in the worker; each call resolves when its
+ * result line comes back. A job that times out is cancelled in the worker
+ * too, so it stops holding one of the worker's concurrency slots; the worker
+ * also enforces a slightly shorter per-job limit itself.
+ *
+ * Usage:
+ *   const worker = new TenantWorker();
+ *   const discovered = await worker.discover('https://cwmbrancentre.com');
+ *   const result = await worker.extract(storeUrl, diningUrl);
+ *   await worker.close();
+ */
+
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import * as path from 'path';
+import * as readline from 'readline';
+
+const WORKER_PATH = path.join(__dirname, '..', 'tenant_worker.py');
+// The worker's own limit sits this far inside ours, so a job that started promptly
+// fails there with a clean error event before our timer gives up on it
+const WORKER_TIMEOUT_MARGIN_MS = 10000;
+
+export type TenantJobType = 'discover' | 'extract' | 'scrape' | 'stores' | 'ping';
+
+interface PendingJob {
+    resolve: (data: any) => void;
+    reject: (error: Error) => void;
+    timer: NodeJS.Timeout;
+}
+
+export interface TenantWorkerOptions {
+    pythonPath?: string;
+    concurrency?: number;
+    timeoutMs?: number; // Per job, measured from submission; the worker gets 10s less from its slot
+}
+
+export class TenantWorker {
+    private child: ChildProcessWithoutNullStreams;
+    private pending = new Map<string, PendingJob>();
+    private nextId = 1;
+    private ready: Promise<void>;
+    private timeoutMs: number;
+
+    constructor(options: TenantWorkerOptions = {}) {
+        const pythonPath = options.pythonPath || process.env.PYTHON_PATH || 'python3';
+        this.timeoutMs = options.timeoutMs ?? 180000;
+        this.child = spawn(pythonPath, [WORKER_PATH, '--concurrency', String(options.concurrency ?? 4)], {
+            env: { ...process.env, OPENAI_API_KEY: process.env.OPENAI_API_KEY || '' }
+        });
+
+        // Progress logs from the Python side; crawl4ai's own [INIT]/[FETCH] noise is dropped
+        this.child.stderr.on('data', (data) => {
+            const msg = data.toString();
+            if (!msg.includes('[INIT]') && !msg.includes('[FETCH]') && !msg.includes('[SCRAPE]')) {
+                process.stderr.write(msg);
+            }
+        });
+
+        this.ready = new Promise((resolve, reject) => {
+            const lines = readline.createInterface({ input: this.child.stdout });
+            lines.on('line', (line) => {
+                let message: any;
+                try {
+                    message = JSON.parse(line);
+                } catch {
+                    return;
+                }
+                if (message.event === 'ready') {
+                    resolve();
+                } else if (message.event === 'fatal' || (!message.event && message.error)) {
+                    reject(new Error(message.error));
+                } else if (message.id != null) {
+                    this.settle(String(message.id), message);
+                }
+            });
+            this.child.on('exit', (code) => {
+                const error = new Error(`Tenant worker exited with code ${code}`);
+                reject(error);
+                for (const [id, job] of this.pending) {
+                    clearTimeout(job.timer);
+                    job.reject(error);
+                    this.pending.delete(id);
+                }
+            });
+        });
+        this.ready.catch(() => { }); // Surfaced by run(); avoids an unhandled rejection if nothing runs
+    }
+
+    private settle(id: string, message: any) {
+        const job = this.pending.get(id);
+        if (!job || message.event === 'started') return;
+        clearTimeout(job.timer);
+        this.pending.delete(id);
+        if (message.event === 'result') {
+            job.resolve(message.data);
+        } else {
+            job.reject(new Error(message.error || 'Unknown worker error'));
+        }
+    }
+
+    async run(type: TenantJobType, params: Record<string, unknown> = {}): Promise<any> {
+        await this.ready;
+        const id = String(this.nextId++);
+        return new Promise((resolve, reject) => {
+            const timer = setTimeout(() => {
+                this.pending.delete(id);
+                // Free the worker's slot: otherwise the job keeps running with nobody waiting for it
+                if (this.child.exitCode === null && this.child.stdin.writable) {
+                    this.child.stdin.write(JSON.stringify({ id, type: 'cancel' }) + '\n');
+                }
+                reject(new Error(`${type} job timed out after ${this.timeoutMs / 1000}s`));
+            }, this.timeoutMs);
+            this.pending.set(id, { resolve, reject, timer });
+            // The worker's own limit, counted from when the job gets a slot; time spent
+            // queued for a slot only counts against ours, which cancels the job if it fires first
+            const timeout = Math.max(1000, this.timeoutMs - WORKER_TIMEOUT_MARGIN_MS) / 1000;
+            this.child.stdin.write(JSON.stringify({ id, type, timeout, ...params }) + '\n');
+        });
+    }
+
+    discover(website: string) {
+        return this.run('discover', { website });
+    }
+
+    extract(storeUrl: string, diningUrl?: string, alternativeUrls: string[] = []) {
+        return this.run('extract', { store_url: storeUrl, dining_url: diningUrl || null, alternative_urls: alternativeUrls });
+    }
+
+    scrape(url: string) {
+        return this.run('scrape', { url });
+    }
+
+    /** Finish running jobs, then stop the worker */
+    async close(): Promise<void> {
+        if (this.child.exitCode !== null) return;
+        const exited = new Promise<void>((resolve) => this.child.once('exit', () => resolve()));
+        this.child.stdin.end(JSON.stringify({ type: 'shutdown' }) + '\n');
+        await exited;
+    }
+}